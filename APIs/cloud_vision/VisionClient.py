@@ -2,7 +2,7 @@
 This module is used to interact with Google Cloud Vision API.
 '''
 from google.cloud import vision
-from Utilities import image_utility, logging_utility
+from Utilities import encoded_image_cache, image_utility, logging_utility
 
 _logger = logging_utility.setup_logger(__name__)
 
@@ -73,15 +73,18 @@ class VisionClient:
         image.source.image_uri = uri
         return self._detect_text_image(image)
 
-    def detect_text_frame(self, opencv_frame):
+    def detect_text_frame(self, opencv_frame, frame_key=None):
         '''
         This method detects text in an image using text detection.
         Parameters
         ----------
         opencv_frame: numpy.ndarray
             The opencv frame to detect text
+        frame_key: tuple
+            The key of the frame in the encoded image cache (see encoded_image_cache.get_frame_key)
         '''
-        image_content = image_utility.get_png_image_bytes(opencv_frame)
+        # png, as the text is blurred by a lossy compression
+        image_content = encoded_image_cache.get_png_image_bytes(opencv_frame, frame_key)
         image = vision.Image(content=image_content)
         return self._detect_text_image(image)
 
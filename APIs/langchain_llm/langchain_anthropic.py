@@ -78,7 +78,7 @@ class AnthropicClient:
         user_prompt: str
             Takes in user prompt in the form of string
         image_png_bytes: bytes
-            Takes in a PNG image in the form of bytes
+            Takes in a PNG (or JPEG/WebP) image in the form of bytes
         system_context: str
             Gives the system role to the AI by providing a context
             i.e. "You are a chatbot"
@@ -109,7 +109,7 @@ class AnthropicClient:
                         "type": "image_url",
                         "image_url": {
                             "url":
-                                f"data:image/png;base64,{base64_img}"
+                                f"data:{image_utility.get_image_mime_type(image_png_bytes)};base64,{base64_img}"
                         }
                     }
                 ]
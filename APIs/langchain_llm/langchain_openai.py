@@ -87,7 +87,7 @@ class OpenAIClient:
         user_prompt: str
             Takes in user prompt in the form of string
         image_png_bytes: bytes
-            Takes in a PNG image in the form of bytes
+            Takes in a PNG (or JPEG/WebP) image in the form of bytes
         system_context: str
             Gives the system role to the AI by providing a context
             i.e. "You are a chatbot"
@@ -118,7 +118,7 @@ class OpenAIClient:
                         "type": "image_url",
                         "image_url": {
                             "url":
-                                f"data:image/png;base64,{base64_img}"
+                                f"data:{image_utility.get_image_mime_type(image_png_bytes)};base64,{base64_img}"
                         }
                     }
                 ]
@@ -151,7 +151,7 @@ class OpenAIClient:
         if input_text:
             human_content.append({"type": "text", "text": input_text})
         if image_base_64:
-            image_url = f"data:image/png;base64,{image_base_64}"
+            image_url = f"data:{image_utility.get_base64_image_mime_type(image_base_64)};base64,{image_base_64}"
             human_content.append({"type": "image_url", "image_url": {"url": image_url}})
 
         # Build the ChatPromptTemplate
@@ -1,7 +1,10 @@
+from threading import Lock
+from typing import TYPE_CHECKING
 import requests
 from PIL import Image
-from torch import FloatTensor
-from transformers import CLIPProcessor, CLIPModel
+
+if TYPE_CHECKING:
+    from torch import FloatTensor
 
 '''
 Convert texts and images into embeddings using CLIP model.
@@ -11,8 +14,29 @@ Convert texts and images into embeddings using CLIP model.
 
 _CLIP_VERSION = "openai/clip-vit-base-patch32"
 
-_model = CLIPModel.from_pretrained(_CLIP_VERSION)
-_processor = CLIPProcessor.from_pretrained(_CLIP_VERSION)
+# NOTE: the model is loaded on first use (or by `load_model`), not when this module is imported
+_model = None
+_processor = None
+_model_lock = Lock()
+
+
+def load_model():
+    '''
+    Load the CLIP model and processor (only once), e.g., to warm up before the first request.
+
+    :return: (model, processor)
+    '''
+    global _model, _processor
+
+    with _model_lock:
+        if _model is None:
+            # pylint: disable=import-outside-toplevel
+            from transformers import CLIPProcessor, CLIPModel
+
+            _processor = CLIPProcessor.from_pretrained(_CLIP_VERSION)
+            _model = CLIPModel.from_pretrained(_CLIP_VERSION)
+
+    return _model, _processor
 
 
 def process_text_image(text: str = None, image: Image = None, return_tensors="pt", padding=True):
@@ -28,26 +52,29 @@ def process_text_image(text: str = None, image: Image = None, return_tensors="pt
     '''
 
     # Note: long inputs may be truncated
-    return _processor(text=text, images=image, return_tensors=return_tensors, padding=padding, truncation=True)
+    _, processor = load_model()
+    return processor(text=text, images=image, return_tensors=return_tensors, padding=padding, truncation=True)
 
 
-def get_text_features(text: str) -> FloatTensor:
+def get_text_features(text: str) -> "FloatTensor":
     '''
     Get embeddings for text.
     '''
     inputs = process_text_image(text=text)
-    return _model.get_text_features(input_ids=inputs['input_ids'], attention_mask=inputs['attention_mask'])
+    model, _ = load_model()
+    return model.get_text_features(input_ids=inputs['input_ids'], attention_mask=inputs['attention_mask'])
 
 
-def get_image_features(image: Image) -> FloatTensor:
+def get_image_features(image: Image) -> "FloatTensor":
     '''
     Get embeddings for image.
     '''
     inputs = process_text_image(image=image)
-    return _model.get_image_features(pixel_values=inputs['pixel_values'])
+    model, _ = load_model()
+    return model.get_image_features(pixel_values=inputs['pixel_values'])
 
 
-def get_text_image_features(text: str, image: Image) -> tuple[FloatTensor, FloatTensor]:
+def get_text_image_features(text: str, image: Image) -> tuple["FloatTensor", "FloatTensor"]:
     '''
     Get embeddings for text and image.
     '''
@@ -56,8 +83,9 @@ def get_text_image_features(text: str, image: Image) -> tuple[FloatTensor, Float
                    k.startswith('input_ids') or k.startswith('attention_mask')}
     image_inputs = {k: v for k, v in inputs.items() if k.startswith('pixel_values')}
 
-    text_features = _model.get_text_features(**text_inputs)
-    image_features = _model.get_image_features(**image_inputs)
+    model, _ = load_model()
+    text_features = model.get_text_features(**text_inputs)
+    image_features = model.get_image_features(**image_inputs)
     return text_features, image_features
 
 
@@ -2,7 +2,7 @@ from typing import Optional, Dict, List
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 import uvicorn
-from .local_llm import generate_text, generate_text_with_history
+from .local_llm import generate_text, generate_text_with_history, load_model
 
 
 class QuestionRequest(BaseModel):
@@ -27,6 +27,12 @@ class QuestionRequestHistory(BaseModel):
 app = FastAPI()
 
 
+@app.on_event("startup")
+def load_model_on_startup():
+    # load the model before serving the first request
+    load_model()
+
+
 @app.post("/generate-answer")
 async def generate_answer(request_data: QuestionRequest):
     user_prompt = request_data.user_prompt
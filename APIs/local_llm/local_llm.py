@@ -1,5 +1,4 @@
-from transformers import pipeline, AutoModelForCausalLM, AutoTokenizer
-import torch
+from threading import Lock
 
 _MODEL_ID = "TinyLlama/TinyLlama-1.1B-Chat-v1.0"
 
@@ -48,12 +47,33 @@ This set can be thought of as a nucleus of tokens from which the model will samp
 
 _TRUNCATION = True
 
-_model = AutoModelForCausalLM.from_pretrained(_MODEL_ID)
-_tokenizer = AutoTokenizer.from_pretrained(_MODEL_ID)
+# NOTE: the model is loaded on first use (or by `load_model`), not when this module is imported
+_pipe = None
+_pipe_lock = Lock()
 
-_is_cuda = 0 if torch.cuda.is_available() else -1
-_pipe = pipeline("text-generation", model=_model, device=_is_cuda, torch_dtype=torch.bfloat16, device_map="auto",
-                 tokenizer=_tokenizer)
+
+def load_model():
+    '''
+    Load the model into the text generation pipeline (only once), e.g., to warm up before the first request.
+
+    :return: the text generation pipeline
+    '''
+    global _pipe
+
+    with _pipe_lock:
+        if _pipe is None:
+            # pylint: disable=import-outside-toplevel
+            from transformers import pipeline, AutoModelForCausalLM, AutoTokenizer
+            import torch
+
+            model = AutoModelForCausalLM.from_pretrained(_MODEL_ID)
+            tokenizer = AutoTokenizer.from_pretrained(_MODEL_ID)
+
+            is_cuda = 0 if torch.cuda.is_available() else -1
+            _pipe = pipeline("text-generation", model=model, device=is_cuda, torch_dtype=torch.bfloat16,
+                             device_map="auto", tokenizer=tokenizer)
+
+    return _pipe
 
 
 def generate_text(user_prompt: str, system_prompt: str = "You are a friendly chatbot.", temperature: float = 0.1):
@@ -72,8 +92,9 @@ def generate_text(user_prompt: str, system_prompt: str = "You are a friendly cha
     ]
 
     try:
-        prompt = _pipe.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
-        outputs = _pipe(prompt,
+        pipe = load_model()
+        prompt = pipe.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+        outputs = pipe(prompt,
                         max_length=_MAX_LENGTH,
                         do_sample=_DO_SAMPLE,
                         temperature=temperature,
@@ -96,8 +117,9 @@ def generate_text_with_history(user_prompt: str, history: list, system_prompt: s
     messages = [{"role": "system", "content": system_prompt}] + history
 
     try:
-        prompt = _pipe.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
-        outputs = _pipe(prompt, max_length=_MAX_LENGTH, do_sample=_DO_SAMPLE, temperature=temperature, top_k=_TOP_K,
+        pipe = load_model()
+        prompt = pipe.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+        outputs = pipe(prompt, max_length=_MAX_LENGTH, do_sample=_DO_SAMPLE, temperature=temperature, top_k=_TOP_K,
                         top_p=_TOP_P, truncation=_TRUNCATION)
 
         # Append generated response to history
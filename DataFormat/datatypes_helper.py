@@ -1,9 +1,13 @@
+import copyreg
+import functools
 import importlib
 import os
 
 from google.protobuf import json_format
 from google.protobuf.message import DecodeError
 
+import base_keys
+from DataFormat.message_dict import MessageDict
 from DataFormat.ProtoFiles.Common import socket_data_pb2
 from Utilities import file_utility, logging_utility
 from Utilities.file_utility import get_project_root
@@ -15,6 +19,12 @@ _DATA_TYPE_FILE_PATH = os.path.join(get_project_root(), "DataFormat", "DataTypes
 DATA_TYPE_JSON_VAL_KEY = "key"
 DATA_TYPE_JSON_VAL_PROTO_FILE = "proto_file"
 DATA_TYPE_JSON_VAL_COMPONENTS = "components"
+DATA_TYPE_JSON_VAL_COALESCE = "coalesce"
+
+# tags (field number << 3 | wire type) of the SocketData fields (see ProtoFiles/Common/socket_data.proto)
+_SOCKET_DATA_TYPE_TAG = b"\x08"  # data_type = 1, varint
+_SOCKET_DATA_TAG = b"\x12"  # data = 2, length-delimited
+_VARINT_MASK = (1 << 64) - 1
 
 _logger = logging_utility.setup_logger(__name__)
 
@@ -96,6 +106,80 @@ def _get_proto_file_to_data_type_mapping():
     return proto_file_data_type_map
 
 
+def _import_proto_module(proto_file):
+    """
+    :param proto_file: i.e., "Common/exercise_wear_os_data_pb2.py"
+    :return: the imported module, i.e., DataFormat.ProtoFiles.Common.exercise_wear_os_data_pb2
+    """
+    # remove last 3 characters, that is, .py
+    submod_name = proto_file[:-3]
+    # change the directory format for import (i.e., replace "/" with ".")
+    submod_name = submod_name.replace("/", ".")
+    submod_name = f"{_PROTO_FILE_IMPORT_PATH}.{submod_name}"
+
+    return importlib.import_module(submod_name)
+
+
+def _import_proto_module_or_none(proto_file):
+    try:
+        return _import_proto_module(proto_file)
+    except ImportError:
+        return None
+
+
+def _reduce_proto_message(module_name, message_name, message):
+    return _parse_proto_message, (module_name, message_name, message.SerializeToString())
+
+
+def _parse_proto_message(module_name, message_name, serialized_message):
+    message = getattr(importlib.import_module(module_name), message_name)()
+    message.ParseFromString(serialized_message)
+    return message
+
+
+def _get_proto_class_mappings():
+    """
+    Import each proto module once (and make its messages picklable)
+
+    :return: the maps with ({ 51: ExerciseWearOsData, ... }, { ExerciseWearOsData: 51, ... }),
+        where each message class of a proto module is mapped to the key of the first datatype of the proto file
+    """
+    key_proto_class_map = {}
+    proto_class_key_map = {}
+    proto_modules = {}
+
+    for key, val in DATATYPE_JSON.items():
+        proto_file = val[DATA_TYPE_JSON_VAL_PROTO_FILE]
+
+        if proto_file not in proto_modules:
+            proto_modules[proto_file] = _import_proto_module_or_none(proto_file)
+
+        submod = proto_modules[proto_file]
+        if submod is None:
+            _logger.debug("Cannot import proto file {proto_file} of {key}", proto_file=proto_file, key=key)
+            continue
+
+        key_proto_class_map[val[DATA_TYPE_JSON_VAL_KEY]] = getattr(submod, dir(submod)[1])
+
+        # a message class of the proto module is sent as the first datatype of the proto file (see get_key_by_instance)
+        datatype_name = PROTO_TO_DATATYPE_MAP[proto_file.split("/")[-1]][0]
+        for message_name in submod.DESCRIPTOR.message_types_by_name:
+            proto_class = getattr(submod, message_name)
+            proto_class_key_map.setdefault(proto_class, DATATYPE_TO_KEY_MAP[datatype_name])
+
+            # the generated module names (i.e., "speech_data_pb2") cannot be imported by pickle
+            copyreg.pickle(proto_class, functools.partial(_reduce_proto_message, submod.__name__, message_name))
+
+    return key_proto_class_map, proto_class_key_map
+
+
+def _get_coalesced_keys():
+    """
+    :return: the set of keys of the datatypes with "coalesce": true, i.e., { 201, ... }
+    """
+    return {val[DATA_TYPE_JSON_VAL_KEY] for val in DATATYPE_JSON.values() if val.get(DATA_TYPE_JSON_VAL_COALESCE)}
+
+
 ########################################################
 
 DATATYPE_JSON = _get_data_type_json()
@@ -106,6 +190,11 @@ KEY_TO_DATATYPE_MAP = _get_key_to_data_type_mapping()
 DATATYPE_TO_PROTO_MAP = _get_data_type_to_proto_file_mapping()
 PROTO_TO_DATATYPE_MAP = _get_proto_file_to_data_type_mapping()
 
+# resolved once, so that encoding/decoding a message only requires dict lookups
+KEY_TO_PROTO_CLASS_MAP, PROTO_CLASS_TO_KEY_MAP = _get_proto_class_mappings()
+
+COALESCED_KEYS = _get_coalesced_keys()
+
 
 ########################################################
 ################# Helper Functions #####################
@@ -122,6 +211,9 @@ def get_key_by_instance(proto):
         running_live_data_proto = running_live_data.pb2.RunningLiveData()
         get_key_by_instance(running_data_proto)  # Returns the key number, 1001
     """
+    key = PROTO_CLASS_TO_KEY_MAP.get(type(proto))
+    if key is not None:
+        return key
 
     _type = str(type(proto)).split("'")[1]
     _type = _type.split(".")[0]
@@ -144,32 +236,86 @@ def get_name_by_key(data_type_key):
     return KEY_TO_DATATYPE_MAP[data_type_key]
 
 
+def is_coalesced(data_type_key):
+    """
+    :return: whether only the latest pending message of the datatype is sent to a client (see Websocket/send_queue.py)
+    """
+    return data_type_key in COALESCED_KEYS
+
+
 def get_proto_func_by_key(data_type_key):
-    datatype_name = get_name_by_key(data_type_key)
-    proto_file = DATATYPE_TO_PROTO_MAP[datatype_name]
+    """
+    :return: the message class of the datatype key, or None if the key is unknown
+    """
+    return KEY_TO_PROTO_CLASS_MAP.get(data_type_key)
 
-    # remove last 3 characters, that is, .py
-    submod_name = proto_file[:-3]
-    # change the directory format for import (i.e., replace "/" with ".")
-    submod_name = submod_name.replace("/", ".")
-    submod_name = f"{_PROTO_FILE_IMPORT_PATH}.{submod_name}"
-    submod = importlib.import_module(submod_name)
 
-    return getattr(submod, dir(submod)[1])
+def _encode_varint(value):
+    # int32 fields are encoded as 64-bit varints (i.e., 10 bytes if negative)
+    value &= _VARINT_MASK
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+
+    return bytes(encoded)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_socket_data_type_header(data_type):
+    return _SOCKET_DATA_TYPE_TAG + _encode_varint(data_type)
 
 
 def wrap_socket_message_with_metadata(data, data_type=None):
-    _data_type = data_type if data_type else get_key_by_instance(data)
+    """
+    :return: the serialized SocketData of the message, written in one pass instead of copying the serialized message
+        into a SocketData and serializing it again. The bytes are the same as
+        SocketData(data_type=..., data=...).SerializeToString(), also for a data type of 0 or an empty message, as
+        both fields are `optional` (explicit presence) in socket_data.proto, so they are serialized even if default.
+    """
+    _data_type = data_type if data_type is not None else get_key_by_instance(data)
+    serialized_data = data.SerializeToString()
+
+    return b"".join((_get_socket_data_type_header(_data_type), _SOCKET_DATA_TAG, _encode_varint(len(serialized_data)),
+                     serialized_data))
+
+
+def get_websocket_datatype(raw_data):
+    """
+    :return: the datatype key of the socket data, read without decoding the message (None if it is not a socket data)
+    """
+    if not raw_data or isinstance(raw_data, str):
+        return None
 
-    socket_data = socket_data_pb2.SocketData(
-        data_type=_data_type,
-        data=data.SerializeToString()
-    )
+    # the data_type field is written first by the clients (and wrap_socket_message_with_metadata)
+    if raw_data[0] == _SOCKET_DATA_TYPE_TAG[0]:
+        value = 0
+        for index, byte in enumerate(raw_data[1:11]):
+            value |= (byte & 0x7F) << (7 * index)
+            if byte < 0x80:
+                # int32 fields are encoded as 64-bit varints
+                return value - (1 << 64) if value >= 1 << 63 else value
 
-    return socket_data.SerializeToString()
+    socket_data_type, _ = decode_websocket_header(raw_data)
+    return socket_data_type
 
 
 def decode_websocket_data(raw_data):
+    socket_data_type, socket_data = decode_websocket_header(raw_data)
+
+    if socket_data_type is None:
+        return None, None
+
+    return decode_websocket_payload(socket_data_type, socket_data)
+
+
+def decode_websocket_header(raw_data):
+    """
+    Decode only the socket data (the datatype key and the serialized message), without parsing the message
+
+    :return: (datatype key, serialized message), or (None, None) if the data is not a valid socket data
+    """
     if not raw_data or isinstance(raw_data, str):
         _logger.warn("Received data is not a valid socket_data instance")
         return None, None
@@ -178,12 +324,16 @@ def decode_websocket_data(raw_data):
         msg = socket_data_pb2.SocketData()
         msg.ParseFromString(raw_data)
 
-        socket_data_type = msg.data_type
-        socket_data = msg.data
+        return msg.data_type, msg.data
     except DecodeError as e:
         _logger.warn("Error decoding protobuf message : {exc}", exc=str(e))
         return None, None
 
+
+def decode_websocket_payload(socket_data_type, socket_data):
+    """
+    :return: (datatype key, protobuf message), or (None, None) if the message cannot be decoded
+    """
     try:
         proto_func = get_proto_func_by_key(socket_data_type)
 
@@ -218,3 +368,25 @@ def convert_json_to_protobuf(data_type, json_data):
     except json_format.ParseError as e:
         _logger.error("Error decoding protobuf message : {exc}", exc=str(e))
         return None
+
+
+def get_websocket_protobuf(raw_data):
+    """
+    :param raw_data: the data sent by the websocket widget
+    :return: the protobuf message (`websocket_data`), without converting the dictionary (`websocket_message`) back
+        to protobuf, unless only the dictionary is given, or the dictionary was modified by the subscriber. The message
+        is shared by the subscribers, so it must not be modified.
+    """
+    message = raw_data.get(base_keys.WEBSOCKET_MESSAGE)
+    if isinstance(message, MessageDict):
+        try:
+            return message.to_message()
+        except json_format.ParseError as e:
+            _logger.error("Error decoding protobuf message : {exc}", exc=str(e))
+            return None
+
+    data = raw_data.get(base_keys.WEBSOCKET_DATA)
+    if data is not None:
+        return data
+
+    return convert_json_to_protobuf(raw_data[base_keys.WEBSOCKET_DATATYPE], message)
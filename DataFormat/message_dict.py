@@ -0,0 +1,81 @@
+import copy
+from collections.abc import MutableMapping
+
+from google.protobuf import json_format
+
+
+class _MessageConversion:
+    """
+    Dictionary of a protobuf message, converted once for all the views (MessageDict) of the message
+    """
+
+    def __init__(self, message):
+        self.message = message
+        self._dict = None
+
+    def get_dict(self):
+        if self._dict is None:
+            self._dict = json_format.MessageToDict(self.message, preserving_proto_field_name=True)
+        return self._dict
+
+
+class MessageDict(MutableMapping):
+    """
+    Dictionary view of a protobuf message, which is converted (json_format.MessageToDict) only when it is first
+    accessed. Thus, the subscribers which use the protobuf message (`websocket_data`) do not pay for the conversion.
+
+    Each subscriber gets its own view (see `new_view`): the message is converted once for all the views, and each
+    view copies the dictionary when it is accessed, so the modifications of a subscriber are not seen by the others.
+
+    It can be modified like a dict, and pickled (i.e., sent to a `process` executor) without being converted.
+    """
+
+    def __init__(self, message, conversion=None):
+        self.message = message
+        self._conversion = conversion or _MessageConversion(message)
+        self._dict = None
+
+    def to_dict(self):
+        if self._dict is None:
+            self._dict = copy.deepcopy(self._conversion.get_dict())
+        return self._dict
+
+    def is_modified(self):
+        """
+        :return: whether the dictionary was modified (i.e., `message_dict["field"] = value`, or a nested value)
+        """
+        return self._dict is not None and self._dict != self._conversion.get_dict()
+
+    def to_message(self):
+        """
+        :return: the protobuf message, rebuilt from the dictionary only if it was modified
+        """
+        if not self.is_modified():
+            return self.message
+        return json_format.ParseDict(self._dict, type(self.message)())
+
+    def new_view(self):
+        """
+        :return: a view of the message (with the modifications of this view) for another subscriber
+        """
+        if self.is_modified():
+            return MessageDict(self.to_message())
+        return MessageDict(self.message, self._conversion)
+
+    def __getitem__(self, key):
+        return self.to_dict()[key]
+
+    def __setitem__(self, key, value):
+        self.to_dict()[key] = value
+
+    def __delitem__(self, key):
+        del self.to_dict()[key]
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.to_dict())
+
+    def __repr__(self):
+        return repr(self.to_dict())
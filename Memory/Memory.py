@@ -1,39 +1,84 @@
-from shared_memory_dict import SharedMemoryDict
+import multiprocessing
 from Utilities import logging_utility
+from .frame_store import FrameStore
+from .segmented_store import SegmentedStore
+from .status_table import StatusTable
 
 _logger = logging_utility.setup_logger(__name__)
 
 # memory config
 _SHARED_MEMORY_NAME = 'TOM_SHARED_MEMORY'
-_SHARED_MEMORY_SIZE_IN_BYTES = int(10 * 1024 * 1024)  # 10 Mb
+_SHARED_MEMORY_MAX_KEYS = 1024  # each key has its own segment, sized to its value
+_CAMERA_FRAME_STORE_NAME = 'TOM_CAMERA_FRAMES'
+_COMPONENT_STATUS_TABLE_NAME = 'TOM_COMPONENT_STATUS'
 
 _UNSAVED_VALUES = ["origin", "timestamp"]
 
 # Global _memory instance
 _memory = None
+# Global _camera_frame_store instance (created on first use)
+_camera_frame_store = None
+# Global _component_status_table instance (created on first use)
+_component_status_table = None
+# Global _process_locks, shared by all processes (created on first use, and passed to the child processes)
+_process_locks = None
 
 
 def init():
     """Initializes the shared memory object."""
     global _memory
-    _memory = SharedMemoryDict(name=_SHARED_MEMORY_NAME, size=_SHARED_MEMORY_SIZE_IN_BYTES)
+    _memory = SegmentedStore(name=_SHARED_MEMORY_NAME, max_keys=_SHARED_MEMORY_MAX_KEYS,
+                             write_lock=get_process_locks()[_SHARED_MEMORY_NAME])
+
+
+def attach_shared_memory():
+    """
+    Attaches to the shared memory object of a running server from a process which is not started by the server
+    (i.e., a tool), without unlinking the segments of the server when the process exits (see SegmentedStore).
+    """
+    global _memory
+    if _memory is None:
+        _memory = SegmentedStore(name=_SHARED_MEMORY_NAME, max_keys=_SHARED_MEMORY_MAX_KEYS, track=False)
+    return _memory
+
+
+def get_process_locks():
+    """
+    Returns the locks of the shared memory objects, to be passed to the child processes (see set_process_locks),
+    as the locks are only inherited by the forked processes, not by the spawned ones.
+    """
+    global _process_locks
+    if _process_locks is None:
+        _process_locks = {_SHARED_MEMORY_NAME: multiprocessing.Lock()}
+    return _process_locks
+
+
+def set_process_locks(process_locks):
+    """Uses the locks of the parent process (see get_process_locks), before the shared memory is initialized."""
+    global _process_locks
+    _process_locks = process_locks
 
 
 def close():
     """Close the shared memory object."""
-    global _memory
-    if _memory:
-        _memory.shm.close()
-        _memory.shm.unlink()
+    global _memory, _camera_frame_store, _component_status_table
+    if _memory is not None:
+        _memory.close(unlink=True)
+        _memory = None
 
-        # del _memory
-        # _memory = None
+    if _camera_frame_store:
+        _camera_frame_store.close(unlink=True)
+        _camera_frame_store = None
+
+    if _component_status_table:
+        _component_status_table.close(unlink=True)
+        _component_status_table = None
 
 
 def get_shared_memory():
     """Returns the shared memory object if available, or initializes it."""
     global _memory
-    if not _memory:
+    if _memory is None:
         init()
     return _memory
 
@@ -41,7 +86,7 @@ def get_shared_memory():
 def update_shared_memory(message):
     """Updates the shared memory with multiple values from a dictionary."""
     global _memory
-    if not _memory:
+    if _memory is None:
         init()
     for key, val in message.items():
         if key not in _UNSAVED_VALUES:
@@ -51,7 +96,7 @@ def update_shared_memory(message):
 def update_shared_memory_item(key, val):
     """Updates a single item in the shared memory."""
     global _memory
-    if not _memory:
+    if _memory is None:
         init()
     if key not in _UNSAVED_VALUES:
         _memory[key] = val
@@ -62,10 +107,47 @@ def update_shared_memory_item(key, val):
 def get_shared_memory_item(key):
     """Retrieves a single item from the shared memory."""
     global _memory
-    if not _memory:
+    if _memory is None:
         init()
 
     try:
         return _memory[key]
     except KeyError:
         return None
+
+
+def get_camera_frame_store():
+    """Returns the shared camera frame store (a ring of frame buffers), attaching to it if it already exists."""
+    global _camera_frame_store
+    if not _camera_frame_store:
+        _camera_frame_store = FrameStore(_CAMERA_FRAME_STORE_NAME)
+    return _camera_frame_store
+
+
+def update_camera_frame(frame, frame_width, frame_height, camera_fps):
+    """Copies the camera frame into the shared frame store, and returns its sequence number."""
+    return get_camera_frame_store().write(frame, frame_width, frame_height, camera_fps)
+
+
+def get_camera_frame(sequence=None, copy=False):
+    """
+    Retrieves the latest (or the given sequence number) camera frame from the shared frame store.
+    NOTE: Without `copy`, the frame is a view of the shared memory, which is overwritten by newer frames.
+
+    :return: (frame, frame_details), or (None, None) if not available, see FrameStore.read
+    """
+    return get_camera_frame_store().read(sequence, copy)
+
+
+def get_component_status_table():
+    """Returns the shared component status table, attaching to it if it already exists."""
+    global _component_status_table
+    if not _component_status_table:
+        _component_status_table = StatusTable(_COMPONENT_STATUS_TABLE_NAME)
+    return _component_status_table
+
+
+def register_components(component_names):
+    """Assigns the ids of the components in the status table (in the given order, if not registered yet)."""
+    status_table = get_component_status_table()
+    return [status_table.register(component_name) for component_name in component_names]
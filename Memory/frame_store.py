@@ -0,0 +1,253 @@
+import time
+from multiprocessing import shared_memory
+from threading import Lock
+import numpy as np
+from Utilities import logging_utility
+
+_DEFAULT_NUM_SLOTS = 4
+_MAX_LATEST_READ_ATTEMPTS = 3
+
+# header: latest written sequence, generation of the data segment, slot size of the data segment
+_HEADER_DTYPE = np.dtype([("latest_sequence", "<u8"), ("generation", "<u8"), ("slot_capacity", "<u8")])
+# metadata of each slot, the sequence is 0 while the slot is being written
+_SLOT_DTYPE = np.dtype([("sequence", "<u8"), ("timestamp", "<u8"), ("nbytes", "<u8"), ("shape", "<u4", (3,)),
+                        ("ndim", "<u4"), ("dtype", "S8"), ("frame_width", "<u4"), ("frame_height", "<u4"),
+                        ("fps", "<f8")])
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+class FrameStore:
+    """
+    A ring of preallocated frame buffers in shared memory (multiprocessing.shared_memory), to share camera frames
+    across processes without pickling them.
+
+    - The writer copies each frame once into the next slot of the ring (only one writing process is supported, i.e.,
+        the camera widget, which sends the sequence number of the frame to its subscribers).
+    - Readers get a numpy view of the latest (or a specific) frame without copying it. The view is only valid until
+        the slot is reused by a newer frame (i.e., after `num_slots` frames), so use `copy=True` (or `is_valid`) if
+        the frame is kept for longer.
+
+    Layout:
+    - `{name}`: header + metadata of each slot (sequence number, timestamp, shape, width/height/fps)
+    - `{name}_{generation}`: the frame buffers, reallocated (with a new generation) if a frame does not fit in a slot
+    """
+
+    def __init__(self, name, num_slots=_DEFAULT_NUM_SLOTS):
+        self.name = name
+        self.num_slots = num_slots
+        self.write_lock = Lock()
+
+        header_size = _HEADER_DTYPE.itemsize + _SLOT_DTYPE.itemsize * num_slots
+        try:
+            self.header_shm = shared_memory.SharedMemory(name=name, create=True, size=header_size)
+        except FileExistsError:
+            self.header_shm = shared_memory.SharedMemory(name=name)
+
+        self.header = np.ndarray((1,), dtype=_HEADER_DTYPE, buffer=self.header_shm.buf)[0]
+        self.slots = np.ndarray((num_slots,), dtype=_SLOT_DTYPE, buffer=self.header_shm.buf,
+                                offset=_HEADER_DTYPE.itemsize)
+
+        self.data_shm = None
+        self.data_generation = 0
+
+    def write(self, frame, frame_width=0, frame_height=0, fps=0):
+        """
+        Copy the frame into the next slot of the ring
+
+        :return: the sequence number of the frame (starting from 1)
+        """
+        frame = np.ascontiguousarray(frame)
+        if frame.ndim > 3:
+            raise ValueError(f"Frame must have at most 3 dimensions, got {frame.shape}")
+
+        with self.write_lock:
+            self.__allocate_data_if_needed(frame.nbytes)
+
+            sequence = int(self.header["latest_sequence"]) + 1
+            slot = self.slots[sequence % self.num_slots]
+
+            slot["sequence"] = 0  # mark the slot as being written
+            slot_buffer = self.__get_slot_buffer(sequence % self.num_slots, frame.nbytes)
+            slot_buffer[:] = frame.reshape(-1).view(np.uint8)
+
+            shape = list(frame.shape) + [1] * (3 - frame.ndim)
+            slot["shape"] = shape
+            slot["ndim"] = frame.ndim
+            slot["dtype"] = frame.dtype.str.encode()
+            slot["nbytes"] = frame.nbytes
+            slot["frame_width"] = frame_width
+            slot["frame_height"] = frame_height
+            slot["fps"] = fps
+            slot["timestamp"] = time.time_ns()
+            slot["sequence"] = sequence
+
+            self.header["latest_sequence"] = sequence
+
+        return sequence
+
+    def read(self, sequence=None, copy=False):
+        """
+        :param sequence: the sequence number of the frame, or None for the latest frame
+        :param copy: whether to copy the frame, otherwise a view of the shared memory is returned
+        :return: (frame, frame_details), or (None, None) if the frame is not available (anymore)
+
+        frame_details: {"sequence": int, "timestamp": int (ns), "frame_width": int, "frame_height": int, "fps": float}
+        """
+        if sequence is not None:
+            return self.__read_slot(sequence, copy) or (None, None)
+
+        # the latest frame may be overwritten while reading it, then the next latest frame is read
+        for _ in range(_MAX_LATEST_READ_ATTEMPTS):
+            latest_sequence = int(self.header["latest_sequence"])
+            if latest_sequence <= 0:
+                return None, None
+
+            result = self.__read_slot(latest_sequence, copy)
+            if result is not None:
+                return result
+
+        return None, None
+
+    def is_valid(self, sequence):
+        """
+        :return: whether the frame (view) of the sequence number has not been overwritten yet
+        """
+        return int(self.slots[sequence % self.num_slots]["sequence"]) == sequence
+
+    def get_latest_sequence(self):
+        return int(self.header["latest_sequence"])
+
+    def close(self, unlink=False):
+        # release the numpy views before closing the shared memory
+        self.header = None
+        self.slots = None
+
+        for shm in [self.data_shm, self.header_shm]:
+            if shm is None:
+                continue
+            _close_shared_memory(shm)
+            if unlink:
+                try:
+                    shm.unlink()
+                except FileNotFoundError:
+                    pass
+
+        self.data_shm = None
+        self.header_shm = None
+
+    def __allocate_data_if_needed(self, nbytes):
+        self.__attach_data_if_needed()
+        if self.data_shm is not None and nbytes <= int(self.header["slot_capacity"]):
+            return
+
+        generation = int(self.header["generation"]) + 1
+        data_shm = _create_shared_memory(f"{self.name}_{generation}", nbytes * self.num_slots)
+        _logger.info("Allocated frame store {name}: {num_slots} x {nbytes} bytes", name=data_shm.name,
+                     num_slots=self.num_slots, nbytes=nbytes)
+
+        # invalidate the frames of the previous data segment
+        self.slots["sequence"] = 0
+        self.header["slot_capacity"] = nbytes
+        self.header["generation"] = generation
+
+        if self.data_shm is not None:
+            _close_shared_memory(self.data_shm)
+            self.data_shm.unlink()
+
+        self.data_shm = data_shm
+        self.data_generation = generation
+
+    def __attach_data_if_needed(self):
+        generation = int(self.header["generation"])
+        if generation == self.data_generation:
+            return
+
+        if self.data_shm is not None:
+            _close_shared_memory(self.data_shm)
+            self.data_shm = None
+
+        try:
+            self.data_shm = shared_memory.SharedMemory(name=f"{self.name}_{generation}")
+            self.data_generation = generation
+        except FileNotFoundError:
+            _logger.warning("Frame store {name}_{generation} not found", name=self.name, generation=generation)
+
+    def __read_slot(self, sequence, copy):
+        """
+        Read the slot of the sequence number as a seqlock: the metadata is only used if the sequence of the slot is
+        the same before and after reading it (the writer sets it to 0 first), and the frame only if the sequence is
+        still the same after reading the frame
+
+        :return: (frame, frame_details), or None if the frame is not available (anymore)
+        """
+        if sequence <= 0:
+            return None
+
+        slot = self.slots[sequence % self.num_slots]
+        if int(slot["sequence"]) != sequence:
+            return None
+
+        metadata = slot.copy()
+        if int(slot["sequence"]) != sequence:
+            return None
+
+        self.__attach_data_if_needed()
+        if self.data_shm is None:
+            return None
+
+        ndim = int(metadata["ndim"])
+        shape = tuple(int(size) for size in metadata["shape"][:ndim])
+        nbytes = int(metadata["nbytes"])
+        try:
+            dtype = np.dtype(metadata["dtype"].decode())
+            # the metadata does not describe a frame of the slot, i.e., the data segment was reallocated meanwhile
+            if ndim > 3 or nbytes != int(np.prod(shape)) * dtype.itemsize or \
+                    nbytes > int(self.header["slot_capacity"]):
+                return None
+
+            # raises if the slot is out of the attached data segment (reallocated after it was attached)
+            slot_buffer = self.__get_slot_buffer(sequence % self.num_slots, nbytes)
+            frame = slot_buffer.view(dtype).reshape(shape)
+        except (TypeError, ValueError):
+            return None
+
+        frame_details = {
+            "sequence": sequence,
+            "timestamp": int(metadata["timestamp"]),
+            "frame_width": int(metadata["frame_width"]),
+            "frame_height": int(metadata["frame_height"]),
+            "fps": float(metadata["fps"]),
+        }
+
+        if copy:
+            frame = frame.copy()
+
+        # the slot may have been overwritten while reading
+        if not self.is_valid(sequence):
+            return None
+
+        return frame, frame_details
+
+    def __get_slot_buffer(self, slot_index, nbytes):
+        slot_capacity = int(self.header["slot_capacity"])
+        return np.ndarray((nbytes,), dtype=np.uint8, buffer=self.data_shm.buf, offset=slot_index * slot_capacity)
+
+
+def _close_shared_memory(shm):
+    try:
+        shm.close()
+    except BufferError:
+        # frame views returned by `read` still refer to the memory, it is released when they are garbage collected
+        _logger.debug("Shared memory {name} is still in use", name=shm.name)
+
+
+def _create_shared_memory(name, size):
+    try:
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+    except FileExistsError:
+        # left over by a previous run which was not closed properly
+        stale_shm = shared_memory.SharedMemory(name=name)
+        stale_shm.close()
+        stale_shm.unlink()
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
@@ -0,0 +1,268 @@
+import multiprocessing
+import os
+import pickle
+from collections.abc import MutableMapping
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from Utilities import logging_utility
+
+_DEFAULT_MAX_KEYS = 1024
+_MAX_KEY_LENGTH_IN_BYTES = 64
+_MIN_SEGMENT_SIZE_IN_BYTES = 256
+_MAX_READ_RETRIES = 10000
+
+# metadata of each key, the version is odd while the value is being written
+_SLOT_DTYPE = np.dtype([("key", f"S{_MAX_KEY_LENGTH_IN_BYTES}"), ("version", "<u8"), ("generation", "<u8"),
+                        ("length", "<u8"), ("capacity", "<u8")])
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+class SegmentedStore(MutableMapping):
+    """
+    A dictionary in shared memory (multiprocessing.shared_memory), where each key has its own slot and segment.
+    Thus, getting/setting one key only (un)pickles the value of that key, instead of the whole dictionary.
+
+    Layout:
+    - `{name}`: the index, i.e., a table of slots (key, version, generation, length and capacity of the value)
+    - `{name}_{slot}_{generation}`: the pickled value of each slot. If a new value does not fit, a larger segment is
+        allocated with the next generation (so there is no limit on the total size of the store).
+
+    Readers do not lock; they retry if the version of the slot changed while reading (seqlock). Writers serialise on
+    `write_lock`, which must be the same multiprocessing.Lock in all the writing processes, i.e., passed to the
+    child processes (see Memory.get_process_locks), as a lock created in each process (spawn) does not exclude the
+    others.
+
+    The generation of a slot only increases (also when its key is deleted), so a segment name is never reused and
+    the segments attached by the other processes are never stale.
+
+    A process which is not started by the server (i.e., a tool reading the store of a running server) must use
+    `track=False`, otherwise its resource tracker unlinks all the segments it attached when it exits.
+    """
+
+    def __init__(self, name, max_keys=_DEFAULT_MAX_KEYS, write_lock=None, track=True):
+        self.name = name
+        self.max_keys = max_keys
+        self.write_lock = write_lock if write_lock is not None else multiprocessing.Lock()
+        self.track = track
+
+        try:
+            self.index_shm = shared_memory.SharedMemory(name=name, create=True, size=_SLOT_DTYPE.itemsize * max_keys)
+        except FileExistsError:
+            self.index_shm = shared_memory.SharedMemory(name=name)
+        self.__untrack_if_needed(self.index_shm)
+
+        self.slots = np.ndarray((max_keys,), dtype=_SLOT_DTYPE, buffer=self.index_shm.buf)
+
+        # attached segments of this process: slot -> (generation, SharedMemory)
+        self.segments = {}
+        # slots of this process: key -> slot
+        self.key_slots = {}
+
+    def __getitem__(self, key):
+        key_bytes = _encode_key(key)
+
+        for _ in range(_MAX_READ_RETRIES):
+            slot = self.__find_slot(key_bytes)
+            if slot is None:
+                raise KeyError(key)
+
+            version = int(self.slots[slot]["version"])
+            if version % 2 == 1:
+                continue  # being written
+
+            generation = int(self.slots[slot]["generation"])
+            length = int(self.slots[slot]["length"])
+            # no value yet (i.e., the slot is being claimed by a writer)
+            segment = self.__get_segment(slot, generation) if length > 0 else None
+            data = bytes(segment.buf[:length]) if segment is not None else None
+
+            if version == int(self.slots[slot]["version"]) and self.slots[slot]["key"] == key_bytes:
+                if data is None:
+                    raise KeyError(key)
+                return pickle.loads(data)
+
+        _logger.warning("{key} is still being written after {retries} retries", key=key, retries=_MAX_READ_RETRIES)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        key_bytes = _encode_key(key)
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self.write_lock:
+            slot = self.__find_slot(key_bytes)
+            if slot is None:
+                slot = self.__claim_slot(key_bytes)
+
+            slot_data = self.slots[slot]
+            slot_data["version"] += 1
+
+            generation = int(slot_data["generation"])
+            if len(data) > int(slot_data["capacity"]):
+                generation = self.__allocate_segment(slot, generation, len(data))
+                slot_data["capacity"] = self.segments[slot][1].size
+                slot_data["generation"] = generation
+
+            segment = self.__get_segment(slot, generation)
+            segment.buf[:len(data)] = data
+            slot_data["length"] = len(data)
+
+            slot_data["version"] += 1
+
+    def __delitem__(self, key):
+        key_bytes = _encode_key(key)
+
+        with self.write_lock:
+            slot = self.__find_slot(key_bytes)
+            if slot is None:
+                raise KeyError(key)
+
+            slot_data = self.slots[slot]
+            slot_data["version"] += 1
+            self.__unlink_segment(slot, int(slot_data["generation"]))
+            slot_data["key"] = b""
+            # the generation is kept, so the next segment of the slot has a new name
+            slot_data["length"] = 0
+            slot_data["capacity"] = 0
+            slot_data["version"] += 1
+
+        self.key_slots.pop(key_bytes, None)
+
+    def __iter__(self):
+        for key in self.slots["key"]:
+            if key:
+                yield key.decode()
+
+    def __len__(self):
+        return int(np.count_nonzero(self.slots["key"]))
+
+    def get_version(self, key):
+        """
+        :return: the number of times the key has been written (x2), or None if the key does not exist
+        """
+        slot = self.__find_slot(_encode_key(key))
+        return None if slot is None else int(self.slots[slot]["version"])
+
+    def close(self, unlink=False):
+        for slot, (generation, segment) in list(self.segments.items()):
+            segment.close()
+            if unlink:
+                self.__unlink_segment(slot, generation)
+        self.segments.clear()
+
+        if unlink:
+            # segments created by the other processes
+            for slot in np.nonzero(self.slots["generation"])[0]:
+                self.__unlink_segment(int(slot), int(self.slots[slot]["generation"]))
+
+        self.slots = None
+        self.index_shm.close()
+        if unlink:
+            if not self.track:
+                # unlink unregisters the segment
+                resource_tracker.register(self.index_shm._name, "shared_memory")  # pylint: disable=protected-access
+            self.index_shm.unlink()
+
+    def __find_slot(self, key_bytes):
+        slot = self.key_slots.get(key_bytes)
+        if slot is not None and self.slots[slot]["key"] == key_bytes:
+            return slot
+
+        slots = np.flatnonzero(self.slots["key"] == key_bytes)
+        if len(slots) == 0:
+            return None
+
+        slot = int(slots[0])
+        self.key_slots[key_bytes] = slot
+
+        return slot
+
+    def __claim_slot(self, key_bytes):
+        free_slots = np.flatnonzero(self.slots["key"] == b"")
+        if len(free_slots) == 0:
+            raise MemoryError(f"No free slot in {self.name} (max_keys: {self.max_keys})")
+
+        slot = int(free_slots[0])
+        self.slots[slot]["key"] = key_bytes
+        self.key_slots[key_bytes] = slot
+
+        return slot
+
+    def __allocate_segment(self, slot, generation, size):
+        new_generation = generation + 1
+        capacity = max(_MIN_SEGMENT_SIZE_IN_BYTES, 1 << (size - 1).bit_length())  # next power of 2
+        segment = _create_shared_memory(self.__get_segment_name(slot, new_generation), capacity)
+        self.__untrack_if_needed(segment)
+
+        if generation > 0:
+            self.__unlink_segment(slot, generation)
+
+        self.segments[slot] = (new_generation, segment)
+
+        return new_generation
+
+    def __get_segment(self, slot, generation):
+        if generation == 0:
+            return None
+
+        attached = self.segments.get(slot)
+        if attached is not None and attached[0] == generation:
+            return attached[1]
+
+        if attached is not None:
+            attached[1].close()
+
+        try:
+            segment = shared_memory.SharedMemory(name=self.__get_segment_name(slot, generation))
+        except FileNotFoundError:
+            # replaced by a newer generation while reading
+            self.segments.pop(slot, None)
+            return None
+        self.__untrack_if_needed(segment)
+
+        self.segments[slot] = (generation, segment)
+
+        return segment
+
+    def __unlink_segment(self, slot, generation):
+        if generation == 0:
+            return
+
+        attached = self.segments.get(slot)
+        if attached is not None and attached[0] == generation:
+            attached[1].close()
+            del self.segments[slot]
+
+        try:
+            segment = shared_memory.SharedMemory(name=self.__get_segment_name(slot, generation))
+            segment.close()
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __get_segment_name(self, slot, generation):
+        return f"{self.name}_{slot}_{generation}"
+
+    def __untrack_if_needed(self, shm):
+        # NOTE: the resource tracker (POSIX only) of a process unlinks the segments it registered when the process exits,
+        #   and every attached segment is registered (before Python 3.13)
+        if not self.track and os.name == "posix":
+            resource_tracker.unregister(shm._name, "shared_memory")  # pylint: disable=protected-access
+
+
+def _encode_key(key):
+    key_bytes = str(key).encode()
+    if len(key_bytes) > _MAX_KEY_LENGTH_IN_BYTES or not key_bytes:
+        raise KeyError(f"Key must have 1 to {_MAX_KEY_LENGTH_IN_BYTES} bytes: {key}")
+    return key_bytes
+
+
+def _create_shared_memory(name, size):
+    try:
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+    except FileExistsError:
+        # left over by a previous run which was not closed properly
+        stale_shm = shared_memory.SharedMemory(name=name)
+        stale_shm.close()
+        stale_shm.unlink()
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
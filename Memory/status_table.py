@@ -0,0 +1,104 @@
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from Utilities import logging_utility
+
+_DEFAULT_MAX_COMPONENTS = 256
+_MAX_NAME_LENGTH_IN_BYTES = 64
+
+# status of each component, a single byte so that reads/writes are atomic
+_SLOT_DTYPE = np.dtype([("name", f"S{_MAX_NAME_LENGTH_IN_BYTES}"), ("status", "i1")])
+
+# NOTE: inherited by the child processes (fork), to serialise the registration of components
+_register_lock = multiprocessing.Lock()
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+class StatusTable:
+    """
+    A table of component statuses in shared memory (multiprocessing.shared_memory), indexed by a component id.
+
+    - `register` assigns an id to a component name (once, the same id is returned by every process)
+    - `get_status`/`set_status` read/write the status (small int) of a component id without locking
+    - `get_all_status` scans the statuses of all registered components
+    """
+
+    def __init__(self, name, max_components=_DEFAULT_MAX_COMPONENTS):
+        self.name = name
+        self.max_components = max_components
+
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=_SLOT_DTYPE.itemsize * max_components)
+        except FileExistsError:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.slots = np.ndarray((max_components,), dtype=_SLOT_DTYPE, buffer=self.shm.buf)
+        self.statuses = self.slots["status"]
+
+    def register(self, component_name, status=0):
+        """
+        :return: the id of the component, which is assigned (with the given status) if it is not registered yet
+        """
+        name_bytes = _encode_name(component_name)
+
+        component_id = self.get_id(component_name)
+        if component_id is not None:
+            return component_id
+
+        with _register_lock:
+            component_id = self.get_id(component_name)
+            if component_id is not None:
+                return component_id
+
+            free_ids = np.flatnonzero(self.slots["name"] == b"")
+            if len(free_ids) == 0:
+                raise MemoryError(f"No free slot in {self.name} (max_components: {self.max_components})")
+
+            component_id = int(free_ids[0])
+            self.statuses[component_id] = status
+            self.slots[component_id]["name"] = name_bytes
+
+        return component_id
+
+    def get_id(self, component_name):
+        """
+        :return: the id of the component, or None if it is not registered
+        """
+        component_ids = np.flatnonzero(self.slots["name"] == _encode_name(component_name))
+        return int(component_ids[0]) if len(component_ids) > 0 else None
+
+    def get_status(self, component_id):
+        return int(self.statuses[component_id])
+
+    def set_status(self, component_id, status):
+        self.statuses[component_id] = status
+
+    def get_all_status(self):
+        """
+        :return: the map with { "service:learning": status, ... } of all registered components
+        """
+        component_ids = np.flatnonzero(self.slots["name"] != b"")
+        names = self.slots["name"][component_ids]
+        statuses = self.statuses[component_ids]
+
+        return {name.decode(): int(status) for name, status in zip(names, statuses)}
+
+    def close(self, unlink=False):
+        # release the numpy views before closing the shared memory
+        self.slots = None
+        self.statuses = None
+
+        self.shm.close()
+        if unlink:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _encode_name(component_name):
+    name_bytes = str(component_name).encode()
+    if len(name_bytes) > _MAX_NAME_LENGTH_IN_BYTES or not name_bytes:
+        raise KeyError(f"Component name must have 1 to {_MAX_NAME_LENGTH_IN_BYTES} bytes: {component_name}")
+    return name_bytes
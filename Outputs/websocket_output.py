@@ -1,4 +1,4 @@
-from DataFormat.datatypes_helper import wrap_socket_message_with_metadata
+from DataFormat.datatypes_helper import get_key_by_instance, is_coalesced, wrap_socket_message_with_metadata
 from base_keys import WEBSOCKET_DATATYPE, WEBSOCKET_MESSAGE, WEBSOCKET_CLIENT_TYPE
 from base_component import BaseComponent
 from Websocket import socket_server
@@ -15,6 +15,12 @@ class WebsocketOutput(BaseComponent):
         websocket_datatype = raw_data.get(WEBSOCKET_DATATYPE)  # can be None
         websocket_client_type = raw_data.get(WEBSOCKET_CLIENT_TYPE)
 
+        if not websocket_datatype:
+            websocket_datatype = get_key_by_instance(websocket_message)
+
+        # encoded once, the same bytes are queued for all the clients of the client type
         output_data = wrap_socket_message_with_metadata(websocket_message, websocket_datatype)
 
-        socket_server.send_data(output_data, websocket_client_type)
+        # the datatype is used to coalesce the pending messages of slow clients (see Websocket/send_queue.py)
+        socket_server.send_data(output_data, websocket_client_type, websocket_datatype,
+                                coalesce=is_coalesced(websocket_datatype))
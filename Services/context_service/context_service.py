@@ -22,7 +22,7 @@ class ContextService(BaseComponent):
         entry_func = endpoint_utility.get_entry_func_of(new_service)
         entry_func = getattr(component_instance, entry_func)
 
-        all_component_status = super().get_memory_data(base_keys.MEMORY_COMPONENT_STATUS_KEY)
+        all_component_status = super().get_all_component_status()
 
         exitpoints = config_utility.get_channel_exitpoints()
 
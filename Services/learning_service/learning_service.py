@@ -6,7 +6,7 @@ import re
 import base_keys
 from APIs.langchain_llm.langchain_openai import OpenAIClient
 from DataFormat import datatypes_helper
-from Utilities import image_utility, logging_utility, time_utility
+from Utilities import encoded_image_cache, image_utility, logging_utility, time_utility
 from base_component import BaseComponent
 from . import learning_display, learning_keys
 from .learning_data_handler import build_highlight_point_data, build_learning_data
@@ -41,6 +41,7 @@ class LearningService(BaseComponent):
         self.finger_pose_buffer = []
         self.last_point = None
         self.last_frame = None
+        self.last_frame_details = None
 
     def run(self, raw_data: dict):
         '''
@@ -56,9 +57,7 @@ class LearningService(BaseComponent):
             self._handle_camera_data(raw_data)
         if origin == base_keys.WEBSOCKET_WIDGET:
             datatype = raw_data[base_keys.WEBSOCKET_DATATYPE]
-            data = raw_data[base_keys.WEBSOCKET_MESSAGE]
-            # FIXME: remove this conversion once all components are using protobuf and use object values
-            data = datatypes_helper.convert_json_to_protobuf(datatype, data)
+            data = datatypes_helper.get_websocket_protobuf(raw_data)
             _logger.debug("Learning Service: {datatype}", datatype=datatype)
             self._handle_websocket_data(datatype, data)
 
@@ -75,9 +74,7 @@ class LearningService(BaseComponent):
         super().send_to_component(websocket_message=websocket_highlight_point_data)
 
     def _handle_camera_data(self, raw_data):
-        super().set_memory_data(base_keys.CAMERA_FRAME, raw_data[base_keys.CAMERA_FRAME])
-        super().set_memory_data(base_keys.CAMERA_FRAME_WIDTH, raw_data[base_keys.CAMERA_FRAME_WIDTH])
-        super().set_memory_data(base_keys.CAMERA_FRAME_HEIGHT, raw_data[base_keys.CAMERA_FRAME_HEIGHT])
+        super().set_camera_frame_sequence(raw_data[base_keys.CAMERA_FRAME_SEQUENCE])
 
     def _handle_websocket_data(self, socket_data_type, decoded_data):
         if socket_data_type == learning_keys.REQUEST_LEARNING_DATA:
@@ -93,13 +90,17 @@ class LearningService(BaseComponent):
         else:
             _logger.error("Unknown websocket type {type} received in Learning Service", type=socket_data_type)
 
-    def get_learning_content(self, question: str, image_frame=None) -> str:
+    def get_learning_content(self, question: str, image_frame=None, frame_details=None) -> str:
         '''
         This function generates the learning content based on the object of interest, text content and speech content
         Parameters:
         ________
         question: str
             The user question
+        image_frame: numpy.ndarray
+            The camera frame
+        frame_details: dict
+            The details of the camera frame (see get_camera_frame_data)
         '''
         user_prompt = question
         _logger.debug("Prompt: {prompt}", prompt=user_prompt)
@@ -112,21 +113,25 @@ class LearningService(BaseComponent):
             # use the last frame if the current frame is not available
             if frame is None and self.last_frame is not None:
                 frame = self.last_frame
+                frame_details = self.last_frame_details
 
             # get the cropped image based on the last pointing location
+            region = None
             if self.last_point is not None:
                 frame = self._get_cropped_from_camera(self.last_point, frame, frame_width, frame_height)
+                region = (self.last_point.camera_x, self.last_point.camera_y)
 
             if frame is None:
                 learning_content = self.text_generator.generate(user_prompt,
                                                                 system_context=LearningConfig.SYSTEM_PROMPT)
             else:
                 # always take in context of frame
-                image_png_bytes = image_utility.get_png_image_bytes(frame)
-                learning_content = self.text_generator.generate(user_prompt, image_png_bytes,
+                image_bytes = encoded_image_cache.get_upload_image_bytes(
+                    frame, encoded_image_cache.get_frame_key(frame_details, region))
+                learning_content = self.text_generator.generate(user_prompt, image_bytes,
                                                                 system_context=LearningConfig.SYSTEM_PROMPT)
                 # temporary save the image
-                image_utility.save_image_bytes('temp.png', image_png_bytes)
+                image_utility.save_image_bytes(f"temp.{image_utility.get_image_format(image_bytes)}", image_bytes)
         except Exception:
             _logger.exception("Error in text generation")
 
@@ -137,9 +142,10 @@ class LearningService(BaseComponent):
         This function gets the original image size
         :return: {tuple} frame_width, frame_height
         '''
-        frame_width = super().get_memory_data(base_keys.CAMERA_FRAME_WIDTH)
-        frame_height = super().get_memory_data(base_keys.CAMERA_FRAME_HEIGHT)
-        return frame_width, frame_height
+        _, frame_details = super().get_camera_frame_data(copy=False)
+        if frame_details is None:
+            return None, None
+        return frame_details["frame_width"], frame_details["frame_height"]
 
     def _handle_learning_request(self):
         _logger.debug("Received learning request")
@@ -178,16 +184,17 @@ class LearningService(BaseComponent):
 
     # gaze/gesture interaction
     def _handle_point_select(self, point_data):
-        frame = super().get_memory_data(base_keys.CAMERA_FRAME)
+        frame, frame_details = super().get_camera_frame_data()
 
         # notify the selection
         self._send_websocket_highlight_point_data(point_data.world_x, point_data.world_y, point_data.world_z)
         # update the selection
         self.last_point = point_data
         self.last_frame = frame
+        self.last_frame_details = frame_details
         # send the learning data
         question = "Briefly describe what you see."
-        self._send_learning_data(question, is_gaze_interaction=True, image_frame=frame)
+        self._send_learning_data(question, is_gaze_interaction=True, image_frame=frame, frame_details=frame_details)
 
     # voice interaction
     def _handle_speech_data(self, speech_data):
@@ -195,12 +202,12 @@ class LearningService(BaseComponent):
         _logger.info("Received speech data: {voice}", voice=voice)
 
         if voice is not None and voice != "":
-            frame = None
+            frame, frame_details = None, None
             # add the image frame if the voice contains reference words
             if self._contains_reference_words(voice):
-                frame = super().get_memory_data(base_keys.CAMERA_FRAME)
+                frame, frame_details = super().get_camera_frame_data()
 
-            self._send_learning_data(voice, False, frame)
+            self._send_learning_data(voice, False, frame, frame_details)
 
     def _contains_reference_words(self, text):
         # List of reference words to check for
@@ -216,10 +223,11 @@ class LearningService(BaseComponent):
         # Return True if any reference words are found, otherwise False
         return bool(match)
 
-    def _send_learning_data(self, question: str, is_gaze_interaction: bool = False, image_frame=None):
+    def _send_learning_data(self, question: str, is_gaze_interaction: bool = False, image_frame=None,
+                            frame_details=None):
         self.learning_data_has_sent = True
 
-        learning_content = self.get_learning_content(question, image_frame)
+        learning_content = self.get_learning_content(question, image_frame, frame_details)
         _logger.info("Learning content: {content}", content=learning_content)
 
         # speak only for non-gaze interactions
@@ -244,6 +252,7 @@ class LearningService(BaseComponent):
         self.learning_data_has_sent = False
         self.last_point = None
         self.last_frame = None
+        self.last_frame_details = None
         self._send_websocket_learning_data("", "", "")
 
     def same_pointing_location(self, camera_x: float, camera_y: float, finger_pose_data, offset: float):
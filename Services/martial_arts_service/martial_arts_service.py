@@ -1,4 +1,4 @@
-from base_keys import ORIGIN_KEY, WEBSOCKET_WIDGET, WEBSOCKET_MESSAGE, WEBSOCKET_DATATYPE
+from base_keys import ORIGIN_KEY, WEBSOCKET_WIDGET, WEBSOCKET_DATATYPE
 from base_component import BaseComponent
 from DataFormat import datatypes_helper
 from Utilities import logging_utility
@@ -62,10 +62,7 @@ class MartialArtsService(BaseComponent):
         if origin == WEBSOCKET_WIDGET:
             # print("raw_data", raw_data)
             datatype = raw_data[WEBSOCKET_DATATYPE]
-            data = raw_data[WEBSOCKET_MESSAGE]
-
-            # FIXME: remove this conversion once all components are using protobuf and use object values?
-            data = datatypes_helper.convert_json_to_protobuf(datatype, data)
+            data = datatypes_helper.get_websocket_protobuf(raw_data)
             self._handle_websocket_data(datatype, data)
 
     def _handle_websocket_data(self, socket_data_type, decoded_data) -> None:
@@ -17,3 +17,4 @@ class MemoryAssistanceConfig:
     MEMORY_RECALL_INSTANCES_COUNT = 3  # instances to show
 
     IMAGE_SAMPLING_DURATION_SECONDS = 30  # duration to sample images
+    IMAGE_SCENE_CHANGE_MAX_DISTANCE = 10  # different bits (of 64) of the image hashes of the same scene
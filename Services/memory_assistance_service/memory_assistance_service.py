@@ -4,7 +4,7 @@ from pymilvus import MilvusException
 
 import base_keys
 from DataFormat import datatypes_helper
-from Utilities import logging_utility, time_utility, image_utility
+from Utilities import frame_pyramid, logging_utility, time_utility, image_utility
 from base_component import BaseComponent
 from . import memory_keys
 from .memory_assistance_config import MemoryAssistanceConfig
@@ -12,7 +12,7 @@ from .memory_assistance_data_handler import get_key_event_type, build_template_d
 from .memory_assistance_enum import MemoryAssistanceAction, MemoryAssistanceState
 from .memory_assistance_state_manager import get_init_state, get_next_state
 from .memory_saving_retrieving_api import enable_memory_saving, search_texts_by_similarity, search_matching_images, \
-    insert_image_memory, insert_text_memory
+    insert_image_memory, insert_text_memory, load_embedding_model
 
 _logger = logging_utility.setup_logger(__name__)
 
@@ -35,9 +35,17 @@ class MemoryAssistanceService(BaseComponent):
         "TEMPLATE_DATA",
     }
 
+    # images are sampled every few seconds (see _IMAGE_SAMPLING_DURATION_MILLIS)
+    MAX_FRAME_RATE = 1
+    # the image embeddings are computed from the frame downscaled for CLIP
+    FRAME_VARIANTS = {"clip"}
+
     def __init__(self, name):
         super().__init__(name)
         self.last_image_saved_millis = 0
+        # the images of the same scene as the last saved image are not saved again
+        self.scene_change_detector = image_utility.SceneChangeDetector(
+            MemoryAssistanceConfig.IMAGE_SCENE_CHANGE_MAX_DISTANCE)
 
         try:
             enable_memory_saving()
@@ -45,6 +53,8 @@ class MemoryAssistanceService(BaseComponent):
             _logger.exception("Error in connecting to Milvus")
             sys.exit(1)  # Exit with status 1 to indicate an error
 
+        load_embedding_model()
+
         super().set_memory_data(_MEMORY_KEY_SPEECH_DATA, "")
         super().set_memory_data(_MEMORY_KEY_STATE, get_init_state())
 
@@ -68,7 +78,8 @@ class MemoryAssistanceService(BaseComponent):
             self._handle_speech_data(raw_data[base_keys.AUDIO_TRANSCRIPTION_DATA])
 
         if origin == base_keys.WEBSOCKET_WIDGET:  # assume text is received
-            self._handle_websocket_data(raw_data[base_keys.WEBSOCKET_DATATYPE], raw_data[base_keys.WEBSOCKET_MESSAGE])
+            self._handle_websocket_data(raw_data[base_keys.WEBSOCKET_DATATYPE],
+                                        datatypes_helper.get_websocket_protobuf(raw_data))
 
         if origin == base_keys.KEYBOARD_WIDGET:
             self._handle_keyboard(raw_data[base_keys.KEYBOARD_EVENT], raw_data[base_keys.KEYBOARD_KEY_NAME],
@@ -79,26 +90,30 @@ class MemoryAssistanceService(BaseComponent):
 
         # Perform actions based on the current state
         if state == MemoryAssistanceState.MEMORY_SAVING_STATE:
-            self._attempt_save_memory(raw_data[base_keys.CAMERA_FRAME])
+            self._attempt_save_memory(raw_data[base_keys.CAMERA_FRAME],
+                                      frame_pyramid.get_frame_variant(raw_data, "clip"))
         elif state == MemoryAssistanceState.MEMORY_RECALL_STATE:
             self._attempt_retrieve_memory()
 
             self.update_state(MemoryAssistanceAction.MEMORY_RECALL_END)
 
-    def _attempt_save_memory(self, image_frame) -> bool:
+    def _attempt_save_memory(self, image_frame, clip_image_frame=None) -> bool:
         # Check time since last image save
         if time_utility.get_current_millis() - self.last_image_saved_millis < _IMAGE_SAMPLING_DURATION_MILLIS:
             return False
 
-        image_saved = self._save_memory(image_frame)
+        image_saved = self._save_memory(image_frame, clip_image_frame)
         if image_saved:
             self.last_image_saved_millis = time_utility.get_current_millis()
 
         return image_saved
 
-    def _save_memory(self, image_frame):
+    def _save_memory(self, image_frame, clip_image_frame=None):
         try:
-            insert_image_memory(image_frame)
+            if self.scene_change_detector.is_new_scene(image_frame):
+                insert_image_memory(image_frame, clip_image_frame)
+            else:
+                _logger.debug("Skipped the image memory, which is near-identical to the last one")
 
             speech_text_data = self.pop_speech_in_memory().strip()
             if speech_text_data != "":
@@ -108,6 +123,7 @@ class MemoryAssistanceService(BaseComponent):
             return True
         except MilvusException:
             _logger.exception("Error saving memory")
+            self.scene_change_detector.reset()
             return False
 
     def _attempt_retrieve_memory(self):
@@ -138,10 +154,9 @@ class MemoryAssistanceService(BaseComponent):
 
         return _texts, _images
 
-    def _handle_websocket_data(self, datatype, data) -> None:
-        # Decode and process WebSocket data
+    def _handle_websocket_data(self, datatype, decoded_data) -> None:
+        # Process the (decoded) WebSocket data
         _logger.debug("Memory Service: {datatype}", datatype=datatype)
-        decoded_data = datatypes_helper.convert_json_to_protobuf(datatype, data)
         if datatype == memory_keys.SPEECH_INPUT_DATA:
             voice = decoded_data.voice
             self._handle_speech_data(voice)
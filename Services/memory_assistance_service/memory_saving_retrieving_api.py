@@ -1,5 +1,6 @@
 import numpy as np
 from pymilvus import MilvusException
+from PIL import Image
 
 from APIs.local_clip import local_clip
 from APIs.local_vector_db import milvus_api
@@ -50,17 +51,28 @@ def enable_memory_saving():
     milvus_api.create_milvus_index(_COLLECTION_NAME, "embeddings", metric_type="IP")
 
 
-def insert_image_memory(image_frame):
+def load_embedding_model():
+    '''
+    Load the CLIP model (used for the embeddings of the memories) before the first memory is saved/retrieved.
+    '''
+    local_clip.load_model()
+
+
+def insert_image_memory(image_frame, clip_image_frame=None):
     '''
     Insert the image memories into the given collection.
     :param image_frame: The image to insert.
+    :param clip_image_frame: The image downscaled for CLIP in RGB (see frame_pyramid), or None to use image_frame.
 
     throws: MilvusException
     '''
     # save the image
     image_path = _save_image(image_frame)
     # get the image features
-    pil_image = image_utility.get_pil_image(image_frame)
+    if clip_image_frame is not None:
+        pil_image = Image.fromarray(clip_image_frame)
+    else:
+        pil_image = image_utility.get_pil_image(image_frame)
     image_features = local_clip.get_image_features(pil_image)
 
     # generate entities and save them
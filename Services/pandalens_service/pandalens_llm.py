@@ -8,7 +8,7 @@ from APIs.cloud_vision.VisionClient import VisionClient
 from APIs.langchain_llm.llm_exceptions import ErrorClassificationException
 from APIs.langchain_llm.langchain_openai import OpenAIClient
 from Services.pandalens_service import pandalens_prompt, pandalens_const
-from Utilities import image_utility
+from Utilities import encoded_image_cache, image_utility
 
 class LabelCaptionSchema(BaseModel):
     """Schema for labeling and captioning an image."""
@@ -82,11 +82,12 @@ class PandaLensAI:
         }
         return json.dumps(message)
 
-    def generate_question(self, image_array, user_action):
-        """Generate a reflective question and summary based on the image."""
-        img_bytes = image_utility.get_png_image_bytes(image_array)
-        ocr_text = self.get_ocr_text(img_bytes)
-        label, caption = self.get_label_and_caption(img_bytes)
+    def generate_question(self, image_array, user_action, image_key=None):
+        """Generate a reflective question and summary based on the image (see encoded_image_cache.get_frame_key)."""
+        # the png is used by the OCR (and is sent to the client, see array_to_base64), the image uploaded to the LLM
+        # for the captioning is encoded in IMAGE_UPLOAD_FORMAT
+        ocr_text = self.get_ocr_text(encoded_image_cache.get_png_image_bytes(image_array, image_key))
+        label, caption = self.get_label_and_caption(encoded_image_cache.get_upload_image_bytes(image_array, image_key))
 
         self.session_data.update({
             "last_image_label": label,
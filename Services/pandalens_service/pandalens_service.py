@@ -7,7 +7,7 @@ from Services.pandalens_service import (pandalens_keys,
                                         pandalens_blog,
                                         pandalens_data_handler,
                                         pandalens_state_manager)
-from Utilities import logging_utility, image_utility, time_utility
+from Utilities import encoded_image_cache, logging_utility, image_utility, time_utility
 from base_component import BaseComponent
 from .pandalens_enum import PandaLensState, PandaLensAction
 from .pandalens_llm import PandaLensAI
@@ -38,6 +38,7 @@ class PandaLensService(BaseComponent):
         self.state = pandalens_state_manager.get_init_state()
         self.previous_llm_invoke_time = time_utility.get_current_millis()
         self.image_of_interest = None
+        self.image_of_interest_key = None  # see encoded_image_cache.get_frame_key
         self.summary = None
 
     def run(self, raw_data):
@@ -50,17 +51,14 @@ class PandaLensService(BaseComponent):
 
         if origin == base_keys.WEBSOCKET_WIDGET:
             datatype = raw_data[base_keys.WEBSOCKET_DATATYPE]
-            data = raw_data[base_keys.WEBSOCKET_MESSAGE]
-            data = datatypes_helper.convert_json_to_protobuf(datatype, data)
+            data = datatypes_helper.get_websocket_protobuf(raw_data)
             self._handle_websocket_data(datatype, data)
 
     def _store_camera_data_in_memory(self, raw_data):
-        super().set_memory_data(base_keys.CAMERA_FRAME, raw_data[base_keys.CAMERA_FRAME])
-        super().set_memory_data(base_keys.CAMERA_FRAME_WIDTH, raw_data[base_keys.CAMERA_FRAME_WIDTH])
-        super().set_memory_data(base_keys.CAMERA_FRAME_HEIGHT, raw_data[base_keys.CAMERA_FRAME_HEIGHT])
+        super().set_camera_frame_sequence(raw_data[base_keys.CAMERA_FRAME_SEQUENCE])
 
-    def _send_websocket_pandalens_question(self, image, text_content="", speech_content=""):
-        image_base_64 = self.array_to_base64(image)
+    def _send_websocket_pandalens_question(self, image, text_content="", speech_content="", image_key=None):
+        image_base_64 = self.array_to_base64(image, image_key)
         websocket_pandalens_data = pandalens_data_handler.build_pandalens_question(image_base_64, text_content,
                                                                                    speech_content)
         super().send_to_component(websocket_message=websocket_pandalens_data,
@@ -131,9 +129,10 @@ class PandaLensService(BaseComponent):
         # Prevent unnecessary cost of querying LLM
         if not self._update_state(PandaLensAction.CLIENT_CAMERA_PRESS):
             return
-        frame, _, _ = self._get_latest_frame_from_memory()
+        frame, _, _, frame_details = self._get_latest_frame_from_memory()
         self._generate_send_question(cropped_image=frame,
-                                     user_action=pandalens_const.CAMERA_ACTION_FOR_LLM)
+                                     user_action=pandalens_const.CAMERA_ACTION_FOR_LLM,
+                                     image_key=encoded_image_cache.get_frame_key(frame_details))
 
     def _handle_point_select(self, point_data):
         # Prevent unnecessary cost of querying LLM
@@ -143,26 +142,29 @@ class PandaLensService(BaseComponent):
         if not self._update_state(PandaLensAction.CLIENT_INTEREST):
             return
 
-        frame, frame_width, frame_height = self._get_latest_frame_from_memory()
+        frame, frame_width, frame_height, frame_details = self._get_latest_frame_from_memory()
         self.image_of_interest = frame
 
         # identify object data and send it to the client
         cropped_image = self._get_cropped_image_around_pointer(point_data, frame, frame_width, frame_height)
 
         self._generate_send_question(cropped_image=cropped_image,
-                                     user_action=pandalens_const.POINTER_INTEREST_ACTION_FOR_LLM)
+                                     user_action=pandalens_const.POINTER_INTEREST_ACTION_FOR_LLM,
+                                     image_key=encoded_image_cache.get_frame_key(
+                                         frame_details, (point_data.camera_x, point_data.camera_y)))
 
     def _handle_speech(self, speech_data):
         speech = speech_data.voice
         if self.state is PandaLensState.SERVER_QA_STATE:
-            self._generate_send_question(cropped_image=self.image_of_interest)
+            self._generate_send_question(cropped_image=self.image_of_interest, image_key=self.image_of_interest_key)
         elif self.state is PandaLensState.SERVER_BLOGGING_STATE:
             self._generate_save_summary(speech)
 
-    def _generate_send_question(self, cropped_image, user_action=None):
-        question, summary = self.pandalens_ai.generate_question(cropped_image, user_action)
+    def _generate_send_question(self, cropped_image, user_action=None, image_key=None):
+        question, summary = self.pandalens_ai.generate_question(cropped_image, user_action, image_key)
         self.previous_llm_invoke_time = time_utility.get_current_millis()
         self.image_of_interest = cropped_image
+        self.image_of_interest_key = image_key
         self.summary = summary
 
         if question == pandalens_const.LLM_NO_QUESTIONS:
@@ -171,7 +173,7 @@ class PandaLensService(BaseComponent):
             self._send_websocket_pandalens_reset("")
             return
 
-        self._send_websocket_pandalens_question(self.image_of_interest, question, question)
+        self._send_websocket_pandalens_question(self.image_of_interest, question, question, self.image_of_interest_key)
 
     def _generate_save_summary(self, speech_data):
         json_moments = pandalens_db.get_all_moments()
@@ -186,11 +188,11 @@ class PandaLensService(BaseComponent):
         self._send_websocket_pandalens_reset("Blog has been generated and saved in the cloud!")
 
     def _get_latest_frame_from_memory(self):
-        frame = super().get_memory_data(base_keys.CAMERA_FRAME)
-        frame_width = super().get_memory_data(base_keys.CAMERA_FRAME_WIDTH)
-        frame_height = super().get_memory_data(base_keys.CAMERA_FRAME_HEIGHT)
+        frame, frame_details = super().get_camera_frame_data()
+        if frame is None:
+            return None, None, None, None
 
-        return frame, frame_width, frame_height
+        return frame, frame_details["frame_width"], frame_details["frame_height"], frame_details
 
     def _get_cropped_image_around_pointer(self, point_data, frame, frame_width, frame_height):
         image_of_interest = frame
@@ -238,9 +240,9 @@ class PandaLensService(BaseComponent):
     def _clamp_image(self, actual, max_value):
         return max(0, min(actual, max_value - 1))
 
-    def array_to_base64(self, image_array):
-        # to bytes
-        image_png_bytes = image_utility.get_png_image_bytes(image_array)
+    def array_to_base64(self, image_array, image_key=None):
+        # to png bytes (the image was already encoded for the OCR, see PandaLensAI.generate_question)
+        image_bytes = encoded_image_cache.get_png_image_bytes(image_array, image_key)
         # Encode to base64
-        img_base64 = image_utility.get_base64_image(image_png_bytes)
+        img_base64 = image_utility.get_base64_image(image_bytes)
         return img_base64
@@ -35,9 +35,7 @@ class TemplateService(BaseComponent):
 
         if origin == base_keys.WEBSOCKET_WIDGET:
             datatype = raw_data[base_keys.WEBSOCKET_DATATYPE]
-            data = raw_data[base_keys.WEBSOCKET_MESSAGE]
-
-            data = datatypes_helper.convert_json_to_protobuf(datatype, data)
+            data = datatypes_helper.get_websocket_protobuf(raw_data)
             _logger.debug("Template Service: {datatype}", datatype=datatype)
 
             self._handle_websocket_data(datatype, data)
@@ -76,20 +74,18 @@ class TemplateService(BaseComponent):
         _logger.info("Sending Template Data (Text: {text}, Image, Audio: {audio_path}) sent to Template Scene",
                      text=text, image=image, audio_path=audio_path)
 
-    # Set the camera frame, frame width, frame height, last detection and class labels in the "shared" memory
+    # Set the camera frame sequence, last detection and class labels in the "shared" memory
     def _handle_camera_data(self, raw_data: dict) -> None:
-        super().set_memory_data(base_keys.CAMERA_FRAME, raw_data[base_keys.CAMERA_FRAME])
-        super().set_memory_data(base_keys.CAMERA_FRAME_WIDTH, raw_data[base_keys.CAMERA_FRAME_WIDTH])
-        super().set_memory_data(base_keys.CAMERA_FRAME_HEIGHT, raw_data[base_keys.CAMERA_FRAME_HEIGHT])
+        super().set_camera_frame_sequence(raw_data[base_keys.CAMERA_FRAME_SEQUENCE])
         super().set_memory_data(base_keys.YOLOV8_LAST_DETECTION, raw_data[base_keys.YOLOV8_LAST_DETECTION])
         super().set_memory_data(base_keys.YOLOV8_CLASS_LABELS, raw_data[base_keys.YOLOV8_CLASS_LABELS])
 
     # Get frame data from memory and get the detected label and image
     def _get_detected_label_and_image(self) -> tuple:
         frame_detections: dict = super().get_memory_data(base_keys.YOLOV8_LAST_DETECTION)
-        frame: numpy.ndarray = super().get_memory_data(base_keys.CAMERA_FRAME)
-        frame_width: int = super().get_memory_data(base_keys.CAMERA_FRAME_WIDTH)
-        frame_height: int = super().get_memory_data(base_keys.CAMERA_FRAME_HEIGHT)
+        frame, frame_details = super().get_camera_frame_data()
+        frame_width: int = frame_details["frame_width"] if frame_details else None
+        frame_height: int = frame_details["frame_height"] if frame_details else None
         class_labels: dict = super().get_memory_data(base_keys.YOLOV8_CLASS_LABELS)
 
         label, image = self._get_first_yolov8_detection(frame_detections, frame, frame_width, frame_height,
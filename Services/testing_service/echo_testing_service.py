@@ -0,0 +1,33 @@
+import base_keys
+from DataFormat import datatypes_helper
+from base_component import BaseComponent
+
+# websocket client type which receives the echo of each datatype
+_ECHO_CLIENT_TYPES = {
+    datatypes_helper.get_key_by_name("GAZE_POINTING_DATA"): [base_keys.UNITY_CLIENT],
+    datatypes_helper.get_key_by_name("SPEECH_INPUT_DATA"): [base_keys.UNITY_CLIENT],
+    datatypes_helper.get_key_by_name("EXERCISE_WEAR_OS_DATA"): [base_keys.WEAROS_CLIENT, base_keys.DASHBOARD_CLIENT],
+}
+
+
+class EchoTestingService(BaseComponent):
+    """
+    Sends the websocket messages back to the clients of the sender type (and the Wear OS data to the dashboard
+    clients too), to measure the round-trip latency and throughput of the server (see Tests/Benchmark).
+    """
+
+    SUPPORTED_DATATYPES = {
+        "GAZE_POINTING_DATA",
+        "SPEECH_INPUT_DATA",
+        "EXERCISE_WEAR_OS_DATA",
+    }
+
+    def run(self, raw_data):
+        super().set_component_status(base_keys.COMPONENT_IS_RUNNING_STATUS)
+
+        datatype = raw_data[base_keys.WEBSOCKET_DATATYPE]
+        data = datatypes_helper.get_websocket_protobuf(raw_data)
+
+        for websocket_client_type in _ECHO_CLIENT_TYPES.get(datatype, []):
+            super().send_to_component(websocket_message=data, websocket_datatype=datatype,
+                                      websocket_client_type=websocket_client_type)
@@ -24,9 +24,7 @@ class TestingService(BaseComponent):
 
         if origin == base_keys.WEBSOCKET_WIDGET:
             datatype = raw_data[base_keys.WEBSOCKET_DATATYPE]
-            data = raw_data[base_keys.WEBSOCKET_MESSAGE]
-
-            data = datatypes_helper.convert_json_to_protobuf(datatype, data)
+            data = datatypes_helper.get_websocket_protobuf(raw_data)
 
             self._handle_websocket_data(datatype, data)
 
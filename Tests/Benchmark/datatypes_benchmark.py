@@ -0,0 +1,88 @@
+"""
+Measures the messages per second of decoding (websocket data -> protobuf message) and encoding (protobuf message ->
+websocket data) with the precompiled datatype registry of datatypes_helper, compared to the original path (lookup),
+which resolves the message class (import) / datatype key (type name) of each message, and wraps the message in a
+SocketData message.
+
+Usage: python -m Tests.Benchmark.datatypes_benchmark --count 20000
+"""
+
+import argparse
+import importlib
+import time
+
+from DataFormat import datatypes_helper
+from DataFormat.ProtoFiles.Common import socket_data_pb2
+from DataFormat.ProtoFiles.Running import running_live_data_pb2
+
+
+def _get_proto_func_by_import(data_type_key):
+    proto_file = datatypes_helper.DATATYPE_TO_PROTO_MAP[datatypes_helper.get_name_by_key(data_type_key)]
+    submod = importlib.import_module(f"DataFormat.ProtoFiles.{proto_file[:-3].replace('/', '.')}")
+    return getattr(submod, dir(submod)[1])
+
+
+def _get_key_by_type_name(proto):
+    proto_file = str(type(proto)).split("'")[1].split(".")[0] + ".py"
+    return datatypes_helper.get_key_by_name(datatypes_helper.PROTO_TO_DATATYPE_MAP[proto_file][0])
+
+
+def decode_websocket_data_by_lookup(raw_data):
+    socket_data = socket_data_pb2.SocketData()
+    socket_data.ParseFromString(raw_data)
+
+    data = _get_proto_func_by_import(socket_data.data_type)()
+    data.ParseFromString(socket_data.data)
+    return socket_data.data_type, data
+
+
+def wrap_socket_message_by_lookup(data):
+    return socket_data_pb2.SocketData(data_type=_get_key_by_type_name(data),
+                                      data=data.SerializeToString()).SerializeToString()
+
+
+def get_messages_per_second(func, arg, count):
+    start_time = time.perf_counter()
+    for _ in range(count):
+        func(arg)
+    return count / (time.perf_counter() - start_time)
+
+
+def run_benchmark(lookup_func, registry_func, arg, count):
+    """
+    :return: (messages per second with the original path, messages per second with the registry)
+    """
+    if lookup_func(arg) != registry_func(arg):
+        raise ValueError(f"{lookup_func.__name__} and {registry_func.__name__} have different results")
+
+    return get_messages_per_second(lookup_func, arg, count), get_messages_per_second(registry_func, arg, count)
+
+
+def format_report(results):
+    lines = [f"{'operation':<10} {'lookup (msg/s)':>15} {'registry (msg/s)':>17} {'speedup':>8}"]
+    for name, (lookup_messages_per_second, registry_messages_per_second) in results.items():
+        lines.append(f"{name:<10} {lookup_messages_per_second:>15,.0f} {registry_messages_per_second:>17,.0f} "
+                     f"{registry_messages_per_second / lookup_messages_per_second:>7.1f}x")
+
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decoding/encoding throughput of the websocket datatypes")
+    parser.add_argument("--count", type=int, default=20000, help="number of messages decoded/encoded per run")
+    args = parser.parse_args()
+
+    message = running_live_data_pb2.RunningLiveData(distance="1.5", heart_rate="120", speed="3.2")
+    websocket_data = datatypes_helper.wrap_socket_message_with_metadata(message)
+
+    results = {
+        "decode": run_benchmark(decode_websocket_data_by_lookup, datatypes_helper.decode_websocket_data,
+                                websocket_data, args.count),
+        "encode": run_benchmark(wrap_socket_message_by_lookup, datatypes_helper.wrap_socket_message_with_metadata,
+                                message, args.count),
+    }
+    print(format_report(results))
+
+
+if __name__ == "__main__":
+    main()
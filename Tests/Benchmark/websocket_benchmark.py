@@ -0,0 +1,274 @@
+"""
+Load test of the websocket server, on localhost.
+
+Starts the server (main.py) with the benchmark configuration (./Config: websocket widget -> echo testing service ->
+websocket output), connects simulated clients, and reports:
+    - the throughput (messages per second sent/received) and the round-trip latency (p50/p99) per client type
+    - the CPU usage of each process of the server
+    - the duration (p50/p95/p99) of the entry function of each component (see trace_utility)
+
+Simulated clients (SocketData-wrapped protobuf streams):
+    - unity: gaze data at 60 Hz, and bursts of speech data every 5 seconds
+    - wearOS: exercise data at 1 Hz
+    - dashboard: only receives (the echo of the exercise data)
+
+The echo of a message is sent to all the clients of the sender type, as the services do with `websocket_client_type`.
+
+Usage: python -m Tests.Benchmark.websocket_benchmark --unity 2 --wearos 2 --dashboard 1 --duration 30
+    The environment (ENV, default: dev) is loaded from the .env file, as for the server.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import numpy as np
+import websockets
+
+import base_keys
+from Memory import Memory
+from DataFormat import datatypes_helper
+from DataFormat.ProtoFiles.Common import exercise_wear_os_data_pb2, gaze_point_data_pb2, speech_data_pb2
+from Utilities import trace_utility
+from Utilities.file_utility import get_project_root
+
+_CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Config")
+
+_GAZE_RATE = 60
+_WEAR_OS_RATE = 1
+_SPEECH_BURST_SIZE = 10
+_SPEECH_BURST_INTERVAL_SECONDS = 5
+
+_SERVER_START_TIMEOUT_SECONDS = 60
+_SERVER_STOP_TIMEOUT_SECONDS = 10
+_DRAIN_SECONDS = 1
+
+_GAZE_DATATYPE = datatypes_helper.get_key_by_name("GAZE_POINTING_DATA")
+_SPEECH_DATATYPE = datatypes_helper.get_key_by_name("SPEECH_INPUT_DATA")
+_WEAR_OS_DATATYPE = datatypes_helper.get_key_by_name("EXERCISE_WEAR_OS_DATA")
+
+# field of each message which carries the message id, i.e., "unity-0:12"
+_MESSAGE_ID_FIELDS = {
+    _GAZE_DATATYPE: "details",
+    _SPEECH_DATATYPE: "voice",
+    _WEAR_OS_DATATYPE: "current_status",
+}
+
+
+class SimulatedClient:
+    """
+    Websocket client of a client type, which sends its message streams and measures the round trip of its messages
+    """
+
+    def __init__(self, client_type, index, url):
+        self.client_type = client_type
+        self.name = f"{client_type}-{index}"
+        self.url = url
+
+        self.message_count = 0
+        # message id -> time.perf_counter() when sent
+        self.sent_times = {}
+        self.sent_count = 0
+        self.received_count = 0
+        self.round_trip_millis = []
+
+    async def run(self, duration_seconds):
+        async with websockets.connect(self.url, max_size=None,
+                                      extra_headers={base_keys.WEBSOCKET_CLIENT_TYPE: self.client_type}) as websocket:
+            receiver = asyncio.create_task(self.receive(websocket))
+
+            senders = []
+            if self.client_type == base_keys.UNITY_CLIENT:
+                senders.append(self.send_periodically(websocket, self.build_gaze_data, _GAZE_RATE))
+                senders.append(self.send_bursts(websocket))
+            elif self.client_type == base_keys.WEAROS_CLIENT:
+                senders.append(self.send_periodically(websocket, self.build_wear_os_data, _WEAR_OS_RATE))
+
+            try:
+                await asyncio.wait_for(asyncio.gather(*senders, asyncio.sleep(duration_seconds)), duration_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+            # wait for the echoes of the last messages
+            await asyncio.sleep(_DRAIN_SECONDS)
+            receiver.cancel()
+
+    async def send_periodically(self, websocket, build_message, rate):
+        next_time = time.perf_counter()
+        while True:
+            await self.send(websocket, *build_message())
+            next_time += 1 / rate
+            await asyncio.sleep(max(0.0, next_time - time.perf_counter()))
+
+    async def send_bursts(self, websocket):
+        while True:
+            for _ in range(_SPEECH_BURST_SIZE):
+                await self.send(websocket, *self.build_speech_data())
+            await asyncio.sleep(_SPEECH_BURST_INTERVAL_SECONDS)
+
+    async def send(self, websocket, datatype, message):
+        self.sent_times[_get_message_id(datatype, message)] = time.perf_counter()
+        await websocket.send(datatypes_helper.wrap_socket_message_with_metadata(message, datatype))
+        self.sent_count += 1
+
+    async def receive(self, websocket):
+        async for data in websocket:
+            received_time = time.perf_counter()
+            self.received_count += 1
+
+            datatype, message = datatypes_helper.decode_websocket_data(data)
+            sent_time = self.sent_times.pop(_get_message_id(datatype, message), None)
+            if sent_time is not None:
+                self.round_trip_millis.append((received_time - sent_time) * 1000)
+
+    def build_gaze_data(self):
+        return _GAZE_DATATYPE, gaze_point_data_pb2.GazePointData(camera_x=0.1, camera_y=1.6, camera_z=-0.2,
+                                                                 world_x=1.0, world_y=1.5, world_z=2.0,
+                                                                 details=self.__next_message_id())
+
+    def build_speech_data(self):
+        return _SPEECH_DATATYPE, speech_data_pb2.SpeechData(voice=self.__next_message_id())
+
+    def build_wear_os_data(self):
+        now_millis = int(time.time() * 1000)
+        return _WEAR_OS_DATATYPE, exercise_wear_os_data_pb2.ExerciseWearOsData(
+            start_time=now_millis, update_time=now_millis, duration=1000, curr_lat=1.29, curr_lng=103.77,
+            bearing=90, distance=1000, calories=50, heart_rate=140, heart_rate_avg=135, steps=1200, speed=3.0,
+            speed_avg=2.8, current_status=self.__next_message_id())
+
+    def __next_message_id(self):
+        self.message_count += 1
+        return f"{self.name}:{self.message_count}"
+
+
+def _get_message_id(datatype, message):
+    field = _MESSAGE_ID_FIELDS.get(datatype)
+    return getattr(message, field) if field else None
+
+
+def start_server(port, env, log_level):
+    server_env = dict(os.environ, ENV=env, CONFIG_DIR=_CONFIG_DIR, SERVER_PORT=str(port), LOG_LEVEL=str(log_level),
+                      TRACE_ENABLED="true")
+
+    # in its own process group, to stop all the processes of the server (its logs are in LOG_FILE)
+    return subprocess.Popen([sys.executable, "main.py"], cwd=get_project_root(), env=server_env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+async def wait_for_server(url, server):
+    deadline = time.monotonic() + _SERVER_START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"The server exited with code {server.returncode}")
+        try:
+            async with websockets.connect(url):
+                return
+        except OSError:
+            await asyncio.sleep(0.5)
+
+    raise TimeoutError(f"The server did not start in {_SERVER_START_TIMEOUT_SECONDS} seconds")
+
+
+def stop_server(server):
+    os.killpg(server.pid, signal.SIGINT)
+    try:
+        server.wait(_SERVER_STOP_TIMEOUT_SECONDS)
+    except subprocess.TimeoutExpired:
+        os.killpg(server.pid, signal.SIGKILL)
+
+
+def get_cpu_seconds(process_group):
+    """
+    :return: the CPU time (user + system) of each process of the process group, i.e., {pid: seconds} (Linux only)
+    """
+    cpu_seconds = {}
+    clock_ticks = os.sysconf("SC_CLK_TCK")
+
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/stat", encoding="utf-8") as stat_file:
+                # the fields after the process name (which may contain spaces)
+                fields = stat_file.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+
+        if int(fields[2]) == process_group:
+            cpu_seconds[int(pid)] = (int(fields[11]) + int(fields[12])) / clock_ticks
+
+    return cpu_seconds
+
+
+def format_report(clients, duration_seconds, cpu_seconds, cpu_duration_seconds, server_pid):
+    lines = [f"{'client type':<12} {'clients':>7} {'sent/s':>9} {'received/s':>11} {'round trips':>11} "
+             f"{'p50 (ms)':>9} {'p99 (ms)':>9}"]
+
+    for client_type in [base_keys.UNITY_CLIENT, base_keys.WEAROS_CLIENT, base_keys.DASHBOARD_CLIENT]:
+        type_clients = [client for client in clients if client.client_type == client_type]
+        if not type_clients:
+            continue
+
+        round_trip_millis = [millis for client in type_clients for millis in client.round_trip_millis]
+        p50, p99 = np.percentile(round_trip_millis, [50, 99]) if round_trip_millis else (float("nan"),) * 2
+        lines.append(f"{client_type:<12} {len(type_clients):>7} "
+                     f"{sum(client.sent_count for client in type_clients) / duration_seconds:>9.1f} "
+                     f"{sum(client.received_count for client in type_clients) / duration_seconds:>11.1f} "
+                     f"{len(round_trip_millis):>11} {p50:>9.2f} {p99:>9.2f}")
+
+    lines.append("")
+    lines.append(f"{'server process':<20} {'CPU %':>7}")
+    for pid, seconds in sorted(cpu_seconds.items()):
+        name = "main" if pid == server_pid else f"child {pid}"
+        lines.append(f"{name:<20} {seconds / cpu_duration_seconds * 100:>7.1f}")
+
+    lines.append("")
+    lines.append(trace_utility.format_latency_stats(trace_utility.get_published_latency_stats()))
+
+    return "\n".join(lines)
+
+
+async def run_benchmark(args):
+    url = f"ws://localhost:{args.port}"
+    server = start_server(args.port, args.env, args.log_level)
+
+    try:
+        await wait_for_server(url, server)
+
+        client_counts = [(base_keys.UNITY_CLIENT, args.unity), (base_keys.WEAROS_CLIENT, args.wearos),
+                         (base_keys.DASHBOARD_CLIENT, args.dashboard)]
+        clients = [SimulatedClient(client_type, index, url)
+                   for client_type, count in client_counts for index in range(count)]
+
+        start_cpu_seconds = get_cpu_seconds(server.pid)
+        start_time = time.perf_counter()
+        await asyncio.gather(*(client.run(args.duration) for client in clients))
+        cpu_duration_seconds = time.perf_counter() - start_time
+        cpu_seconds = {pid: seconds - start_cpu_seconds.get(pid, 0)
+                       for pid, seconds in get_cpu_seconds(server.pid).items()}
+
+        # read the traces (in the shared memory) before the server is stopped. The benchmark is not a process of the
+        # server, so the segments must not be unlinked when the benchmark exits
+        Memory.attach_shared_memory()
+        print(format_report(clients, args.duration, cpu_seconds, cpu_duration_seconds, server.pid))
+    finally:
+        stop_server(server)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test of the websocket server, on localhost")
+    parser.add_argument("--unity", type=int, default=1, help="number of simulated Unity clients")
+    parser.add_argument("--wearos", type=int, default=1, help="number of simulated Wear OS clients")
+    parser.add_argument("--dashboard", type=int, default=1, help="number of simulated dashboard clients")
+    parser.add_argument("--duration", type=float, default=30, help="duration of the load (seconds)")
+    parser.add_argument("--port", type=int, default=8190, help="port of the websocket server")
+    parser.add_argument("--env", default=os.environ.get("ENV", "dev"), help="environment (.env.<env>) of the server")
+    parser.add_argument("--log-level", type=int, default=30, help="log level of the server (default: warning)")
+
+    asyncio.run(run_benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
 from unittest.mock import MagicMock
 from Services.pandalens_service.pandalens_llm import PandaLensAI
+from Utilities import encoded_image_cache, image_utility
 from APIs.langchain_llm.llm_exceptions import ErrorClassificationException
 
 
@@ -39,3 +41,17 @@ def test_get_ocr_text_empty_image_bytes(setup_pandalens_ai):
 
     with pytest.raises(ErrorClassificationException, match="Image string cannot be none or empty"):
         ai.get_ocr_text(None)
+
+
+def test_generate_question_sends_png_to_ocr(setup_pandalens_ai, monkeypatch):
+    ai = setup_pandalens_ai
+    ai.get_ocr_text = MagicMock(return_value="text")
+    ai.get_label_and_caption = MagicMock(return_value=("label", "caption"))
+    ai.llm.generate_structured_output.return_value.dict.return_value = {}
+    monkeypatch.setattr(encoded_image_cache, "UPLOAD_FORMAT", image_utility.IMAGE_FORMAT_JPEG)
+
+    ai.generate_question(np.zeros((8, 8, 3), dtype=np.uint8), "user_action")
+
+    # only the captioning by the LLM gets the image in the upload format
+    assert image_utility.get_image_format(ai.get_ocr_text.call_args[0][0]) == image_utility.IMAGE_FORMAT_PNG
+    assert image_utility.get_image_format(ai.get_label_and_caption.call_args[0][0]) == image_utility.IMAGE_FORMAT_JPEG
@@ -1,7 +1,12 @@
+import numpy as np
 import pytest
 
+import base_keys
 from base_component import BaseComponent
+from DataFormat.message_dict import MessageDict
+from DataFormat.ProtoFiles.Common import speech_data_pb2
 from Memory import Memory
+from Utilities import routing_utility
 from Tests.Integration.test_db_util import set_test_db_environ
 
 set_test_db_environ()
@@ -46,8 +51,61 @@ def test_get_memory_data():
     assert base_component.get_memory_data(key_name) == value
 
 
+def test_get_camera_frame_data_by_sequence():
+    Memory.init()
+    sequence = base_component.set_camera_frame_data(np.full((2, 2, 3), 1, dtype=np.uint8), 2, 2, 30)
+    Memory.update_camera_frame(np.full((2, 2, 3), 2, dtype=np.uint8), 2, 2, 30)
+
+    # the latest frame, as no frame was received by the component
+    assert base_component.get_camera_frame_data()[0][0, 0, 0] == 2
+
+    base_component.set_camera_frame_sequence(sequence)
+    frame, frame_details = base_component.get_camera_frame_data()
+
+    assert frame[0, 0, 0] == 1
+    assert frame_details["sequence"] == sequence
+
+
+def test_get_camera_frame_data_if_overwritten():
+    Memory.init()
+    base_component.set_camera_frame_sequence(
+        base_component.set_camera_frame_data(np.full((2, 2, 3), 1, dtype=np.uint8), 2, 2, 30))
+    for value in range(2, 10):
+        Memory.update_camera_frame(np.full((2, 2, 3), value, dtype=np.uint8), 2, 2, 30)
+
+    # the latest frame instead
+    assert base_component.get_camera_frame_data()[0][0, 0, 0] == 9
+
+
+def test_send_to_component_with_view_per_subscriber(mocker):
+    received_messages = []
+    mocker.patch.object(routing_utility, "get_datatype_routes",
+                        return_value=[("subscriber", received_messages.append, None)] * 2)
+    message = speech_data_pb2.SpeechData(voice="hello")
+
+    base_component.send_to_component(websocket_message=MessageDict(message), websocket_data=message)
+    received_messages[0][base_keys.WEBSOCKET_MESSAGE]["voice"] = "bye"
+
+    assert received_messages[1][base_keys.WEBSOCKET_MESSAGE]["voice"] == "hello"
+    assert received_messages[1][base_keys.WEBSOCKET_MESSAGE].to_message() is message
+
+
 def test_get_supported_datatypes():
     assert len(base_component.get_supported_datatypes()) == 0
     assert base_component.is_supported_datatype("TEST_DATA") is False
 
     assert my_sub_component.is_supported_datatype("TEST_DATA") is True
+
+
+def test_set_and_get_component_status():
+    base_component.set_component_status(base_keys.COMPONENT_IS_RUNNING_STATUS)
+
+    assert base_component.get_component_status() == base_keys.COMPONENT_IS_RUNNING_STATUS
+    assert BaseComponent.get_all_component_status()["Test"] == base_keys.COMPONENT_IS_RUNNING_STATUS
+
+
+def test_set_invalid_component_status():
+    base_component.set_component_status(base_keys.COMPONENT_IS_STOPPED_STATUS)
+    base_component.set_component_status("INVALID_STATUS")
+
+    assert base_component.get_component_status() == base_keys.COMPONENT_IS_STOPPED_STATUS
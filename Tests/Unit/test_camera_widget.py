@@ -0,0 +1,101 @@
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+import base_keys
+from base_component import BaseComponent
+from Memory import Memory
+from Tests.Integration.test_db_util import set_test_db_environ
+from Utilities import routing_utility
+from Widgets.camera_widget import CameraWidget
+
+set_test_db_environ()
+
+FRAME_COUNT = 10
+FRAME_WIDTH = 64
+FRAME_HEIGHT = 48
+VIDEO_FPS = 10
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = str(tmp_path / "video.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), VIDEO_FPS, (FRAME_WIDTH, FRAME_HEIGHT))
+    for i in range(FRAME_COUNT):
+        writer.write(np.full((FRAME_HEIGHT, FRAME_WIDTH, 3), i * 20, dtype=np.uint8))
+    writer.release()
+
+    return path
+
+
+@pytest.fixture
+def sent_messages(mocker):
+    # the subscribers of the camera (not configured in the tests)
+    mocker.patch.object(routing_utility, "get_max_frame_rate", return_value=None)
+    mocker.patch.object(routing_utility, "get_frame_variants", return_value=set())
+
+    messages = []
+    mocker.patch.object(BaseComponent, "send_to_component",
+                        autospec=True, side_effect=lambda _, **kwargs: messages.append(kwargs))
+    yield messages
+
+    Memory.close()
+
+
+def play_video_file(monkeypatch, video_path, speed):
+    monkeypatch.setenv(base_keys.CAMERA_VIDEO_SOURCE, video_path)
+    monkeypatch.setenv(base_keys.CAMERA_VIDEO_FILE_SPEED, str(speed))
+
+    camera_widget = CameraWidget(base_keys.CAMERA_WIDGET)
+    start_time = time.monotonic()
+    camera_widget.start()  # until the end of the video file
+
+    return camera_widget, time.monotonic() - start_time
+
+
+def test_plays_video_file_at_native_fps(monkeypatch, video_path, sent_messages):
+    _, elapsed_seconds = play_video_file(monkeypatch, video_path, 1)
+
+    # the last frame is due (FRAME_COUNT - 1) / VIDEO_FPS seconds after the first one
+    assert len(sent_messages) == FRAME_COUNT
+    assert (FRAME_COUNT - 1) / VIDEO_FPS * 0.8 <= elapsed_seconds < (FRAME_COUNT - 1) / VIDEO_FPS * 2
+
+
+def test_plays_video_file_unthrottled(monkeypatch, video_path, sent_messages):
+    _, elapsed_seconds = play_video_file(monkeypatch, video_path, 0)
+
+    # every frame is sent, in order, without waiting for the playback time
+    assert len(sent_messages) == FRAME_COUNT
+    assert elapsed_seconds < (FRAME_COUNT - 1) / VIDEO_FPS / 2
+    for i, message in enumerate(sent_messages):
+        assert abs(message[base_keys.CAMERA_FRAME].mean() - i * 20) < 2
+        assert message[base_keys.CAMERA_FPS] == VIDEO_FPS
+        assert message[base_keys.CAMERA_FRAME_WIDTH] == FRAME_WIDTH
+
+
+def test_frame_timestamp_is_position_in_video_file(monkeypatch, video_path, sent_messages):
+    play_video_file(monkeypatch, video_path, 0)
+
+    timestamps = [message[base_keys.CAMERA_FRAME_TIMESTAMP] for message in sent_messages]
+
+    assert timestamps == pytest.approx([i * 1000 / VIDEO_FPS for i in range(FRAME_COUNT)])
+
+
+def test_frames_are_written_once_to_frame_store(monkeypatch, video_path, sent_messages):
+    play_video_file(monkeypatch, video_path, 0)
+
+    sequences = [message[base_keys.CAMERA_FRAME_SEQUENCE] for message in sent_messages]
+    frame, frame_details = Memory.get_camera_frame(copy=True)
+
+    assert sequences == list(range(sequences[0], sequences[0] + FRAME_COUNT))
+    assert frame_details["sequence"] == sequences[-1]
+    assert np.array_equal(frame, sent_messages[-1][base_keys.CAMERA_FRAME])
+
+
+def test_stops_at_end_of_video_file(monkeypatch, video_path, sent_messages):
+    camera_widget, _ = play_video_file(monkeypatch, video_path, 0)
+
+    assert camera_widget.capture is None
+    assert camera_widget.get_component_status() == base_keys.COMPONENT_IS_STOPPED_STATUS
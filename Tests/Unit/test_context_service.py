@@ -14,11 +14,14 @@ from Services.context_service.context_service import ContextService
 
 class MockClass:
     def __init__(self) -> None:
-        pass
+        self.stopped = False
 
-    def mock_func(self):
+    def mock_func(self, *args):
         pass
 
+    def mock_exit_func(self):
+        self.stopped = True
+
 
 component_instance = MockClass
 
@@ -41,7 +44,6 @@ def setup():
     }
 
     Memory.init()
-    Memory.update_shared_memory_item(base_keys.MEMORY_COMPONENT_STATUS_KEY, {})  # Initialise with an empty dictionary
 
 
 @pytest.fixture(autouse=True)
@@ -49,7 +51,6 @@ def teardown():
     # Reset Memory data
     Memory._memory = None
     Memory.init()
-    Memory.update_shared_memory_item(base_keys.MEMORY_COMPONENT_STATUS_KEY, {})  # Initialise with an empty dictionary
 
 
 def test_run_with_no_errors():
@@ -68,3 +69,19 @@ def test_run_with_no_errors():
                 context_service.run(data)
             except Exception:
                 pytest.fail("Unexpected Error Occurred")
+
+
+def test_run_stops_running_services():
+    config_utility.configuration["channel-exitpoints"]["service:running"] = "module.class.exitfunc"
+    running_service = ContextService("service:running")
+    running_service.set_component_status(base_keys.COMPONENT_IS_RUNNING_STATUS)
+    running_instance = MockClass()
+
+    with mock.patch("Utilities.endpoint_utility.get_component_instance",
+                    mock.MagicMock(return_value=running_instance)):
+        with mock.patch("Utilities.endpoint_utility.get_entry_func_of", mock.MagicMock(return_value="mock_func")):
+            with mock.patch("Utilities.endpoint_utility.get_exit_func_of",
+                            mock.MagicMock(return_value="mock_exit_func")):
+                ContextService("service:context").run({"websocket_message": {"detail": "input:name2"}})
+
+    assert running_instance.stopped is True
@@ -1,6 +1,12 @@
+import pickle
+
 import pytest
 
+import base_keys
 from DataFormat import datatypes_helper
+from DataFormat.message_dict import MessageDict
+from DataFormat.ProtoFiles.Common import socket_data_pb2
+from DataFormat.ProtoFiles.Running import running_live_data_pb2
 
 # Hack to set the _DATA_TYPE_JSON variable for testing
 mocked_datatype_json = {
@@ -64,3 +70,118 @@ def test__get_proto_file_to_data_type_mapping(mock_datatypes_helper):
 
 def test_get_key_by_name(mock_datatypes_helper):
     assert datatypes_helper.get_key_by_name("data") == 1000
+
+
+def test__get_coalesced_keys(mocker):
+    mocker.patch.object(datatypes_helper, "DATATYPE_JSON", {
+        "data": {"key": 1000, "proto_file": "file.py"},
+        "live_data": {"key": 1001, "proto_file": "file.py", "coalesce": True},
+    })
+
+    assert datatypes_helper._get_coalesced_keys() == {1001}
+
+
+def test_is_coalesced():
+    assert datatypes_helper.is_coalesced(datatypes_helper.get_key_by_name("RUNNING_LIVE_DATA"))
+    assert not datatypes_helper.is_coalesced(datatypes_helper.get_key_by_name("SERVICE_SWITCH_DATA"))
+
+
+def test_get_proto_func_by_key():
+    assert datatypes_helper.get_proto_func_by_key(datatypes_helper.get_key_by_name("RUNNING_LIVE_DATA")) == \
+        running_live_data_pb2.RunningLiveData
+    assert datatypes_helper.get_proto_func_by_key(-1) is None
+
+
+def test_get_key_by_instance():
+    # the first datatype of the proto file
+    assert datatypes_helper.get_key_by_instance(running_live_data_pb2.RunningLiveData()) == \
+        datatypes_helper.get_key_by_name("RUNNING_LIVE_DATA")
+
+
+def test_decode_websocket_data():
+    message = running_live_data_pb2.RunningLiveData(distance="1.5")
+    websocket_data = datatypes_helper.wrap_socket_message_with_metadata(message)
+
+    assert datatypes_helper.decode_websocket_data(websocket_data) == (
+        datatypes_helper.get_key_by_name("RUNNING_LIVE_DATA"), message)
+
+
+def test_get_websocket_protobuf():
+    message = running_live_data_pb2.RunningLiveData(distance="1.5")
+    datatype = datatypes_helper.get_key_by_name("RUNNING_LIVE_DATA")
+
+    assert datatypes_helper.get_websocket_protobuf({base_keys.WEBSOCKET_DATA: message}) is message
+    assert datatypes_helper.get_websocket_protobuf({base_keys.WEBSOCKET_MESSAGE: MessageDict(message)}) is message
+    assert datatypes_helper.get_websocket_protobuf({base_keys.WEBSOCKET_MESSAGE: {"distance": "1.5"},
+                                                    base_keys.WEBSOCKET_DATATYPE: datatype}) == message
+
+
+def test_get_websocket_protobuf_if_dict_modified():
+    message = running_live_data_pb2.RunningLiveData(distance="1.5", speed="3")
+    message_dict = MessageDict(message)
+    # i.e., RunningDemoService.save_demo_running_data
+    message_dict["distance"] = "2.5"
+    del message_dict["speed"]
+
+    data = datatypes_helper.get_websocket_protobuf({base_keys.WEBSOCKET_DATA: message,
+                                                    base_keys.WEBSOCKET_MESSAGE: message_dict})
+
+    assert data == running_live_data_pb2.RunningLiveData(distance="2.5")
+    assert message.distance == "1.5"
+
+
+def test_get_websocket_protobuf_if_dict_read():
+    message = running_live_data_pb2.RunningLiveData(distance="1.5")
+    message_dict = MessageDict(message).new_view()
+
+    assert message_dict["distance"] == "1.5"
+    assert datatypes_helper.get_websocket_protobuf({base_keys.WEBSOCKET_DATA: message,
+                                                    base_keys.WEBSOCKET_MESSAGE: message_dict}) is message
+
+
+def test_proto_message_is_picklable():
+    message = running_live_data_pb2.RunningLiveData(distance="1.5")
+
+    assert pickle.loads(pickle.dumps(message)) == message
+
+
+def test_decode_websocket_header():
+    message = running_live_data_pb2.RunningLiveData(distance="1.5")
+    websocket_data = datatypes_helper.wrap_socket_message_with_metadata(message)
+
+    datatype, serialized_message = datatypes_helper.decode_websocket_header(websocket_data)
+
+    assert datatype == datatypes_helper.get_key_by_name("RUNNING_LIVE_DATA")
+    assert serialized_message == message.SerializeToString()
+    assert datatypes_helper.decode_websocket_header("text") == (None, None)
+
+
+@pytest.mark.parametrize("data_type", [0, 1, 127, 128, 1001, 2 ** 31 - 1, -1])
+@pytest.mark.parametrize("distance", ["", "1.5", "x" * 300])
+def test_wrap_socket_message_with_metadata(data_type, distance):
+    message = running_live_data_pb2.RunningLiveData(distance=distance)
+
+    # the same bytes as the SocketData serialization, for the clients which parse SocketData
+    assert datatypes_helper.wrap_socket_message_with_metadata(message, data_type) == socket_data_pb2.SocketData(
+        data_type=data_type, data=message.SerializeToString()).SerializeToString()
+
+
+def test_wrap_socket_message_with_metadata_if_default_fields():
+    # the fields are written even if default (explicit presence), as SocketData does
+    websocket_data = datatypes_helper.wrap_socket_message_with_metadata(running_live_data_pb2.RunningLiveData(), 0)
+
+    assert websocket_data == b"\x08\x00\x12\x00"
+    assert websocket_data == socket_data_pb2.SocketData(data_type=0, data=b"").SerializeToString()
+    assert datatypes_helper.decode_websocket_header(websocket_data) == (0, b"")
+
+
+@pytest.mark.parametrize("data_type", [1, 1001, 2 ** 31 - 1, -1])
+def test_get_websocket_datatype(data_type):
+    message = running_live_data_pb2.RunningLiveData(distance="1.5")
+
+    assert datatypes_helper.get_websocket_datatype(
+        datatypes_helper.wrap_socket_message_with_metadata(message, data_type)) == data_type
+    # fields in another order
+    assert datatypes_helper.get_websocket_datatype(
+        b"\x12\x00" + socket_data_pb2.SocketData(data_type=data_type).SerializeToString()) == data_type
+    assert datatypes_helper.get_websocket_datatype("text") is None
@@ -0,0 +1,121 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from Memory import Memory
+from Memory.frame_store import FrameStore
+
+_TEST_FRAME_STORE_NAME = "TOM_TEST_FRAMES"
+
+
+@pytest.fixture
+def frame_store():
+    store = FrameStore(_TEST_FRAME_STORE_NAME, num_slots=2)
+    yield store
+    store.close(unlink=True)
+
+
+def get_frame(value, shape=(48, 64, 3)):
+    return np.full(shape, value, dtype=np.uint8)
+
+
+def test_read_if_no_frame(frame_store):
+    assert frame_store.read() == (None, None)
+
+
+def test_write_and_read_latest_frame(frame_store):
+    sequence = frame_store.write(get_frame(7), 64, 48, 30)
+
+    frame, frame_details = frame_store.read()
+
+    assert sequence == 1
+    assert np.array_equal(frame, get_frame(7))
+    assert frame_details["sequence"] == 1
+    assert frame_details["frame_width"] == 64
+    assert frame_details["frame_height"] == 48
+    assert frame_details["fps"] == 30
+
+
+def test_read_returns_view_unless_copy(frame_store):
+    frame_store.write(get_frame(1))
+
+    view, _ = frame_store.read()
+    copied, _ = frame_store.read(copy=True)
+    frame_store.write(get_frame(2))
+    frame_store.write(get_frame(3))  # overwrites the slot of the first frame
+
+    assert view[0, 0, 0] == 3
+    assert copied[0, 0, 0] == 1
+    assert frame_store.is_valid(1) is False
+
+
+def test_read_specific_frame(frame_store):
+    for i in range(1, 4):
+        frame_store.write(get_frame(i))
+
+    assert frame_store.read(1) == (None, None)  # overwritten (only 2 slots)
+    assert frame_store.read(2)[0][0, 0, 0] == 2
+    assert frame_store.read(3)[0][0, 0, 0] == 3
+
+
+def test_write_larger_frame_reallocates(frame_store):
+    frame_store.write(get_frame(1))
+    frame_store.write(get_frame(2, shape=(96, 128, 3)))
+
+    frame, frame_details = frame_store.read()
+
+    assert frame.shape == (96, 128, 3)
+    assert frame_details["sequence"] == 2
+    assert frame_store.read(1) == (None, None)
+
+
+def test_read_if_metadata_does_not_match_frame(frame_store):
+    frame_store.write(get_frame(1))
+    # i.e., the metadata of a larger frame, read before the data segment is reallocated
+    frame_store.slots[1]["shape"] = (96, 128, 3)
+
+    assert frame_store.read() == (None, None)
+    assert frame_store.read(1) == (None, None)
+
+
+def test_read_after_reallocation_by_other_store(frame_store):
+    reader = FrameStore(_TEST_FRAME_STORE_NAME, num_slots=2)
+    frame_store.write(get_frame(1))
+    assert reader.read(copy=True)[0].shape == (48, 64, 3)
+
+    frame_store.write(get_frame(2, shape=(96, 128, 3)))
+    frame, frame_details = reader.read(copy=True)
+    reader.close()
+
+    assert np.array_equal(frame, get_frame(2, shape=(96, 128, 3)))
+    assert frame_details["sequence"] == 2
+
+
+def write_frame(value):
+    store = FrameStore(_TEST_FRAME_STORE_NAME, num_slots=2)
+    store.write(get_frame(value), 64, 48, 15)
+    store.close()
+
+
+def test_frame_exists_across_processes(frame_store):
+    p = multiprocessing.Process(target=write_frame, args=(9,))
+    p.start()
+    p.join()
+
+    frame, frame_details = frame_store.read()
+
+    assert np.array_equal(frame, get_frame(9))
+    assert frame_details["fps"] == 15
+
+
+def test_memory_camera_frame():
+    Memory.update_camera_frame(get_frame(5), 64, 48, 30)
+
+    frame, frame_details = Memory.get_camera_frame(copy=True)
+
+    assert np.array_equal(frame, get_frame(5))
+    assert frame_details["frame_width"] == 64
+
+    Memory.close()
+    Memory.init()
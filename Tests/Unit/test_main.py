@@ -0,0 +1,38 @@
+import multiprocessing
+
+import base_keys
+import main
+from base_component import BaseComponent
+from Memory import Memory
+from Tests.Integration.test_db_util import set_test_db_environ
+
+set_test_db_environ()
+
+_INPUT_COMPONENT = "input:test"
+
+
+def run_input_loop(started):
+    # i.e., the loop of an input widget
+    component = BaseComponent(_INPUT_COMPONENT)
+    component.set_component_status(base_keys.COMPONENT_IS_RUNNING_STATUS)
+    started.set()
+    while component.get_component_status() == base_keys.COMPONENT_IS_RUNNING_STATUS:
+        component.set_memory_data("input_data", "value")
+
+
+def test_stop_input_process_by_status():
+    Memory.init()
+    started = multiprocessing.Event()
+    process = multiprocessing.Process(target=run_input_loop, args=(started,))
+    process.start()
+    assert started.wait(5)
+
+    main._stop_input_process(_INPUT_COMPONENT, process)
+
+    # stopped by its loop, not terminated, and the lock of the shared memory is free
+    assert process.exitcode == 0
+    for lock in Memory.get_process_locks().values():
+        assert lock.acquire(timeout=1)
+        lock.release()
+
+    Memory.close()
@@ -0,0 +1,79 @@
+import pickle
+
+from google.protobuf import json_format
+
+from DataFormat import datatypes_helper  # noqa: F401, makes the protobuf messages picklable
+from DataFormat.message_dict import MessageDict
+from DataFormat.ProtoFiles.Common import speech_data_pb2
+
+
+def test_converted_on_access():
+    message_dict = MessageDict(speech_data_pb2.SpeechData(voice="hello"))
+
+    assert message_dict._dict is None
+    assert message_dict["voice"] == "hello"
+    assert message_dict == {"voice": "hello"}
+
+
+def test_modified_like_dict():
+    message_dict = MessageDict(speech_data_pb2.SpeechData(voice="hello"))
+
+    message_dict["voice"] = "bye"
+    message_dict["extra"] = 1
+
+    assert dict(message_dict) == {"voice": "bye", "extra": 1}
+    assert message_dict.message.voice == "hello"
+
+
+def test_pickled():
+    message_dict = pickle.loads(pickle.dumps(MessageDict(speech_data_pb2.SpeechData(voice="hello"))))
+
+    assert message_dict._dict is None
+    assert message_dict.message == speech_data_pb2.SpeechData(voice="hello")
+    assert message_dict == {"voice": "hello"}
+
+
+def test_to_message_if_modified():
+    message = speech_data_pb2.SpeechData(voice="hello")
+    message_dict = MessageDict(message)
+
+    assert message_dict.to_message() is message
+
+    message_dict["voice"] = "bye"
+
+    assert message_dict.to_message() == speech_data_pb2.SpeechData(voice="bye")
+
+
+def test_to_message_if_only_read():
+    message = speech_data_pb2.SpeechData(voice="hello")
+    message_dict = MessageDict(message)
+
+    assert message_dict["voice"] == "hello"
+    assert message_dict.is_modified() is False
+    assert message_dict.to_message() is message
+
+
+def test_views_are_converted_once(mocker):
+    message = speech_data_pb2.SpeechData(voice="hello")
+    message_to_dict = mocker.spy(json_format, "MessageToDict")
+    message_dict = MessageDict(message)
+
+    views = [message_dict.new_view() for _ in range(3)]
+
+    assert [view["voice"] for view in views] == ["hello"] * 3
+    assert message_to_dict.call_count == 1
+    assert all(view.to_message() is message for view in views)
+
+
+def test_view_modifications_are_not_shared():
+    message = speech_data_pb2.SpeechData(voice="hello")
+    message_dict = MessageDict(message)
+    view, other_view = message_dict.new_view(), message_dict.new_view()
+
+    view["voice"] = "bye"
+
+    assert other_view["voice"] == "hello"
+    assert other_view.to_message() is message
+    assert view.to_message() == speech_data_pb2.SpeechData(voice="bye")
+    # i.e., forwarded by the subscriber to its own subscribers
+    assert view.new_view().to_message() == speech_data_pb2.SpeechData(voice="bye")
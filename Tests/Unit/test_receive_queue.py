@@ -0,0 +1,75 @@
+import threading
+
+from DataFormat import datatypes_helper
+from DataFormat.ProtoFiles.Common import gaze_point_data_pb2, speech_data_pb2
+from Websocket.receive_queue import ReceiveLimiter, ReceiveQueue, TokenBucket
+
+GAZE_DATATYPE = datatypes_helper.get_key_by_name("GAZE_POINTING_DATA")
+SPEECH_DATATYPE = datatypes_helper.get_key_by_name("SPEECH_INPUT_DATA")
+
+
+def test_token_bucket_allows_burst_then_rate():
+    bucket = TokenBucket(rate=10, burst=3)
+    now = bucket.last_time
+
+    assert [bucket.try_acquire(now) for _ in range(4)] == [True, True, True, False]
+    # one token per 0.1 second
+    assert bucket.try_acquire(now + 0.1)
+    assert not bucket.try_acquire(now + 0.1)
+
+
+def test_receive_limiter_unlimited_by_default():
+    limiter = ReceiveLimiter("unity")
+
+    assert all(limiter.allow(b"data") for _ in range(1000))
+    assert limiter.get_stats() == {"received": 1000, "throttled": 0}
+
+
+def test_receive_limiter_throttles_connection():
+    limiter = ReceiveLimiter("unity", rate=1, burst=2)
+
+    assert [limiter.allow(b"data") for _ in range(3)] == [True, True, False]
+    assert limiter.get_stats() == {"received": 3, "throttled": 1}
+
+
+def test_receive_limiter_throttles_datatype():
+    limiter = ReceiveLimiter("unity", datatype_rates={GAZE_DATATYPE: 2})
+    gaze_data = datatypes_helper.wrap_socket_message_with_metadata(gaze_point_data_pb2.GazePointData(), GAZE_DATATYPE)
+    speech_data = datatypes_helper.wrap_socket_message_with_metadata(speech_data_pb2.SpeechData(), SPEECH_DATATYPE)
+
+    assert [limiter.allow(gaze_data) for _ in range(3)] == [True, True, False]
+    # the other datatypes are not limited
+    assert all(limiter.allow(speech_data) for _ in range(10))
+    assert limiter.get_stats()["throttled"] == 1
+
+
+def test_receive_queue_reads_sources_in_turn():
+    queue = ReceiveQueue(max_size=10)
+    for i in range(3):
+        queue.put("unity", f"unity-{i}")
+    queue.put("wearOS", "wearOS-0")
+
+    assert [queue.get(timeout=0) for _ in range(4)] == ["unity-0", "wearOS-0", "unity-1", "unity-2"]
+    assert queue.get(timeout=0) is None
+
+
+def test_receive_queue_drops_oldest_of_longest_source():
+    queue = ReceiveQueue(max_size=3)
+    queue.put("unity", "unity-0")
+    queue.put("unity", "unity-1")
+    queue.put("wearOS", "wearOS-0")
+    queue.put("wearOS", "wearOS-1")
+
+    assert queue.qsize() == 3
+    assert queue.get_stats("unity") == {"receive_depth": 1, "receive_dropped": 1}
+    assert queue.get_stats("wearOS") == {"receive_depth": 2, "receive_dropped": 0}
+    assert [queue.get(timeout=0) for _ in range(3)] == ["unity-1", "wearOS-0", "wearOS-1"]
+
+
+def test_receive_queue_waits_for_data():
+    queue = ReceiveQueue(max_size=10)
+    timer = threading.Timer(0.05, queue.put, args=("unity", b"data"))
+    timer.start()
+
+    assert queue.get(timeout=5) == b"data"
+    timer.join()
@@ -0,0 +1,139 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from Memory.segmented_store import SegmentedStore
+
+_TEST_STORE_NAME = "TOM_TEST_SEGMENTED_STORE"
+
+
+@pytest.fixture
+def store():
+    segmented_store = SegmentedStore(_TEST_STORE_NAME, max_keys=4)
+    yield segmented_store
+    segmented_store.close(unlink=True)
+
+
+def test_get_missing_key(store):
+    with pytest.raises(KeyError):
+        _ = store["missing"]
+
+    assert store.get("missing") is None
+    assert store.get_version("missing") is None
+
+
+def test_set_and_get(store):
+    store["status"] = "running"
+    store["detections"] = [{"label": "cup", "confidence": 0.9}]
+
+    assert store["status"] == "running"
+    assert store["detections"] == [{"label": "cup", "confidence": 0.9}]
+    assert len(store) == 2
+    assert set(store) == {"status", "detections"}
+
+
+def test_set_increments_version(store):
+    store["status"] = "running"
+    store["status"] = "stopped"
+
+    assert store.get_version("status") == 4
+    assert store["status"] == "stopped"
+
+
+def test_large_value_spills_into_larger_segment(store):
+    store["frame"] = np.zeros(10, dtype=np.uint8)
+    store["frame"] = np.ones((480, 640, 3), dtype=np.uint8)
+
+    assert np.array_equal(store["frame"], np.ones((480, 640, 3), dtype=np.uint8))
+
+
+def test_delete(store):
+    store["status"] = "running"
+
+    del store["status"]
+
+    assert "status" not in store
+    assert len(store) == 0
+
+
+def test_store_is_full(store):
+    for i in range(4):
+        store[f"item{i}"] = i
+
+    with pytest.raises(MemoryError):
+        store["item4"] = 4
+
+
+def test_key_too_long(store):
+    with pytest.raises(KeyError):
+        store["x" * 65] = 1
+
+
+def write_items(items):
+    store = SegmentedStore(_TEST_STORE_NAME, max_keys=4)
+    for key, value in items.items():
+        store[key] = value
+    store.close()
+
+
+def test_items_exist_across_processes(store):
+    store["status"] = "running"
+
+    p = multiprocessing.Process(target=write_items, args=({"status": "stopped", "speech": "x" * 100000},))
+    p.start()
+    p.join()
+
+    assert store["status"] == "stopped"
+    assert store["speech"] == "x" * 100000
+
+
+def read_item_twice(write_lock, key, connection):
+    store = SegmentedStore(_TEST_STORE_NAME, max_keys=4, write_lock=write_lock)
+    connection.send(store[key])
+    connection.recv()  # until the key is deleted and set again
+    connection.send(store[key])
+    store.close()
+
+
+def test_deleted_key_is_not_stale_in_other_process(store):
+    # the lock is passed explicitly, as a spawned process does not inherit it
+    context = multiprocessing.get_context("spawn")
+    writer = SegmentedStore(_TEST_STORE_NAME, max_keys=4, write_lock=context.Lock())
+    writer["status"] = "running"
+    connection, child_connection = context.Pipe()
+    p = context.Process(target=read_item_twice, args=(writer.write_lock, "status", child_connection))
+    p.start()
+
+    assert connection.recv() == "running"
+
+    # the new value has the same size, but is in a new segment (generation)
+    del writer["status"]
+    writer["status"] = "stopped"
+    connection.send(True)
+
+    assert connection.recv() == "stopped"
+    p.join()
+    assert store["status"] == "stopped"
+    writer.close()
+
+
+def test_segments_exist_after_external_reader_exits(store):
+    store["status"] = "running"
+    # a process which is not started by this process has its own resource tracker (i.e., the trace dump)
+    reader_code = ("from Memory.segmented_store import SegmentedStore; "
+                   f"print(SegmentedStore('{_TEST_STORE_NAME}', max_keys=4, track=False)['status'])")
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    result = subprocess.run([sys.executable, "-c", reader_code], cwd=project_root, capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=project_root), check=True)
+
+    assert result.stdout.strip() == "running"
+    # neither the index nor the segment was unlinked
+    for name in [_TEST_STORE_NAME, f"{_TEST_STORE_NAME}_0_1"]:
+        shared_memory.SharedMemory(name=name).close()
+    assert store["status"] == "running"
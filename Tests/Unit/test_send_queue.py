@@ -0,0 +1,111 @@
+import asyncio
+
+from Websocket import send_queue
+from Websocket.send_queue import SendQueue
+
+
+class MockWebsocket:
+    def __init__(self) -> None:
+        self.sent = []
+        self.closed = False
+        self.unblocked = asyncio.Event()
+
+    async def send(self, data):
+        await self.unblocked.wait()
+        self.sent.append(data)
+
+    async def close(self, _code=1000, _reason=""):
+        self.closed = True
+
+
+def run(test_func):
+    async def run_test():
+        await test_func(MockWebsocket())
+
+    asyncio.run(run_test())
+
+
+def test_send_in_order():
+    async def test(websocket):
+        queue = SendQueue(websocket, "unity", queue_size=10).start()
+        websocket.unblocked.set()
+
+        for i in range(3):
+            queue.put(i)
+        await asyncio.sleep(0.01)
+
+        assert websocket.sent == [0, 1, 2]
+        assert queue.get_stats()["sent"] == 3
+        queue.close()
+
+    run(test)
+
+
+def test_drop_oldest_if_full():
+    async def test(websocket):
+        queue = SendQueue(websocket, "unity", queue_size=2, overflow=send_queue.SEND_OVERFLOW_DROP_OLDEST).start()
+
+        for i in range(4):
+            queue.put(i)
+        websocket.unblocked.set()
+        await asyncio.sleep(0.01)
+
+        assert websocket.sent == [2, 3]
+        assert queue.get_stats()["dropped"] == 2
+        queue.close()
+
+    run(test)
+
+
+def test_coalesce_by_datatype_if_full():
+    async def test(websocket):
+        queue = SendQueue(websocket, "unity", queue_size=2, overflow=send_queue.SEND_OVERFLOW_COALESCE)
+
+        queue.put("alert", datatype=1)
+        queue.put("live data 1", datatype=2)
+        queue.put("live data 2", datatype=2)
+
+        assert [data for _, data, _ in queue.queue] == ["alert", "live data 2"]
+        assert queue.dropped_count == 1
+
+    run(test)
+
+
+def test_disconnect_if_lagging():
+    async def test(websocket):
+        closed_queues = []
+        queue = SendQueue(websocket, "unity", queue_size=10, overflow=send_queue.SEND_OVERFLOW_DISCONNECT,
+                          max_lag_seconds=0.01, on_close=closed_queues.append).start()
+
+        queue.put(0)
+        queue.put(1)
+        await asyncio.sleep(0.05)
+        queue.put(2)
+        await asyncio.sleep(0.01)
+
+        assert websocket.closed
+        assert closed_queues == [queue]
+        assert queue.get_stats()["depth"] == 0
+
+    run(test)
+
+
+def test_coalesce_latest_value_per_datatype():
+    async def test(websocket):
+        queue = SendQueue(websocket, "unity", queue_size=10).start()
+
+        queue.put("live data 1", datatype=1, coalesce=True)
+        queue.put("alert", datatype=2)
+        for i in range(2, 10):
+            queue.put(f"live data {i}", datatype=1, coalesce=True)
+        websocket.unblocked.set()
+        await asyncio.sleep(0.01)
+
+        queue.put("live data 10", datatype=1, coalesce=True)  # not pending anymore
+        await asyncio.sleep(0.01)
+
+        assert websocket.sent == ["live data 9", "alert", "live data 10"]
+        assert queue.get_stats()["coalesced"] == 8
+        queue.close()
+
+    run(test)
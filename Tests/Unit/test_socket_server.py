@@ -0,0 +1,121 @@
+import asyncio
+import threading
+
+import base_keys
+from Websocket import socket_server
+
+
+def test_receive_data_returns_none_after_timeout():
+    assert socket_server.receive_data(timeout=0.01) is None
+
+
+def test_receive_data_waits_for_data():
+    timer = threading.Timer(0.05, socket_server._rx_queue.put, args=(None, b"data"))
+    timer.start()
+
+    assert socket_server.receive_data(timeout=5) == b"data"
+    timer.join()
+
+
+def test_receive_data_keeps_order():
+    socket_server._rx_queue.put(None, b"first")
+    socket_server._rx_queue.put(None, b"second")
+
+    assert socket_server.receive_data() == b"first"
+    assert socket_server.receive_data() == b"second"
+
+
+class MockWebsocket:
+    def __init__(self, headers=None, path="/", fail=False) -> None:
+        self.request_headers = headers or {}
+        self.path = path
+        self.fail = fail
+        self.sent = []
+
+    async def send(self, data):
+        if self.fail:
+            raise ConnectionError("closed")
+        self.sent.append(data)
+
+
+def run_with_connections(test_func):
+    async def run():
+        unity = MockWebsocket(headers={base_keys.WEBSOCKET_CLIENT_TYPE: base_keys.UNITY_CLIENT})
+        dashboard = MockWebsocket(path=f"/?websocket_client_type={base_keys.DASHBOARD_CLIENT}")
+        unknown = MockWebsocket()
+
+        for websocket in (unity, dashboard, unknown):
+            socket_server._add_connection(websocket, socket_server._get_client_type(websocket))
+
+        try:
+            await test_func(unity, dashboard, unknown)
+        finally:
+            for websocket in (unity, dashboard, unknown):
+                socket_server._remove_connection(websocket, socket_server._get_client_type(websocket))
+
+    asyncio.run(run())
+
+
+def test_get_connection_counts():
+    async def test(unity, _dashboard, _unknown):
+        assert socket_server.get_connection_counts() == {base_keys.UNITY_CLIENT: 1, base_keys.DASHBOARD_CLIENT: 1,
+                                                         None: 1}
+
+        socket_server._remove_connection(unity, base_keys.UNITY_CLIENT)
+
+        assert base_keys.UNITY_CLIENT not in socket_server.get_connection_counts()
+        assert len(socket_server.get_connections()) == 2
+
+    run_with_connections(test)
+
+
+def test_send_data_to_client_type():
+    async def test(unity, dashboard, unknown):
+        await socket_server.send_data_to_websockets(b"data", base_keys.UNITY_CLIENT)
+        await asyncio.sleep(0.01)
+
+        assert unity.sent == [b"data"]
+        assert dashboard.sent == [] and unknown.sent == []
+
+    run_with_connections(test)
+
+
+def test_send_data_to_all_clients():
+    async def test(*connections):
+        await socket_server.send_data_to_websockets(b"data")
+        await asyncio.sleep(0.01)
+
+        assert all(websocket.sent == [b"data"] for websocket in connections)
+
+    run_with_connections(test)
+
+
+def test_send_data_removes_failed_connection():
+    async def test(unity, dashboard, _unknown):
+        unity.fail = True
+
+        await socket_server.send_data_to_websockets(b"data")
+        await asyncio.sleep(0.01)
+
+        assert unity not in socket_server.get_connections()
+        assert base_keys.UNITY_CLIENT not in socket_server.get_connection_counts()
+        assert dashboard.sent == [b"data"]
+
+    run_with_connections(test)
+
+
+def test_get_client_stats():
+    async def test(*_connections):
+        await socket_server.send_data_to_websockets(b"data", base_keys.UNITY_CLIENT)
+        await asyncio.sleep(0.01)
+
+        stats = {client_stats["websocket_client_type"]: client_stats for client_stats in
+                 socket_server.get_client_stats()}
+
+        assert stats[base_keys.UNITY_CLIENT]["sent"] == 1
+        assert stats[base_keys.DASHBOARD_CLIENT]["sent"] == 0
+        assert stats[base_keys.UNITY_CLIENT]["depth"] == 0
+        assert stats[base_keys.UNITY_CLIENT]["received"] == 0
+        assert stats[base_keys.UNITY_CLIENT]["receive_dropped"] == 0
+
+    run_with_connections(test)
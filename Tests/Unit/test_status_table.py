@@ -0,0 +1,56 @@
+import multiprocessing
+
+import pytest
+
+from Memory.status_table import StatusTable
+
+_TEST_STATUS_TABLE_NAME = "TOM_TEST_STATUS_TABLE"
+
+
+@pytest.fixture
+def status_table():
+    table = StatusTable(_TEST_STATUS_TABLE_NAME, max_components=2)
+    yield table
+    table.close(unlink=True)
+
+
+def test_register_returns_same_id(status_table):
+    component_id = status_table.register("service:learning")
+
+    assert status_table.register("service:learning") == component_id
+    assert status_table.get_id("service:learning") == component_id
+    assert status_table.get_id("service:unknown") is None
+
+
+def test_set_and_get_status(status_table):
+    learning_id = status_table.register("service:learning")
+    status_table.register("service:context", status=2)
+
+    status_table.set_status(learning_id, 1)
+
+    assert status_table.get_status(learning_id) == 1
+    assert status_table.get_all_status() == {"service:learning": 1, "service:context": 2}
+
+
+def test_register_if_table_is_full(status_table):
+    status_table.register("service:learning")
+    status_table.register("service:context")
+
+    with pytest.raises(MemoryError):
+        status_table.register("service:running")
+
+
+def set_status(component_name, status):
+    table = StatusTable(_TEST_STATUS_TABLE_NAME, max_components=2)
+    table.set_status(table.register(component_name), status)
+    table.close()
+
+
+def test_status_exists_across_processes(status_table):
+    component_id = status_table.register("service:learning")
+
+    p = multiprocessing.Process(target=set_status, args=("service:learning", 2))
+    p.start()
+    p.join()
+
+    assert status_table.get_status(component_id) == 2
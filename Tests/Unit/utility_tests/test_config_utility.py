@@ -172,3 +172,91 @@ def test_get_channel_pipes():
     }
 
     assert expected_result == config_utility.get_channel_pipes()
+
+
+def test_add_pipe_to_configuration_with_edge_settings():
+    config_utility.configuration = {
+        "channel-pipes": {}
+    }
+
+    test_component = {
+        "next": ["one", {"name": "two", "queue_size": 2, "overflow": "drop-oldest"}]
+    }
+
+    config_utility.add_pipe_to_configuration(test_component, "test_key")
+
+    assert config_utility.configuration["channel-pipes"] == {"test_key": ["one", "two"]}
+    assert config_utility.get_channel_edge("test_key", "two") == {"queue_size": 2, "overflow": "drop-oldest"}
+    assert config_utility.get_channel_edge("test_key", "one") is None
+
+
+def test_add_edge_to_configuration_if_invalid_overflow():
+    config_utility.configuration = {}
+
+    with pytest.raises(Exception):
+        config_utility.add_edge_to_configuration({"name": "two", "overflow": "unknown"}, "test_key")
+
+
+def get_test_configuration(pipes, entrypoints):
+    return {
+        "channels": list(entrypoints.keys()),
+        "channel-entrypoints": entrypoints,
+        "channel-exitpoints": {},
+        "channel-pipes": pipes,
+        "channel-edges": {},
+        "channel-executors": {}
+    }
+
+
+def test_get_config_changes():
+    old_configuration = get_test_configuration(
+        {"input:a": ["service:b"], "service:b": [], "service:c": []},
+        {"input:a": "a.A.start", "service:b": "b.B.run", "service:c": "c.C.run"})
+    new_configuration = get_test_configuration(
+        {"input:a": ["service:b", "service:d"], "service:b": [], "service:d": []},
+        {"input:a": "a.A.start", "service:b": "b.B2.run", "service:d": "d.D.run"})
+
+    config_changes = config_utility.get_config_changes(old_configuration, new_configuration)
+
+    assert config_changes == {
+        "added": ["service:d"],
+        "removed": ["service:c"],
+        "changed": ["service:b"],
+        "rewired": ["input:a"]
+    }
+    assert config_utility.has_config_changes(config_changes) is True
+    assert config_utility.has_config_changes(
+        config_utility.get_config_changes(old_configuration, old_configuration)) is False
+
+
+def test_reload_config_keeps_previous_configuration_if_error(monkeypatch):
+    previous_configuration = get_test_configuration({}, {"input:a": "a.A.start"})
+    config_utility.configuration = previous_configuration
+    monkeypatch.setattr(config_utility, "CONFIG_DIR", "/nonexistent")
+
+    with pytest.raises(Exception):
+        config_utility.reload_config()
+
+    assert config_utility.configuration is previous_configuration
+
+
+def test_reload_config_replaces_configuration_once_parsed(monkeypatch, tmp_path):
+    (tmp_path / "config.yaml").write_text('service:\n  - name: "b"\n    entrypoint: "b.B.run"\n')
+    previous_configuration = get_test_configuration({}, {"input:a": "a.A.start"})
+    config_utility.configuration = previous_configuration
+    monkeypatch.setattr(config_utility, "CONFIG_DIR", str(tmp_path))
+    read_yaml_file = config_utility.file_utility.read_yaml_file
+    visible_configurations = []
+
+    def read_yaml_file_while_reading_config(filepath):
+        # i.e., another thread reading the configuration while it is parsed
+        visible_configurations.append(config_utility.configuration)
+        return read_yaml_file(filepath)
+
+    monkeypatch.setattr(config_utility.file_utility, "read_yaml_file", read_yaml_file_while_reading_config)
+
+    config_utility.reload_config()
+
+    assert visible_configurations == [previous_configuration]
+    assert previous_configuration["channels"] == ["input:a"]
+    assert config_utility.get_channel_entrypoints() == {"service:b": "b.B.run"}
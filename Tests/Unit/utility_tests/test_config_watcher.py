@@ -0,0 +1,72 @@
+from unittest import mock
+
+import pytest
+
+from Utilities import config_utility, config_watcher, endpoint_utility
+
+_CONFIG = """
+input:
+  - name: "camera"
+    entrypoint: "camera_widget.CameraWidget.start"
+    exitpoint: ""
+    next:
+      - "service:{service}"
+service:
+  - name: "{service}"
+    entrypoint: "{service}.Service.run"
+    exitpoint: "{service}.Service.stop"
+"""
+
+
+class MockComponent:
+    def __init__(self) -> None:
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture(autouse=True)
+def config_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_utility, "CONFIG_DIR", str(tmp_path))
+    (tmp_path / "Config.yaml").write_text(_CONFIG.format(service="learning"))
+    config_utility.configuration = {}
+    config_utility.parse_all_config()
+
+    yield tmp_path
+
+    config_utility.configuration = {}
+    endpoint_utility.component_instances.clear()
+
+
+def test_reload_stops_removed_components_only(config_dir):
+    camera, learning = MockComponent(), MockComponent()
+    endpoint_utility.component_instances.update({"input:camera": camera, "service:learning": learning})
+    (config_dir / "Config.yaml").write_text(_CONFIG.format(service="memory"))
+    on_reload = mock.MagicMock()
+
+    config_changes = config_watcher.reload(on_reload)
+
+    assert config_changes["added"] == ["service:memory"]
+    assert config_changes["removed"] == ["service:learning"]
+    assert config_changes["rewired"] == ["input:camera"]
+    assert learning.stopped is True
+    assert endpoint_utility.component_instances == {"input:camera": camera}
+    on_reload.assert_called_once_with(config_changes)
+
+
+def test_reload_keeps_configuration_if_invalid(config_dir):
+    (config_dir / "Config.yaml").write_text("service:\n  - name: \"learning\"\n")
+
+    assert config_watcher.reload() is None
+    assert "service:learning" in config_utility.get_channel_entrypoints()
+
+
+def test_get_config_modified_times(config_dir):
+    assert list(config_watcher.get_config_modified_times().keys()) == [f"{config_dir}/Config.yaml"]
+
+
+def test_start_if_not_enabled(monkeypatch):
+    monkeypatch.setenv(config_watcher.CONFIG_HOT_RELOAD_ENV_KEY, "false")
+
+    assert config_watcher.start() is None
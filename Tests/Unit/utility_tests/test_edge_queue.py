@@ -0,0 +1,73 @@
+import threading
+
+from Utilities.edge_queue import EdgeQueue
+
+
+def test_put_if_drop_oldest():
+    received = []
+    edge_queue = EdgeQueue("test", received.append, queue_size=2, overflow="drop-oldest")
+
+    for i in range(5):
+        edge_queue.put(i)
+
+    assert list(edge_queue.queue) == [3, 4]
+    assert edge_queue.get_stats()["dropped"] == 3
+    assert edge_queue.get_stats()["depth"] == 2
+
+
+def test_put_if_latest_only():
+    edge_queue = EdgeQueue("test", lambda message: None, queue_size=3, overflow="latest-only")
+
+    for i in range(5):
+        edge_queue.put(i)
+
+    assert list(edge_queue.queue) == [3, 4]
+    assert edge_queue.get_stats()["dropped"] == 3
+
+
+def test_messages_are_delivered_by_worker():
+    received = []
+    delivered = threading.Event()
+
+    def entry_func(message):
+        received.append(message)
+        if len(received) == 3:
+            delivered.set()
+
+    edge_queue = EdgeQueue("test", entry_func, queue_size=1).start()
+    for i in range(3):
+        edge_queue(i)  # blocks while the queue is full
+
+    assert delivered.wait(timeout=2)
+    assert received == [0, 1, 2]
+    assert edge_queue.get_stats()["dropped"] == 0
+
+    edge_queue.stop()
+
+
+def test_worker_survives_subscriber_error():
+    delivered = threading.Event()
+
+    def entry_func(message):
+        if message == "error":
+            raise ValueError(message)
+        delivered.set()
+
+    edge_queue = EdgeQueue("test", entry_func, queue_size=2).start()
+    edge_queue("error")
+    edge_queue("ok")
+
+    assert delivered.wait(timeout=2)
+
+    edge_queue.stop()
+
+
+def test_put_after_stop_drops_message():
+    edge_queue = EdgeQueue("test", lambda message: None, queue_size=1).start()
+    edge_queue.stop()
+
+    for i in range(3):
+        edge_queue.put(i)  # does not block (or grow the queue) as the queue is stopped
+
+    assert len(edge_queue.queue) == 0
+    assert edge_queue.get_stats()["dropped"] == 3
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from Utilities import encoded_image_cache, image_utility
+from Utilities.encoded_image_cache import EncodedImageCache
+
+
+@pytest.fixture
+def frame():
+    return np.random.default_rng(0).integers(0, 256, (48, 64, 3), dtype=np.uint8)
+
+
+def get_frame_key(sequence, region=None):
+    return encoded_image_cache.get_frame_key({"sequence": sequence}, region)
+
+
+def test_encodes_frame_once_per_format(frame):
+    cache = EncodedImageCache()
+
+    jpeg_bytes = cache.get_image_bytes(frame, "jpeg", 85, get_frame_key(1))
+    png_bytes = cache.get_image_bytes(frame, "png", frame_key=get_frame_key(1))
+
+    assert cache.get_image_bytes(frame, "jpeg", 85, get_frame_key(1)) is jpeg_bytes
+    # quality does not apply to png
+    assert cache.get_image_bytes(frame, "png", 50, get_frame_key(1)) is png_bytes
+    assert image_utility.get_image_format(jpeg_bytes) == "jpeg"
+    assert cache.get_stats() == {"frames": 1, "hits": 2, "encodes": 2}
+
+
+def test_copies_of_frame_share_encoded_image(frame):
+    cache = EncodedImageCache()
+
+    # i.e., each service reads its own copy of the camera frame
+    png_bytes = cache.get_image_bytes(frame.copy(), "png", frame_key=get_frame_key(1))
+
+    assert cache.get_image_bytes(frame.copy(), "png", frame_key=get_frame_key(1)) is png_bytes
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_encodes_again_for_other_quality(frame):
+    cache = EncodedImageCache()
+
+    low_quality_bytes = cache.get_image_bytes(frame, "jpeg", 20, get_frame_key(1))
+
+    assert cache.get_image_bytes(frame, "jpeg", 95, get_frame_key(1)) != low_quality_bytes
+    assert cache.get_stats()["encodes"] == 2
+
+
+def test_frames_are_cached_separately(frame):
+    cache = EncodedImageCache()
+    other_frame = frame.copy()
+    other_frame[:] = 0
+
+    assert cache.get_image_bytes(frame, "png", frame_key=get_frame_key(1)) != \
+        cache.get_image_bytes(other_frame, "png", frame_key=get_frame_key(2))
+    assert cache.get_stats()["frames"] == 2
+
+
+def test_cropped_frames_are_cached_separately(frame):
+    cache = EncodedImageCache()
+
+    # the same sequence number, cropped to another size or around another location
+    full_bytes = cache.get_image_bytes(frame, "png", frame_key=get_frame_key(1))
+    cropped_bytes = cache.get_image_bytes(frame[:24, :32], "png", frame_key=get_frame_key(1))
+    other_cropped_bytes = cache.get_image_bytes(frame[24:, 32:], "png", frame_key=get_frame_key(1, (0.8, 0.8)))
+
+    assert len({full_bytes, cropped_bytes, other_cropped_bytes}) == 3
+    assert cache.get_stats() == {"frames": 3, "hits": 0, "encodes": 3}
+
+
+def test_frame_without_key_is_not_cached(frame):
+    cache = EncodedImageCache()
+
+    cache.get_image_bytes(frame, "png")
+    cache.get_image_bytes(frame, "png")
+
+    assert encoded_image_cache.get_frame_key(None) is None
+    assert cache.get_stats() == {"frames": 0, "hits": 0, "encodes": 2}
+
+
+def test_evicts_least_recently_used_frame(frame):
+    cache = EncodedImageCache(max_frames=2)
+
+    cache.get_image_bytes(frame, "png", frame_key=get_frame_key(1))
+    cache.get_image_bytes(frame, "png", frame_key=get_frame_key(2))
+    cache.get_image_bytes(frame, "png", frame_key=get_frame_key(1))
+    cache.get_image_bytes(frame, "png", frame_key=get_frame_key(3))  # evicts the frame 2
+    cache.get_image_bytes(frame, "png", frame_key=get_frame_key(1))
+    cache.get_image_bytes(frame, "png", frame_key=get_frame_key(2))
+
+    assert cache.get_stats() == {"frames": 2, "hits": 2, "encodes": 4}
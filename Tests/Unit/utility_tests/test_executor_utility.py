@@ -0,0 +1,121 @@
+import multiprocessing
+import threading
+
+import pytest
+
+from Utilities import config_utility, executor_utility
+
+
+@pytest.fixture(autouse=True)
+def setup():
+    config_utility.configuration = {
+        "channel-executors": {
+            "processing:thread": "thread",
+            "processing:process": "process",
+        }
+    }
+
+    yield
+
+    config_utility.configuration = {}
+    executor_utility._process_queues.clear()
+    executor_utility._process_executors.clear()
+    for thread_executor in executor_utility._thread_executors.values():
+        thread_executor.stop()
+    executor_utility._thread_executors.clear()
+
+
+def test_add_executor_to_configuration():
+    config_utility.add_executor_to_configuration({"executor": "process"}, "service:name")
+    config_utility.add_executor_to_configuration({"executor": "inline"}, "service:inline")
+    config_utility.add_executor_to_configuration({"executor": "process"}, "input:name")
+
+    assert config_utility.get_channel_executor("service:name") == "process"
+    assert config_utility.get_channel_executor("service:inline") == "inline"
+    assert config_utility.get_channel_executor("input:name") == "inline"
+
+
+def test_add_executor_to_configuration_if_invalid_executor():
+    with pytest.raises(Exception):
+        config_utility.add_executor_to_configuration({"executor": "unknown"}, "service:name")
+    with pytest.raises(Exception):
+        config_utility.add_executor_to_configuration({"executor": "thread", "executor_queue_size": 0}, "service:name")
+
+
+def test_add_executor_to_configuration_with_queue_size():
+    config_utility.add_executor_to_configuration({"executor": "thread", "executor_queue_size": 3}, "service:name")
+
+    assert config_utility.get_channel_executor_queue_size("service:name") == 3
+    assert config_utility.get_channel_executor_queue_size("processing:thread") == 10
+
+
+def test_get_executor_func_if_inline():
+    assert executor_utility.get_executor_func("processing:inline", print) is None
+
+
+def test_get_executor_func_if_thread():
+    received = []
+    delivered = threading.Event()
+
+    def entry_func(message):
+        received.append((message, threading.current_thread()))
+        delivered.set()
+
+    executor_func = executor_utility.get_executor_func("processing:thread", entry_func)
+    executor_func("message")
+
+    assert delivered.wait(timeout=2)
+    assert received[0][0] == "message"
+    assert received[0][1] is not threading.current_thread()
+
+    # the same worker is reused by all the publishers
+    assert executor_utility.get_executor_func("processing:thread", entry_func) is executor_func
+
+
+def test_get_executor_func_if_process():
+    # falls back to inline if the process executor was not started
+    assert executor_utility.get_executor_func("processing:process") is None
+    assert executor_utility.is_process_executor("processing:process") is False
+
+    executor_utility._process_queues["processing:process"] = message_queue = FakeQueue()
+
+    executor_utility.get_executor_func("processing:process")("message")
+
+    assert executor_utility.is_process_executor("processing:process") is True
+    assert message_queue.items == ["message"]
+
+
+def test_start_and_stop_process_executors(monkeypatch):
+    monkeypatch.setattr(executor_utility, "_run_process_executor", run_process_executor)
+    config_utility.configuration["channel-executor-queue-sizes"] = {"processing:process": 2}
+
+    executor_utility.start_process_executors()
+
+    message_queue = executor_utility._process_queues["processing:process"]
+    process = executor_utility._process_executors["processing:process"]
+    assert message_queue._maxsize == 2
+    assert not process.daemon
+
+    executor_utility.stop_process_executors()
+
+    # stopped by the message to stop, after starting its own child process
+    assert process.exitcode == 0
+    assert not executor_utility._process_executors
+
+
+def run_process_executor(component, process_transports, _process_locks):
+    # i.e., a component which starts a child process, which is not allowed in a daemon process
+    child = multiprocessing.Process(target=print, args=(component,))
+    child.start()
+    child.join()
+
+    while process_transports[component].get() is not executor_utility._STOP_PROCESS_EXECUTOR:
+        pass
+
+
+class FakeQueue:
+    def __init__(self):
+        self.items = []
+
+    def put(self, item):
+        self.items.append(item)
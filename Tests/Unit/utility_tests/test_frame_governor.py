@@ -0,0 +1,54 @@
+import pytest
+
+from Utilities.frame_governor import FrameGovernor
+
+
+def test_should_send_if_within_latency_target():
+    frame_governor = FrameGovernor("input:camera", latency_target_millis=100)
+
+    frame_governor.update(0, 0.01)
+
+    assert frame_governor.interval == 0
+    assert frame_governor.should_send() is True
+
+
+def test_interval_grows_if_above_latency_target():
+    frame_governor = FrameGovernor("input:camera", latency_target_millis=100)
+
+    for i in range(20):
+        frame_governor.update(i, i + 0.5)
+
+    assert frame_governor.processing_seconds > 0.1
+    assert frame_governor.interval == 1.0  # maximum interval
+
+
+def test_interval_shrinks_back_to_max_rate():
+    frame_governor = FrameGovernor("input:camera", latency_target_millis=100, max_rate=10)
+
+    for i in range(20):
+        frame_governor.update(i, i + 0.5)
+    for i in range(20, 200):
+        frame_governor.update(i, i + 0.001)
+
+    assert frame_governor.interval == 0.1
+
+
+def test_should_send_skips_frames_until_interval():
+    frame_governor = FrameGovernor("input:camera", latency_target_millis=100, max_rate=0.001)
+
+    frame_governor.update(frame_governor.report_start_time, frame_governor.report_start_time)
+
+    assert frame_governor.should_send() is False
+    assert frame_governor.get_stats()["skipped"] == 1
+
+
+def test_achieved_rate_is_reported():
+    reports = []
+    frame_governor = FrameGovernor("input:camera", latency_target_millis=100, on_report=reports.append)
+    start_time = frame_governor.report_start_time
+
+    for i in range(11):
+        frame_governor.update(start_time + i * 0.5, start_time + i * 0.5)
+
+    assert reports[0]["achieved_rate"] == pytest.approx(2.2)  # 11 frames in 5 seconds
+    assert reports[0]["sent"] == 11
@@ -0,0 +1,73 @@
+import pickle
+
+import cv2
+import numpy as np
+
+import base_keys
+from Utilities import frame_pyramid
+from Utilities.frame_pyramid import FramePyramid, FrameVariant
+
+
+def get_frame(width=1280, height=720):
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    frame[:, :, 0] = 255  # blue (bgr)
+    return frame
+
+
+def test_parse_variants():
+    variants = frame_pyramid.parse_variants("yolo:640:bgr, clip:224:rgb:shortest,invalid:1:cmyk,invalid")
+
+    assert variants == {
+        "yolo": FrameVariant("yolo", 640, frame_pyramid.COLOR_BGR, frame_pyramid.FIT_LONGEST),
+        "clip": FrameVariant("clip", 224, frame_pyramid.COLOR_RGB, frame_pyramid.FIT_SHORTEST),
+    }
+
+
+def test_build_variants():
+    variants = FramePyramid({"yolo", "clip", "llm"}).build(get_frame())
+
+    assert set(variants) == {"yolo", "clip", "llm"}
+    assert variants["llm"].shape == (576, 1024, 3)
+    assert variants["yolo"].shape == (360, 640, 3)
+    # shortest side, in rgb
+    assert variants["clip"].shape == (224, 398, 3)
+    assert tuple(variants["clip"][0, 0]) == (0, 0, 255)
+
+
+def test_build_variants_once_when_accessed():
+    variants = FramePyramid({"yolo"}).build(get_frame())
+
+    assert not variants.built_variants
+    assert variants["yolo"] is variants["yolo"]
+
+
+def test_variant_of_small_frame_is_the_frame():
+    frame = get_frame(320, 240)
+
+    assert FramePyramid({"yolo"}).build(frame)["yolo"] is frame
+
+
+def test_unknown_variant_is_ignored():
+    assert not FramePyramid({"unknown"}).build(get_frame())
+
+
+def test_variants_are_picklable():
+    variants = FramePyramid({"yolo", "clip"}).build(get_frame())
+    yolo_frame = variants["yolo"]
+
+    unpickled_variants = pickle.loads(pickle.dumps(variants))
+
+    assert np.array_equal(unpickled_variants["yolo"], yolo_frame)
+    assert unpickled_variants["clip"].shape == (224, 398, 3)
+
+
+def test_get_frame_variant():
+    frame = get_frame()
+    variants = FramePyramid({"yolo"}).build(frame)
+
+    assert frame_pyramid.get_frame_variant({base_keys.CAMERA_FRAME: frame, base_keys.CAMERA_FRAME_VARIANTS: variants},
+                                           "yolo") is variants["yolo"]
+    # not declared by the subscriber
+    clip_frame = frame_pyramid.get_frame_variant({base_keys.CAMERA_FRAME: frame}, "clip")
+    assert np.array_equal(clip_frame, cv2.cvtColor(cv2.resize(frame, (398, 224), interpolation=cv2.INTER_AREA),
+                                                   cv2.COLOR_BGR2RGB))
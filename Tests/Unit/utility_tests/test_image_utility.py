@@ -14,9 +14,20 @@ from Utilities.image_utility import (
     read_image_file_bytes,
     read_image_url_bytes,
     get_png_image_bytes,
+    get_encoded_image_bytes,
+    get_image_format,
+    get_image_mime_type,
+    get_base64_image_mime_type,
+    load_raw_bytes_to_opencv_frame,
     save_image,
     save_image_bytes,
-    get_base64_image
+    get_base64_image,
+    get_resized_size,
+    get_resized_frame,
+    get_average_hash,
+    get_difference_hash,
+    get_hash_distance,
+    SceneChangeDetector
 )
 
 
@@ -64,6 +75,18 @@ def test_get_similarity_images(sample_image_red_100: Image, sample_image_blue_10
     assert similarity == 0
 
 
+def test_get_similarity_images_threshold():
+    pixels = np.zeros((10, 10, 3), dtype=np.uint8)
+    changed_pixels = pixels.copy()
+    changed_pixels[0, :5] = (3, 4, 0)  # distance of 5 for 5 pixels
+
+    image = Image.fromarray(pixels)
+    changed_image = Image.fromarray(changed_pixels)
+
+    assert get_similarity_images(image, changed_image, 4) == 0.95
+    assert get_similarity_images(image, changed_image, 5) == 1
+
+
 def test_get_pixel_diff():
     pixel1: tuple = (255, 0, 0)
     pixel2: tuple = (0, 0, 255)
@@ -114,6 +137,27 @@ def test_get_png_image_bytes(sample_opencv_frame: np.ndarray):
     assert result.startswith(b'\x89PNG')
 
 
+@pytest.mark.parametrize("image_format, mime_type", [
+    ("png", "image/png"),
+    ("jpeg", "image/jpeg"),
+    ("webp", "image/webp"),
+])
+def test_get_encoded_image_bytes(sample_opencv_frame: np.ndarray, image_format: str, mime_type: str):
+    result: bytes = get_encoded_image_bytes(sample_opencv_frame, image_format, quality=80)
+
+    assert get_image_format(result) == image_format
+    assert get_image_mime_type(result) == mime_type
+    assert get_base64_image_mime_type(get_base64_image(result)) == mime_type
+    assert load_raw_bytes_to_opencv_frame(result).shape == sample_opencv_frame.shape
+
+
+def test_get_encoded_image_bytes_quality():
+    frame = np.random.default_rng(0).integers(0, 256, (64, 64, 3), dtype=np.uint8)
+
+    assert len(get_encoded_image_bytes(frame, "jpeg", quality=20)) < \
+        len(get_encoded_image_bytes(frame, "jpeg", quality=95))
+
+
 # Create a mock image file object to write to
 @patch('cv2.imwrite')
 def test_save_image(mock_imwrite: cv2.imwrite, sample_opencv_frame: np.ndarray):
@@ -154,3 +198,45 @@ def test_get_base64_image(sample_image_red_100: Image):
     assert img.size == (100, 100)
     assert img.mode == 'RGB'
     assert img.getpixel((0, 0)) == (255, 0, 0)  # Red color
+
+
+def test_get_resized_size():
+    assert get_resized_size(1280, 720, 640) == (640, 360)
+    assert get_resized_size(1280, 720, 224, fit_shortest=True) == (398, 224)
+    # not upscaled
+    assert get_resized_size(320, 240, 640) == (320, 240)
+
+
+def test_get_resized_frame(sample_opencv_frame: np.ndarray):
+    resized_frame = get_resized_frame(sample_opencv_frame, 50)
+
+    assert max(resized_frame.shape[:2]) == 50
+    assert get_resized_frame(sample_opencv_frame, 10000) is sample_opencv_frame
+
+
+@pytest.fixture
+def sample_gradient_frame() -> np.ndarray:
+    gradient = np.tile(np.linspace(0, 255, 160, dtype=np.uint8), (120, 1))
+    return cv2.cvtColor(gradient, cv2.COLOR_GRAY2BGR)
+
+
+def test_perceptual_hashes_of_near_identical_frames(sample_gradient_frame: np.ndarray):
+    brighter_frame = cv2.add(sample_gradient_frame, 10)
+    flipped_frame = cv2.flip(sample_gradient_frame, 1)
+
+    for hash_func in (get_average_hash, get_difference_hash):
+        frame_hash = hash_func(sample_gradient_frame)
+        assert frame_hash.bit_length() <= 64
+        assert get_hash_distance(frame_hash, hash_func(brighter_frame)) <= 4
+        assert get_hash_distance(frame_hash, hash_func(flipped_frame)) > 20
+
+
+def test_scene_change_detector(sample_gradient_frame: np.ndarray):
+    detector = SceneChangeDetector(max_distance=10)
+
+    assert detector.is_new_scene(sample_gradient_frame)
+    assert not detector.is_new_scene(cv2.add(sample_gradient_frame, 10))
+    assert detector.is_new_scene(cv2.flip(sample_gradient_frame, 1))
+
+    detector.reset()
+    assert detector.is_new_scene(cv2.flip(sample_gradient_frame, 1))
@@ -0,0 +1,166 @@
+from unittest import mock
+
+import pytest
+
+import base_keys
+from Utilities import config_utility, routing_utility
+
+
+class MockComponent:
+    SUPPORTED_DATATYPES = {"SERVICE_SWITCH_DATA"}
+
+    def __init__(self) -> None:
+        self.received = []
+
+    def entry_func(self, message):
+        self.received.append(message)
+
+    def get_supported_datatypes(self):
+        return self.SUPPORTED_DATATYPES
+
+
+component_instance = MockComponent()
+
+
+@pytest.fixture(autouse=True)
+def setup():
+    config_utility.configuration = {
+        "channels": [base_keys.WEBSOCKET_WIDGET, "input:name", "service:name"],
+        "channel-entrypoints": {
+            base_keys.WEBSOCKET_WIDGET: "module.class.start",
+            "input:name": "module.class.start",
+            "service:name": "module.class.entry_func"
+        },
+        "channel-pipes": {
+            base_keys.WEBSOCKET_WIDGET: ["service:name"],
+            "input:name": ["service:name"],
+            "service:name": []
+        }
+    }
+    routing_utility.reset_routing_table()
+
+    with mock.patch("Utilities.endpoint_utility.get_component_instance",
+                    mock.MagicMock(return_value=component_instance)):
+        yield
+
+    config_utility.configuration = {}
+
+
+def test_get_routes_binds_entry_func():
+    routes = routing_utility.get_routes("input:name")
+
+    assert len(routes) == 1
+    subscriber, entry_func, supported_datatypes = routes[0]
+    assert subscriber == "service:name"
+    assert entry_func == component_instance.entry_func
+    assert supported_datatypes is None
+
+
+def test_get_routes_of_websocket_widget_uses_datatype_keys():
+    routes = routing_utility.get_routes(base_keys.WEBSOCKET_WIDGET)
+
+    _, _, supported_datatypes = routes[0]
+    assert supported_datatypes == frozenset({1})  # SERVICE_SWITCH_DATA
+
+
+def test_get_datatype_routes_of_websocket_widget():
+    routes = routing_utility.get_routes(base_keys.WEBSOCKET_WIDGET)
+
+    assert routing_utility.get_datatype_routes(base_keys.WEBSOCKET_WIDGET, 1) == routes  # SERVICE_SWITCH_DATA
+    assert routing_utility.get_datatype_routes(base_keys.WEBSOCKET_WIDGET, 20) == ()  # SPEECH_INPUT_DATA
+    assert routing_utility.get_datatype_routes(base_keys.WEBSOCKET_WIDGET, None) == ()
+
+
+def test_get_datatype_routes_of_other_publishers():
+    routes = routing_utility.get_routes("input:name")
+
+    assert routing_utility.get_datatype_routes("input:name", 20) == routes
+    assert routing_utility.get_datatype_routes("input:name", None) == routes
+
+
+def test_get_datatype_routes_is_rebuilt_if_config_changes():
+    routing_utility.get_datatype_routes(base_keys.WEBSOCKET_WIDGET, 1)
+
+    config_utility.configuration["channel-pipes"][base_keys.WEBSOCKET_WIDGET] = []
+
+    with mock.patch("Utilities.config_utility.get_config_version", mock.MagicMock(return_value=-1)):
+        assert routing_utility.get_datatype_routes(base_keys.WEBSOCKET_WIDGET, 1) == ()
+
+
+def test_get_routes_if_no_subscribers():
+    assert routing_utility.get_routes("service:name") == ()
+    assert routing_utility.get_routes("service:unknown") == ()
+
+
+def test_get_routes_is_compiled_once():
+    with mock.patch("Utilities.routing_utility.compile_routes", mock.MagicMock(return_value=())) as compile_routes:
+        routing_utility.get_routes("input:name")
+        routing_utility.get_routes("input:name")
+
+    compile_routes.assert_called_once_with("input:name")
+
+
+def test_get_routes_is_rebuilt_if_config_changes():
+    routing_utility.get_routes("input:name")
+    config_utility.configuration["channel-pipes"]["input:name"] = []
+
+    with mock.patch("Utilities.config_utility.get_config_version", mock.MagicMock(return_value=-1)):
+        with mock.patch("Utilities.routing_utility.compile_routes", mock.MagicMock(return_value=())) as compile_routes:
+            routing_utility.get_routes("input:name")
+
+    compile_routes.assert_called_once_with("input:name")
+
+
+def test_get_routes_is_kept_if_subscribers_did_not_change():
+    routing_utility.get_routes("input:name")
+    routing_utility.get_routes(base_keys.WEBSOCKET_WIDGET)
+    config_utility.configuration["channel-entrypoints"]["input:name"] = "module.other_class.start"
+    config_utility.configuration["channel-pipes"][base_keys.WEBSOCKET_WIDGET] = []
+
+    with mock.patch("Utilities.config_utility.get_config_version", mock.MagicMock(return_value=-1)):
+        with mock.patch("Utilities.routing_utility.compile_routes", mock.MagicMock(return_value=())) as compile_routes:
+            routing_utility.get_routes("input:name")
+            routing_utility.get_routes(base_keys.WEBSOCKET_WIDGET)
+
+    compile_routes.assert_called_once_with(base_keys.WEBSOCKET_WIDGET)
+
+
+class MockSamplingComponent(MockComponent):
+    MAX_FRAME_RATE = 1
+
+
+def test_get_routes_of_camera_widget_limits_frame_rate():
+    config_utility.configuration["channel-pipes"][base_keys.CAMERA_WIDGET] = ["service:name"]
+    sampling_instance = MockSamplingComponent()
+
+    with mock.patch("Utilities.endpoint_utility.get_component_instance",
+                    mock.MagicMock(return_value=sampling_instance)):
+        _, entry_func, _ = routing_utility.get_routes(base_keys.CAMERA_WIDGET)[0]
+
+    entry_func({"frame": 1})
+    entry_func({"frame": 2})  # dropped, less than 1 second later
+
+    assert sampling_instance.received == [{"frame": 1}]
+
+
+def test_get_max_frame_rate():
+    config_utility.configuration["channel-pipes"][base_keys.CAMERA_WIDGET] = ["service:name"]
+
+    with mock.patch("Utilities.endpoint_utility.get_component_class",
+                    mock.MagicMock(return_value=MockSamplingComponent)):
+        assert routing_utility.get_max_frame_rate(base_keys.CAMERA_WIDGET) == 1
+
+    with mock.patch("Utilities.endpoint_utility.get_component_class", mock.MagicMock(return_value=MockComponent)):
+        assert routing_utility.get_max_frame_rate(base_keys.CAMERA_WIDGET) is None
+
+
+class MockClipComponent(MockComponent):
+    FRAME_VARIANTS = {"clip"}
+
+
+def test_get_frame_variants():
+    config_utility.configuration["channel-pipes"][base_keys.CAMERA_WIDGET] = ["service:name", "service:other"]
+
+    with mock.patch("Utilities.endpoint_utility.get_component_class",
+                    mock.MagicMock(side_effect=[MockClipComponent, MockComponent])):
+        assert routing_utility.get_frame_variants(base_keys.CAMERA_WIDGET) == {"clip"}
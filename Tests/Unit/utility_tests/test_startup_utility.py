@@ -0,0 +1,83 @@
+import json
+from unittest import mock
+
+import pytest
+
+from Utilities import config_utility, startup_utility
+
+
+class MockComponent:
+    def __init__(self, name) -> None:
+        self.name = name
+
+
+@pytest.fixture(autouse=True)
+def setup():
+    config_utility.configuration = {
+        "channel-pipes": {
+            "input:camera": ["processing:yolov8", "service:learning"],
+            "processing:yolov8": ["service:learning", "output:websocket"],
+            "processing:whisper": ["service:memory"],
+            "service:learning": ["output:websocket", "processing:whisper"],
+            "output:websocket": []
+        },
+        "channel-executors": {
+            "processing:whisper": "process"
+        }
+    }
+
+    yield
+
+    config_utility.configuration = {}
+
+
+def test_get_process_components():
+    assert startup_utility.get_process_components("input:camera") == ["processing:yolov8", "service:learning",
+                                                                      "output:websocket"]
+    assert startup_utility.get_process_components("input:unknown") == []
+
+
+def test_warm_up_components():
+    with mock.patch("Utilities.endpoint_utility.get_component_class", mock.MagicMock(return_value=MockComponent)):
+        with mock.patch("Utilities.endpoint_utility.get_component_instance",
+                        mock.MagicMock(side_effect=[MockComponent("a"), Exception("No model")])):
+            report = startup_utility.warm_up_components(["processing:yolov8", "service:learning"], max_workers=1)
+
+    assert [component_report["component"] for component_report in report] == ["processing:yolov8",
+                                                                               "service:learning"]
+    assert report[0]["error"] is None
+    assert report[1]["error"] == "No model"
+
+
+def test_warm_up_process_writes_report(tmp_path, monkeypatch):
+    report_file = tmp_path / "startup_report.jsonl"
+    monkeypatch.setenv(startup_utility.STARTUP_WARM_UP_ENV_KEY, "true")
+    monkeypatch.setenv(startup_utility.STARTUP_REPORT_FILE_ENV_KEY, str(report_file))
+
+    with mock.patch("Utilities.endpoint_utility.get_component_class", mock.MagicMock(return_value=MockComponent)):
+        with mock.patch("Utilities.endpoint_utility.get_component_instance", mock.MagicMock()) as get_instance:
+            startup_utility.warm_up_process("input:camera")
+
+    assert get_instance.call_count == 3
+    lines = [json.loads(line) for line in report_file.read_text().splitlines()]
+    assert [line["component"] for line in lines] == ["processing:yolov8", "service:learning", "output:websocket"]
+    assert lines[0]["publisher"] == "input:camera"
+
+
+def test_warm_up_process_without_report_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(startup_utility.STARTUP_WARM_UP_ENV_KEY, "true")
+    monkeypatch.delenv(startup_utility.STARTUP_REPORT_FILE_ENV_KEY, raising=False)
+
+    with mock.patch("Utilities.endpoint_utility.get_component_class", mock.MagicMock(return_value=MockComponent)):
+        with mock.patch("Utilities.endpoint_utility.get_component_instance", mock.MagicMock()):
+            report = startup_utility.warm_up_process("input:camera")
+
+    assert len(report) == 3
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_warm_up_process_if_not_enabled(monkeypatch):
+    monkeypatch.setenv(startup_utility.STARTUP_WARM_UP_ENV_KEY, "false")
+
+    assert startup_utility.warm_up_process("input:camera") == []
@@ -0,0 +1,101 @@
+import pytest
+
+import base_keys
+from Memory import Memory
+from Utilities import config_utility, trace_utility
+
+
+class MockComponent:
+    def __init__(self) -> None:
+        self.received = []
+
+    def entry_func(self, message):
+        self.received.append(message)
+
+
+@pytest.fixture(autouse=True)
+def setup(monkeypatch):
+    config_utility.configuration = {
+        "channel-pipes": {
+            "input:name": ["processing:name"],
+            "processing:name": ["output:name"],
+            "output:name": []
+        }
+    }
+    monkeypatch.setattr(trace_utility, "_enabled", True)
+    trace_utility._latency_windows.clear()
+    trace_utility._traced_entry_funcs.clear()
+
+
+def test_add_hop_starts_and_continues_trace():
+    message = {}
+    trace_utility.add_hop(message, "input:name")
+    trace_id, hops = message[base_keys.TRACE_KEY]
+
+    trace_utility.add_hop(message, "processing:name")
+    continued_trace_id, continued_hops = message[base_keys.TRACE_KEY]
+
+    assert continued_trace_id == trace_id
+    assert [hop[0] for hop in continued_hops] == ["input:name", "processing:name"]
+    assert continued_hops[1][1] >= hops[0][1]
+
+
+def test_trace_entry_func_is_not_wrapped_if_disabled(monkeypatch):
+    monkeypatch.setattr(trace_utility, "_enabled", False)
+    component = MockComponent()
+
+    assert trace_utility.trace_entry_func("processing:name", component.entry_func) == component.entry_func
+
+
+def test_trace_entry_func_records_latencies():
+    component = MockComponent()
+    traced_entry_func = trace_utility.trace_entry_func("output:name", component.entry_func)
+    message = {}
+    trace_utility.add_hop(message, "input:name")
+    trace_utility.add_hop(message, "processing:name")
+
+    traced_entry_func(message)
+
+    assert component.received == [message]
+    assert trace_utility.trace_entry_func("output:name", component.entry_func) == traced_entry_func
+    assert set(trace_utility.get_latency_stats()) == {"processing:name->output:name", "output:name",
+                                                      "input:name=>output:name"}
+
+
+def test_message_built_in_entry_func_continues_trace():
+    sent_messages = []
+
+    def entry_func(_message):
+        new_message = {}
+        trace_utility.add_hop(new_message, "processing:name")
+        sent_messages.append(new_message)
+
+    message = {}
+    trace_utility.add_hop(message, "input:name")
+    trace_utility.trace_entry_func("processing:name", entry_func)(message)
+
+    assert sent_messages[0][base_keys.TRACE_KEY][0] == message[base_keys.TRACE_KEY][0]
+    assert "input:name=>processing:name" not in trace_utility.get_latency_stats()  # not a sink
+
+
+def test_get_latency_stats():
+    for latency_ms in range(1, 101):
+        trace_utility.record_latency("input:name->processing:name", latency_ms * 1000 * 1000)
+
+    stats = trace_utility.get_latency_stats()["input:name->processing:name"]
+
+    assert stats["count"] == 100
+    assert stats["p50"] == pytest.approx(50.5)
+    assert stats["p99"] == pytest.approx(99.01)
+
+
+def test_get_published_latency_stats():
+    Memory.close()
+    Memory.init()
+    trace_utility.record_latency("input:name->processing:name", 2 * 1000 * 1000)
+
+    trace_utility.publish_latencies()
+
+    assert trace_utility.get_published_latency_stats()["input:name->processing:name"]["p50"] == pytest.approx(2)
+    assert "input:name->processing:name" in trace_utility.format_latency_stats(trace_utility.get_latency_stats())
+    Memory.close()
@@ -0,0 +1,132 @@
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from Utilities.video_stream import VideoStream, VideoStreamStoppedException
+
+FRAME_COUNT = 10
+FRAME_WIDTH = 64
+FRAME_HEIGHT = 48
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = str(tmp_path / "video.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (FRAME_WIDTH, FRAME_HEIGHT))
+    for i in range(FRAME_COUNT):
+        writer.write(np.full((FRAME_HEIGHT, FRAME_WIDTH, 3), i * 20, dtype=np.uint8))
+    writer.release()
+
+    return path
+
+
+def test_keeps_only_latest_frame(video_path):
+    stream = VideoStream(video_path)
+    stream.update()  # until the end of the video
+
+    frame, sequence, timestamp = stream.read_frame(timeout=0)
+
+    assert sequence == FRAME_COUNT
+    assert timestamp is not None
+    assert abs(frame.mean() - (FRAME_COUNT - 1) * 20) < 2
+    assert stream.get_stats()["dropped"] == FRAME_COUNT - 1
+
+
+def test_read_if_no_new_frame(video_path):
+    stream = VideoStream(video_path)
+
+    assert stream.read(timeout=0.01) is None
+
+
+def test_read_if_stopped(video_path):
+    stream = VideoStream(video_path)
+    stream.update()  # until the end of the video, which stops the stream
+    stream.read(timeout=0)
+
+    # does not wait (for the timeout) or return None, as no frame will come
+    with pytest.raises(VideoStreamStoppedException):
+        stream.read(timeout=5)
+
+
+def test_decodes_into_preallocated_buffers(video_path):
+    stream = VideoStream(video_path, buffer_count=3)
+    buffers = list(stream.free_buffers)
+    stream.update()
+
+    frame = stream.read()
+
+    # the buffers of the dropped frames went back to the pool, and the read frame is owned by the consumer
+    assert any(frame is buffer for buffer in buffers)
+    assert not any(frame is buffer for buffer in stream.free_buffers)
+    assert len(stream.free_buffers) == 2
+
+
+def test_released_frame_is_reused(video_path):
+    stream = VideoStream(video_path, buffer_count=3)
+    stream.update()
+    frame = stream.read()
+
+    stream.release(frame)
+    stream.release(frame)  # released once only
+
+    assert sum(frame is buffer for buffer in stream.free_buffers) == 1
+    assert len(stream.free_buffers) == 3
+
+
+class StepCapture:
+    """
+    Decodes a frame only once the previous one was handled by the test, so that every frame is read
+    """
+
+    def __init__(self, capture):
+        self.capture = capture
+        self.decode_allowed = threading.Semaphore(1)
+
+    def read(self, image=None):
+        self.decode_allowed.acquire()
+        return self.capture.read(image=image)
+
+
+def test_pool_does_not_drain_if_frames_are_released(video_path):
+    stream = VideoStream(video_path, buffer_count=2)
+    buffers = list(stream.free_buffers)
+    stream.stream = StepCapture(stream.stream)
+    stream.start()
+
+    for _ in range(FRAME_COUNT):
+        frame = stream.read(timeout=5)
+        # i.e., once the frame was copied to the frame store by the camera widget
+        stream.release(frame)
+        stream.stream.decode_allowed.release()
+
+        assert any(frame is buffer for buffer in buffers)
+
+    with pytest.raises(VideoStreamStoppedException):
+        stream.read(timeout=5)
+    assert FRAME_COUNT > stream.buffer_count
+    assert stream.get_stats()["dropped"] == 0
+    assert len(stream.free_buffers) == 2
+
+
+def test_does_not_overwrite_read_frame(video_path):
+    stream = VideoStream(video_path, buffer_count=1).start()
+    frame = stream.read(timeout=5)
+    read_frame = frame.copy()
+
+    # the other frames are decoded while the frame is used
+    with pytest.raises(VideoStreamStoppedException):
+        while True:
+            stream.read(timeout=5)
+
+    assert np.array_equal(frame, read_frame)
+
+
+def test_reads_frames_from_thread(video_path):
+    stream = VideoStream(video_path).start()
+
+    frame, sequence, _ = stream.read_frame(timeout=5)
+
+    assert frame.shape == (FRAME_HEIGHT, FRAME_WIDTH, 3)
+    assert sequence >= 1
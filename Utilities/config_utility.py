@@ -1,35 +1,80 @@
+import threading
 from os import listdir, getcwd
-from Utilities import file_utility, logging_utility
+from Utilities import environment_utility, file_utility, logging_utility
 
 configuration = {}
+# incremented every time the configuration is (re)parsed, so that derived data (e.g., routing table) can be rebuilt
+_configuration_version = 0
+# held while the configuration is reloaded, and while derived data (e.g., routes) is built from it
+config_lock = threading.RLock()
 
 CFG_TYPES = ["input", "processing", "service", "output"]
-CONFIG_DIR = getcwd() + "/Config"
+# can be set in the environment of the process (not in the .env file), i.e., to run a benchmark configuration
+CONFIG_DIR = environment_utility.get_env_variable_or_default("CONFIG_DIR", getcwd() + "/Config")
 
 CONFIGURATION_CHANNELS_KEY = "channels"
 CONFIGURATION_CHANNEL_PIPES_KEY = "channel-pipes"
 CONFIGURATION_CHANNELS_ENTRYPOINTS_KEY = "channel-entrypoints"
 CONFIGURATION_CHANNELS_EXITPOINTS_KEY = "channel-exitpoints"
+CONFIGURATION_CHANNEL_EDGES_KEY = "channel-edges"
+CONFIGURATION_CHANNEL_EXECUTORS_KEY = "channel-executors"
+CONFIGURATION_CHANNEL_EXECUTOR_QUEUE_SIZES_KEY = "channel-executor-queue-sizes"
 
 BASE_CONFIGURATION_ENTRYPOINT_KEY = "entrypoint"
 BASE_CONFIGURATION_EXITPOINT_KEY = "exitpoint"
 BASE_CONFIGURATION_COMPONENT_NAME_KEY = "name"
 BASE_CONFIGURATION_COMPONENT_SUBSCRIBER_KEY = "next"
+BASE_CONFIGURATION_EXECUTOR_KEY = "executor"
+BASE_CONFIGURATION_EXECUTOR_QUEUE_SIZE_KEY = "executor_queue_size"
+
+# where the entry function of a (non-input) component runs, see executor_utility
+EXECUTOR_INLINE = "inline"
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+EXECUTORS = [EXECUTOR_INLINE, EXECUTOR_THREAD, EXECUTOR_PROCESS]
+_DEFAULT_EXECUTOR_QUEUE_SIZE = 10
+
+# optional delivery settings of a subscriber, i.e., `next: [{name: "processing:yolov8", queue_size: 1}]`
+EDGE_CONFIGURATION_NAME_KEY = "name"
+EDGE_CONFIGURATION_QUEUE_SIZE_KEY = "queue_size"
+EDGE_CONFIGURATION_OVERFLOW_KEY = "overflow"
+EDGE_OVERFLOW_BLOCK = "block"
+EDGE_OVERFLOW_DROP_OLDEST = "drop-oldest"
+EDGE_OVERFLOW_LATEST_ONLY = "latest-only"
+EDGE_OVERFLOW_POLICIES = [EDGE_OVERFLOW_BLOCK, EDGE_OVERFLOW_DROP_OLDEST, EDGE_OVERFLOW_LATEST_ONLY]
+_DEFAULT_EDGE_QUEUE_SIZE = 1
+
+# changes between two configurations, see get_config_changes
+CONFIG_CHANGES_ADDED_KEY = "added"
+CONFIG_CHANGES_REMOVED_KEY = "removed"
+CONFIG_CHANGES_CHANGED_KEY = "changed"
+CONFIG_CHANGES_REWIRED_KEY = "rewired"
 
 _logger = logging_utility.setup_logger(__name__)
 
 
 def parse_all_config():
+    """
+    Parse all config files into a new configuration, which then replaces the current one in a single assignment,
+    so that the readers (which do not hold config_lock) never see an empty or partially parsed configuration
+    """
+    global configuration, _configuration_version
+
     config_files = [f for f in listdir(
         CONFIG_DIR) if file_utility.is_yaml_file(f)]
 
     if len(config_files) <= 0:
         raise Exception("No Configuration File detected in ./Config")
 
-    configuration[CONFIGURATION_CHANNELS_KEY] = []
-    configuration[CONFIGURATION_CHANNEL_PIPES_KEY] = {}
-    configuration[CONFIGURATION_CHANNELS_ENTRYPOINTS_KEY] = {}
-    configuration[CONFIGURATION_CHANNELS_EXITPOINTS_KEY] = {}
+    new_configuration = {
+        CONFIGURATION_CHANNELS_KEY: [],
+        CONFIGURATION_CHANNEL_PIPES_KEY: {},
+        CONFIGURATION_CHANNELS_ENTRYPOINTS_KEY: {},
+        CONFIGURATION_CHANNELS_EXITPOINTS_KEY: {},
+        CONFIGURATION_CHANNEL_EDGES_KEY: {},
+        CONFIGURATION_CHANNEL_EXECUTORS_KEY: {},
+        CONFIGURATION_CHANNEL_EXECUTOR_QUEUE_SIZES_KEY: {},
+    }
 
     for filename in config_files:
         filepath = f"{CONFIG_DIR}/{filename}"
@@ -37,72 +82,223 @@ def parse_all_config():
 
         for cfg_type in CFG_TYPES:
             if cfg_type in cfg:
-                parse_config(cfg[cfg_type], cfg_type, filename)
+                parse_config(cfg[cfg_type], cfg_type, filename, new_configuration)
+
+    with config_lock:
+        configuration = new_configuration
+        _configuration_version += 1
+
+
+def reload_config():
+    """
+    Parse all config files again (the previous configuration is kept if they cannot be parsed)
+
+    :return: (previous configuration, changes), see get_config_changes
+    """
+    with config_lock:
+        previous_configuration = configuration
+        parse_all_config()
+
+        return previous_configuration, get_config_changes(previous_configuration, configuration)
+
+
+def get_config_changes(old_configuration, new_configuration):
+    """
+    :return: the map with the components which are
+        - added/removed: only in the new/old configuration
+        - changed: in both, but with a different entrypoint, exitpoint or executor (or its queue size)
+        - rewired: in both, but with different subscribers (or delivery settings of the subscribers)
+    """
+    old_channels = old_configuration.get(CONFIGURATION_CHANNELS_KEY, [])
+    new_channels = new_configuration.get(CONFIGURATION_CHANNELS_KEY, [])
+
+    def get_component_settings(cfg, component):
+        return [cfg.get(key, {}).get(component) for key in [CONFIGURATION_CHANNELS_ENTRYPOINTS_KEY,
+                                                            CONFIGURATION_CHANNELS_EXITPOINTS_KEY,
+                                                            CONFIGURATION_CHANNEL_EXECUTORS_KEY,
+                                                            CONFIGURATION_CHANNEL_EXECUTOR_QUEUE_SIZES_KEY]]
+
+    def get_subscriber_settings(cfg, component):
+        return [cfg.get(key, {}).get(component) for key in [CONFIGURATION_CHANNEL_PIPES_KEY,
+                                                            CONFIGURATION_CHANNEL_EDGES_KEY]]
+
+    common_channels = [c for c in new_channels if c in old_channels]
+
+    return {
+        CONFIG_CHANGES_ADDED_KEY: [c for c in new_channels if c not in old_channels],
+        CONFIG_CHANGES_REMOVED_KEY: [c for c in old_channels if c not in new_channels],
+        CONFIG_CHANGES_CHANGED_KEY: [c for c in common_channels if get_component_settings(old_configuration, c) !=
+                                     get_component_settings(new_configuration, c)],
+        CONFIG_CHANGES_REWIRED_KEY: [c for c in common_channels if get_subscriber_settings(old_configuration, c) !=
+                                     get_subscriber_settings(new_configuration, c)],
+    }
+
 
+def has_config_changes(config_changes):
+    return any(len(components) > 0 for components in config_changes.values())
 
-def parse_config(cfg, cfg_type, filename):
+
+def get_config_files():
+    """
+    :return: the paths of the config files
+    """
+    return [f"{CONFIG_DIR}/{f}" for f in listdir(CONFIG_DIR) if file_utility.is_yaml_file(f)]
+
+
+def parse_config(cfg, cfg_type, filename, target_configuration=None):
+    """
+    :param target_configuration: the configuration being parsed, or None for the current configuration
+    """
     try:
         for component in cfg:
             cfg_key = f"{cfg_type}:{component[BASE_CONFIGURATION_COMPONENT_NAME_KEY]}"
 
-            add_channel_to_configuration(cfg_key)
-            add_entrypoint_to_configuration(component, cfg_key)
-            add_exitpoint_to_configuration(component, cfg_key)
-            add_pipe_to_configuration(component, cfg_key)
+            add_channel_to_configuration(cfg_key, target_configuration)
+            add_entrypoint_to_configuration(component, cfg_key, target_configuration)
+            add_exitpoint_to_configuration(component, cfg_key, target_configuration)
+            add_pipe_to_configuration(component, cfg_key, target_configuration)
+            add_executor_to_configuration(component, cfg_key, target_configuration)
     except Exception as exc:
         raise Exception(f"Error parsing Configuration File: {filename}") from exc
 
 
-def add_channel_to_configuration(channel_name):
-    if channel_name not in configuration[CONFIGURATION_CHANNELS_KEY]:
-        configuration[CONFIGURATION_CHANNELS_KEY].append(channel_name)
+def add_channel_to_configuration(channel_name, target_configuration=None):
+    if target_configuration is None:
+        target_configuration = configuration
+
+    if channel_name not in target_configuration[CONFIGURATION_CHANNELS_KEY]:
+        target_configuration[CONFIGURATION_CHANNELS_KEY].append(channel_name)
 
 
-def add_entrypoint_to_configuration(component, cfg_key):
+def add_entrypoint_to_configuration(component, cfg_key, target_configuration=None):
+    if target_configuration is None:
+        target_configuration = configuration
+
     if BASE_CONFIGURATION_ENTRYPOINT_KEY not in component:
         error_msg = (f"{BASE_CONFIGURATION_ENTRYPOINT_KEY} not in {component}, "
                      f"unable to save {BASE_CONFIGURATION_ENTRYPOINT_KEY}")
         _logger.error(error_msg)
         raise Exception(error_msg)
 
-    if cfg_key not in configuration[CONFIGURATION_CHANNELS_ENTRYPOINTS_KEY]:
-        configuration[CONFIGURATION_CHANNELS_ENTRYPOINTS_KEY][cfg_key] = component[BASE_CONFIGURATION_ENTRYPOINT_KEY]
+    points = target_configuration[CONFIGURATION_CHANNELS_ENTRYPOINTS_KEY]
+    if cfg_key not in points:
+        points[cfg_key] = component[BASE_CONFIGURATION_ENTRYPOINT_KEY]
+
 
+def add_exitpoint_to_configuration(component, cfg_key, target_configuration=None):
+    if target_configuration is None:
+        target_configuration = configuration
 
-def add_exitpoint_to_configuration(component, cfg_key):
     if BASE_CONFIGURATION_EXITPOINT_KEY not in component:
         _logger.warning("{cfg_key} not in {component}, unable to save {cfg_key}",
                         cfg_key=BASE_CONFIGURATION_EXITPOINT_KEY, component=component)
         return
 
-    if cfg_key not in configuration[CONFIGURATION_CHANNELS_EXITPOINTS_KEY]:
-        configuration[CONFIGURATION_CHANNELS_EXITPOINTS_KEY][cfg_key] = component[BASE_CONFIGURATION_EXITPOINT_KEY]
+    points = target_configuration[CONFIGURATION_CHANNELS_EXITPOINTS_KEY]
+    if cfg_key not in points:
+        points[cfg_key] = component[BASE_CONFIGURATION_EXITPOINT_KEY]
+
+
+def add_executor_to_configuration(component, cfg_key, target_configuration=None):
+    """
+    Save the executor of a component (if it is not run inline) and the size of its queue, e.g.,
+        executor: "process"
+        executor_queue_size: 10
+    """
+    if target_configuration is None:
+        target_configuration = configuration
+
+    executor = component.get(BASE_CONFIGURATION_EXECUTOR_KEY, EXECUTOR_INLINE)
+    queue_size = int(component.get(BASE_CONFIGURATION_EXECUTOR_QUEUE_SIZE_KEY, _DEFAULT_EXECUTOR_QUEUE_SIZE))
+
+    if executor not in EXECUTORS or queue_size <= 0:
+        error_msg = (f"Invalid {BASE_CONFIGURATION_EXECUTOR_KEY}/{BASE_CONFIGURATION_EXECUTOR_QUEUE_SIZE_KEY} in "
+                     f"{component}, {BASE_CONFIGURATION_EXECUTOR_KEY} must be one of {EXECUTORS}")
+        _logger.error(error_msg)
+        raise Exception(error_msg)
+
+    if executor == EXECUTOR_INLINE:
+        return
+
+    if cfg_key.split(":")[0] == "input":
+        # input components are always started in their own process (see main.py)
+        _logger.warning("{key} is ignored for the input component {cfg_key}", key=BASE_CONFIGURATION_EXECUTOR_KEY,
+                        cfg_key=cfg_key)
+        return
+
+    target_configuration.setdefault(CONFIGURATION_CHANNEL_EXECUTORS_KEY, {})[cfg_key] = executor
+    target_configuration.setdefault(CONFIGURATION_CHANNEL_EXECUTOR_QUEUE_SIZES_KEY, {})[cfg_key] = queue_size
+
 
+def add_pipe_to_configuration(component, cfg_key, target_configuration=None):
+    if target_configuration is None:
+        target_configuration = configuration
 
-def add_pipe_to_configuration(component, cfg_key):
     if BASE_CONFIGURATION_COMPONENT_SUBSCRIBER_KEY in component:
-        if cfg_key not in configuration[CONFIGURATION_CHANNEL_PIPES_KEY]:
-            configuration[CONFIGURATION_CHANNEL_PIPES_KEY][cfg_key] = []
+        if cfg_key not in target_configuration[CONFIGURATION_CHANNEL_PIPES_KEY]:
+            target_configuration[CONFIGURATION_CHANNEL_PIPES_KEY][cfg_key] = []
 
-            for subscriber in component[BASE_CONFIGURATION_COMPONENT_SUBSCRIBER_KEY]:
-                configuration[CONFIGURATION_CHANNEL_PIPES_KEY][cfg_key].append(
+        for subscriber in component[BASE_CONFIGURATION_COMPONENT_SUBSCRIBER_KEY]:
+            if isinstance(subscriber, dict):
+                subscriber = add_edge_to_configuration(subscriber, cfg_key, target_configuration)
+
+            if subscriber not in target_configuration[CONFIGURATION_CHANNEL_PIPES_KEY][cfg_key]:
+                target_configuration[CONFIGURATION_CHANNEL_PIPES_KEY][cfg_key].append(
                     subscriber)
-        else:
-            for subscriber in component[BASE_CONFIGURATION_COMPONENT_SUBSCRIBER_KEY]:
-                if subscriber not in configuration[CONFIGURATION_CHANNEL_PIPES_KEY][cfg_key]:
-                    configuration[CONFIGURATION_CHANNEL_PIPES_KEY][cfg_key].append(
-                        subscriber)
-    elif cfg_key not in configuration[CONFIGURATION_CHANNEL_PIPES_KEY]:
-        configuration[CONFIGURATION_CHANNEL_PIPES_KEY][cfg_key] = []
+    elif cfg_key not in target_configuration[CONFIGURATION_CHANNEL_PIPES_KEY]:
+        target_configuration[CONFIGURATION_CHANNEL_PIPES_KEY][cfg_key] = []
+
+
+def add_edge_to_configuration(edge, cfg_key, target_configuration=None):
+    """
+    Save the delivery settings of a subscriber declared as a dictionary in `next`, e.g.,
+        next:
+          - name: "processing:yolov8"
+            queue_size: 1
+            overflow: "latest-only"
+
+    :return: the name of the subscriber
+    """
+    if target_configuration is None:
+        target_configuration = configuration
+
+    if EDGE_CONFIGURATION_NAME_KEY not in edge:
+        error_msg = f"{EDGE_CONFIGURATION_NAME_KEY} not in {edge}, unable to save the subscriber of {cfg_key}"
+        _logger.error(error_msg)
+        raise Exception(error_msg)
+
+    subscriber = edge[EDGE_CONFIGURATION_NAME_KEY]
+    queue_size = int(edge.get(EDGE_CONFIGURATION_QUEUE_SIZE_KEY, _DEFAULT_EDGE_QUEUE_SIZE))
+    overflow = edge.get(EDGE_CONFIGURATION_OVERFLOW_KEY, EDGE_OVERFLOW_BLOCK)
+
+    if overflow not in EDGE_OVERFLOW_POLICIES or queue_size <= 0:
+        error_msg = f"Invalid {EDGE_CONFIGURATION_OVERFLOW_KEY}/{EDGE_CONFIGURATION_QUEUE_SIZE_KEY} in {edge}"
+        _logger.error(error_msg)
+        raise Exception(error_msg)
+
+    all_edges = target_configuration.setdefault(CONFIGURATION_CHANNEL_EDGES_KEY, {})
+    all_edges.setdefault(cfg_key, {})[subscriber] = {
+        EDGE_CONFIGURATION_QUEUE_SIZE_KEY: queue_size,
+        EDGE_CONFIGURATION_OVERFLOW_KEY: overflow,
+    }
+
+    return subscriber
 
 
 def get_config():
     if not configuration:
-        parse_all_config()
+        with config_lock:
+            # it may have been parsed by another thread meanwhile
+            if not configuration:
+                parse_all_config()
 
     return configuration
 
 
+def get_config_version():
+    return _configuration_version
+
+
 def get_channel_entrypoints():
     return configuration[CONFIGURATION_CHANNELS_ENTRYPOINTS_KEY]
 
@@ -113,3 +309,29 @@ def get_channel_exitpoints():
 
 def get_channel_pipes():
     return configuration[CONFIGURATION_CHANNEL_PIPES_KEY]
+
+
+def get_channel_executors():
+    """
+    :return: the map with { "processing:whisper": "process", ... }, only for components which are not run inline
+    """
+    return configuration.get(CONFIGURATION_CHANNEL_EXECUTORS_KEY, {})
+
+
+def get_channel_executor(component):
+    return get_channel_executors().get(component, EXECUTOR_INLINE)
+
+
+def get_channel_executor_queue_size(component):
+    """
+    :return: the maximum number of messages waiting for the thread/process executor of the component
+    """
+    return configuration.get(CONFIGURATION_CHANNEL_EXECUTOR_QUEUE_SIZES_KEY, {}).get(component,
+                                                                                   _DEFAULT_EXECUTOR_QUEUE_SIZE)
+
+
+def get_channel_edge(publisher, subscriber):
+    """
+    :return: the delivery settings (queue_size, overflow) of the edge, or None if the subscriber is called directly
+    """
+    return configuration.get(CONFIGURATION_CHANNEL_EDGES_KEY, {}).get(publisher, {}).get(subscriber)
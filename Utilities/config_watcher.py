@@ -0,0 +1,87 @@
+"""
+Hot reload of the configuration, enabled with the environment variable `CONFIG_HOT_RELOAD=true`.
+
+Every process (main, input widgets, process executors) polls the modification times of the config files. If a file
+changed, the configuration of the process is parsed again and:
+    - the removed components, and the components with a different entrypoint/exitpoint/executor, are stopped (exit
+        function) and their instances are dropped, so that they are created again for their next message
+    - the routes of the publishers with different subscribers are compiled again (see routing_utility)
+    - the other component instances (i.e., the loaded models) are kept
+
+The main process also starts/stops the processes of the added/removed input components (see main.py).
+NOTE: A component cannot be moved to a new `process` executor without restarting the server (it runs inline instead).
+"""
+
+import threading
+from Utilities import config_utility, endpoint_utility, environment_utility, executor_utility, file_utility, \
+    logging_utility, time_utility
+
+CONFIG_HOT_RELOAD_ENV_KEY = "CONFIG_HOT_RELOAD"
+
+_POLL_INTERVAL_SECONDS = 2
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+def is_enabled():
+    return environment_utility.get_env_variable_or_default(CONFIG_HOT_RELOAD_ENV_KEY, "false").lower() == "true"
+
+
+def start(on_reload=None):
+    """
+    Start watching the config files (if enabled) in a daemon thread
+
+    :param on_reload: called with the config changes (see config_utility.get_config_changes) after each reload
+    :return: the watcher thread, or None if not enabled
+    """
+    if not is_enabled():
+        return None
+
+    watcher = threading.Thread(target=_watch, args=(on_reload,), daemon=True)
+    watcher.start()
+
+    return watcher
+
+
+def get_config_modified_times():
+    return {config_file: file_utility.get_modified_time(config_file)
+            for config_file in config_utility.get_config_files()}
+
+
+def reload(on_reload=None):
+    """
+    Reload the configuration and stop the components which were removed/changed in this process
+
+    :return: the config changes, or None if the configuration could not be parsed
+    """
+    with config_utility.config_lock:
+        try:
+            previous_configuration, config_changes = config_utility.reload_config()
+        except Exception:
+            _logger.exception("Error reloading the configuration, the previous configuration is kept")
+            return None
+
+        stopped_components = (config_changes[config_utility.CONFIG_CHANGES_REMOVED_KEY] +
+                              config_changes[config_utility.CONFIG_CHANGES_CHANGED_KEY])
+        for component in stopped_components:
+            endpoint_utility.remove_component_instance(component, previous_configuration)
+            executor_utility.stop_thread_executor(component)
+
+    _logger.info("Reloaded the configuration: {changes}", changes=config_changes)
+
+    if on_reload is not None:
+        on_reload(config_changes)
+
+    return config_changes
+
+
+def _watch(on_reload):
+    modified_times = get_config_modified_times()
+
+    while True:
+        time_utility.sleep_seconds(_POLL_INTERVAL_SECONDS)
+
+        new_modified_times = get_config_modified_times()
+        if new_modified_times != modified_times:
+            modified_times = new_modified_times
+            reload(on_reload)
@@ -0,0 +1,115 @@
+from collections import deque
+from threading import Condition, Thread
+from Utilities import config_utility, logging_utility, time_utility
+
+_STATS_LOG_INTERVAL_MILLIS = 10 * 1000
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+class EdgeQueue:
+    """
+    Delivers the messages of one edge (publisher -> subscriber) through a bounded queue, which is consumed by its own
+    worker thread. Thus, a slow subscriber does not block the publisher or the other subscribers of the publisher.
+
+    Overflow policies (when the queue is full):
+    - block: the publisher waits until there is a free slot in the queue
+    - drop-oldest: the oldest pending message is dropped
+    - latest-only: all pending messages are dropped, so the subscriber always gets the latest message
+    """
+
+    def __init__(self, name, entry_func, queue_size=1, overflow=config_utility.EDGE_OVERFLOW_BLOCK):
+        self.name = name
+        self.entry_func = entry_func
+        self.queue_size = queue_size
+        self.overflow = overflow
+
+        self.queue = deque()
+        self.condition = Condition()
+        self.stopped = False
+
+        self.delivered_count = 0
+        self.dropped_count = 0
+        self.max_depth = 0
+        self.last_stats_log_millis = time_utility.get_current_millis()
+        self.last_logged_dropped_count = 0
+
+        _logger.info("EdgeQueue::{name}, queue_size: {size}, overflow: {overflow}", name=name, size=queue_size,
+                     overflow=overflow)
+
+    def start(self):
+        # start a thread to deliver the messages to the subscriber
+        t = Thread(target=self.update, args=(), name=f"EdgeQueue-{self.name}")
+        t.daemon = True
+        t.start()
+        return self
+
+    def __call__(self, message):
+        self.put(message)
+
+    def put(self, message):
+        with self.condition:
+            if len(self.queue) >= self.queue_size:
+                if self.overflow == config_utility.EDGE_OVERFLOW_BLOCK:
+                    while len(self.queue) >= self.queue_size and not self.stopped:
+                        self.condition.wait()
+                elif self.overflow == config_utility.EDGE_OVERFLOW_LATEST_ONLY:
+                    self.dropped_count += len(self.queue)
+                    self.queue.clear()
+                else:
+                    self.dropped_count += 1
+                    self.queue.popleft()
+
+            # the worker has exited, so the message would never be delivered
+            if self.stopped:
+                self.dropped_count += 1
+                return
+
+            self.queue.append(message)
+            self.max_depth = max(self.max_depth, len(self.queue))
+            self.condition.notify_all()
+
+    def update(self):
+        while True:
+            with self.condition:
+                while not self.queue and not self.stopped:
+                    self.condition.wait()
+
+                if self.stopped:
+                    return
+
+                message = self.queue.popleft()
+                self.condition.notify_all()
+
+            try:
+                self.entry_func(message)
+            except Exception:
+                _logger.exception("Error delivering message through {name}", name=self.name)
+
+            self.delivered_count += 1
+            self.__log_stats_if_dropped()
+
+    def get_stats(self):
+        return {
+            "depth": len(self.queue),
+            "max_depth": self.max_depth,
+            "queue_size": self.queue_size,
+            "overflow": self.overflow,
+            "delivered": self.delivered_count,
+            "dropped": self.dropped_count,
+        }
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    def __log_stats_if_dropped(self):
+        current_millis = time_utility.get_current_millis()
+        if current_millis - self.last_stats_log_millis < _STATS_LOG_INTERVAL_MILLIS:
+            return
+
+        self.last_stats_log_millis = current_millis
+        if self.dropped_count != self.last_logged_dropped_count:
+            self.last_logged_dropped_count = self.dropped_count
+            _logger.warning("EdgeQueue::{name} stats: {stats}", name=self.name, stats=self.get_stats())
@@ -0,0 +1,136 @@
+"""
+Cache of the encoded images (png/jpeg/webp bytes) of the frames, so that a frame used by several services/APIs
+(i.e., OCR, captioning, the LLM and the clients) is encoded at most once per format and quality.
+
+The frames are identified by a frame key, i.e., the sequence number of the camera frame in the shared frame store
+(and the crop region, if cropped, see `get_frame_key`), and the size of the frame, as the services read their own copy
+of the camera frame. A frame without a key (i.e., not a camera frame) is encoded without being cached.
+
+The images uploaded to the LLMs (`get_upload_image_bytes`) are encoded in `IMAGE_UPLOAD_FORMAT` (jpeg, webp or png)
+at `IMAGE_UPLOAD_QUALITY` of the .env file, as png is slow to encode and large for photos. The images sent to the OCR
+and to the clients stay in png (`get_png_image_bytes`), as they expect lossless images.
+"""
+
+import threading
+from collections import OrderedDict
+import base_keys
+from Utilities import environment_utility, image_utility, logging_utility
+
+_DEFAULT_UPLOAD_FORMAT = image_utility.IMAGE_FORMAT_JPEG
+_DEFAULT_UPLOAD_QUALITY = 85
+_DEFAULT_MAX_FRAMES = 4
+
+_logger = logging_utility.setup_logger(__name__)
+
+UPLOAD_FORMAT = environment_utility.get_env_variable_or_default(base_keys.IMAGE_UPLOAD_FORMAT,
+                                                                _DEFAULT_UPLOAD_FORMAT).lower()
+if UPLOAD_FORMAT == "jpg":
+    UPLOAD_FORMAT = image_utility.IMAGE_FORMAT_JPEG
+if UPLOAD_FORMAT not in (image_utility.IMAGE_FORMAT_PNG, image_utility.IMAGE_FORMAT_JPEG,
+                         image_utility.IMAGE_FORMAT_WEBP):
+    _logger.error("Invalid image upload format: {image_format} (using {default})", image_format=UPLOAD_FORMAT,
+                  default=_DEFAULT_UPLOAD_FORMAT)
+    UPLOAD_FORMAT = _DEFAULT_UPLOAD_FORMAT
+UPLOAD_QUALITY = int(environment_utility.get_env_variable_or_default(base_keys.IMAGE_UPLOAD_QUALITY,
+                                                                     _DEFAULT_UPLOAD_QUALITY))
+
+
+class EncodedImageCache:
+    """
+    Encoded images of the last `max_frames` frames (least recently used are evicted), by format and quality
+    """
+
+    def __init__(self, max_frames=_DEFAULT_MAX_FRAMES):
+        self.max_frames = max_frames
+        self.frames = OrderedDict()  # {(frame key, frame shape): {(format, quality): bytes}}
+        self.lock = threading.Lock()
+        self.hit_count = 0
+        self.encode_count = 0
+
+    def get_image_bytes(self, opencv_frame, image_format, quality=None, frame_key=None):
+        """
+        :param frame_key: the key of the frame (see get_frame_key), or None to encode the frame without caching it
+        :return: the frame encoded in the format (see image_utility.get_encoded_image_bytes), encoded only if it is
+            not cached
+        """
+        if image_format == image_utility.IMAGE_FORMAT_PNG:
+            quality = None
+        key = (image_format, quality)
+        frame_id = (frame_key, opencv_frame.shape)
+
+        if frame_key is not None:
+            with self.lock:
+                image_bytes = self.__get_encoded_images(frame_id).get(key)
+                if image_bytes is not None:
+                    self.hit_count += 1
+                    return image_bytes
+
+        # encoded outside the lock, so that the frames are encoded in parallel (a frame may be encoded twice if it
+        # is requested concurrently, which is still correct)
+        image_bytes = image_utility.get_encoded_image_bytes(opencv_frame, image_format, quality)
+
+        with self.lock:
+            self.encode_count += 1
+            if frame_key is not None:
+                self.__get_encoded_images(frame_id)[key] = image_bytes
+        return image_bytes
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "frames": len(self.frames),
+                "hits": self.hit_count,
+                "encodes": self.encode_count,
+            }
+
+    def clear(self):
+        with self.lock:
+            self.frames.clear()
+
+    def __get_encoded_images(self, frame_id):
+        encoded_images = self.frames.get(frame_id)
+        if encoded_images is None:
+            encoded_images = {}
+            self.frames[frame_id] = encoded_images
+
+        self.frames.move_to_end(frame_id)
+        while len(self.frames) > self.max_frames:
+            self.frames.popitem(last=False)
+        return encoded_images
+
+
+def get_frame_key(frame_details, region=None):
+    """
+    :param frame_details: the details of the camera frame (see BaseComponent.get_camera_frame_data), or None
+    :param region: what identifies the part of the frame which is encoded if it is cropped, i.e., the pointed location
+    :return: the key of the frame, by its sequence number, or None if it is not a camera frame
+    """
+    if frame_details is None:
+        return None
+    return frame_details["sequence"], region
+
+
+# shared by all the services (of a process)
+_cache = EncodedImageCache()
+
+
+def get_image_bytes(opencv_frame, image_format, quality=None, frame_key=None):
+    """
+    :return: the frame encoded in the format, from the shared cache (see get_frame_key)
+    """
+    return _cache.get_image_bytes(opencv_frame, image_format, quality, frame_key)
+
+
+def get_png_image_bytes(opencv_frame, frame_key=None):
+    """
+    :return: the (lossless) png of the frame, from the shared cache, to be sent to the OCR and the clients
+    """
+    return get_image_bytes(opencv_frame, image_utility.IMAGE_FORMAT_PNG, frame_key=frame_key)
+
+
+def get_upload_image_bytes(opencv_frame, frame_key=None):
+    """
+    :return: the frame encoded in IMAGE_UPLOAD_FORMAT (at IMAGE_UPLOAD_QUALITY), from the shared cache, to be uploaded
+        to the LLMs (see image_utility.get_image_mime_type for its mime type)
+    """
+    return get_image_bytes(opencv_frame, UPLOAD_FORMAT, UPLOAD_QUALITY, frame_key)
@@ -1,6 +1,6 @@
 import importlib
 
-from . import config_utility
+from . import config_utility, logging_utility
 
 component_instances = {}
 
@@ -11,6 +11,8 @@ component_base_dir_map = {
     "output": "Outputs"
 }
 
+_logger = logging_utility.setup_logger(__name__)
+
 
 def get_entry_func_of(component, component_type=None):
     '''
@@ -93,12 +95,47 @@ def get_component_instance(component):
     :return:
     '''
     if component not in component_instances:
-        entrypoint = get_entrypoint_of(component)
-        class_name = get_class_of(component)
-
-        submod = importlib.import_module(entrypoint)
-        instance = getattr(submod, class_name)(component)
+        instance = get_component_class(component)(component)
 
         component_instances[component] = instance
 
     return component_instances[component]
+
+
+def get_component_class(component):
+    '''
+
+    :param component: Format in configuration file, i.e., processing:Yolov8
+    :return: the class of the component (without creating an instance)
+    '''
+    entrypoint = get_entrypoint_of(component)
+    class_name = get_class_of(component)
+
+    submod = importlib.import_module(entrypoint)
+
+    return getattr(submod, class_name)
+
+
+def remove_component_instance(component, cfg=None):
+    '''
+    Stop the component instance (exit function, if any) and remove it, so that a new instance is created if the
+    component is required again
+
+    :param component: Format in configuration file, i.e., processing:Yolov8
+    :param cfg: the configuration with the exitpoint of the component (default: the current configuration)
+    '''
+    instance = component_instances.pop(component, None)
+    if instance is None:
+        return
+
+    if cfg is None:
+        cfg = config_utility.get_config()
+
+    exitpoint = cfg.get(config_utility.CONFIGURATION_CHANNELS_EXITPOINTS_KEY, {}).get(component)
+    if not exitpoint:
+        return
+
+    try:
+        getattr(instance, exitpoint.split(".")[-1])()
+    except Exception:
+        _logger.exception("Error stopping {component}", component=component)
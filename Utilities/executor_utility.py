@@ -0,0 +1,189 @@
+"""
+Runs the entry functions of the (non-input) components according to their `executor` in the configuration:
+    - inline (default): the entry function is called directly on the thread of the publisher
+    - thread: the component has its own worker thread (per process), which consumes a bounded queue of messages
+    - process: the component is hosted in its own worker process, which receives the messages through a
+        multiprocessing.Queue (IPC). The messages must be picklable (e.g., dict, numpy arrays, protobuf messages).
+The size of the queue is set by `executor_queue_size` in the configuration (see config_utility).
+
+Process executors must be started (`start_process_executors`) before the input components, so that every process
+can send messages to them, and stopped (`stop_process_executors`) on exit. They are not daemon processes, so that
+their components can start child processes.
+"""
+
+import multiprocessing
+import os
+import queue
+from Memory import Memory
+from Utilities import config_utility, config_watcher, endpoint_utility, logging_utility, startup_utility, \
+    trace_utility
+from Utilities.edge_queue import EdgeQueue
+
+# time to wait for a process executor to stop after the messages queued before, before terminating it
+_PROCESS_EXECUTOR_STOP_TIMEOUT_SECONDS = 5
+# put in the queue of a process executor to stop it
+_STOP_PROCESS_EXECUTOR = None
+
+# component -> multiprocessing.Queue, shared by all processes
+_process_queues = {}
+# component -> worker process, only in the process which started them
+_process_executors = {}
+# component -> EdgeQueue, per process
+_thread_executors = {}
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+def get_executor_func(component, entry_func=None):
+    '''
+
+    :param component: Format in configuration file, i.e., processing:whisper
+    :param entry_func: the bound entry function of the component instance (not required for process executors)
+    :return: the function to send a message to the component, or None if the component runs inline
+    '''
+    executor = config_utility.get_channel_executor(component)
+
+    if executor == config_utility.EXECUTOR_PROCESS and component in _process_queues:
+        return _process_queues[component].put
+
+    if executor == config_utility.EXECUTOR_THREAD:
+        thread_executor = _thread_executors.get(component)
+        if thread_executor is None or thread_executor.entry_func != entry_func:
+            if thread_executor is not None:
+                thread_executor.stop()
+
+            thread_executor = EdgeQueue(component, entry_func,
+                                        config_utility.get_channel_executor_queue_size(component)).start()
+            _thread_executors[component] = thread_executor
+
+        return thread_executor
+
+    return None
+
+
+def is_process_executor(component):
+    return component in _process_queues
+
+
+def start_process_executors():
+    """
+    Start a worker process for each component with the `process` executor
+    """
+    for component, executor in config_utility.get_channel_executors().items():
+        if executor == config_utility.EXECUTOR_PROCESS and component not in _process_queues:
+            _process_queues[component] = multiprocessing.Queue(
+                maxsize=config_utility.get_channel_executor_queue_size(component))
+
+    process_transports = get_process_transports()
+    for component in process_transports:
+        if component in _process_executors:
+            continue
+
+        process = multiprocessing.Process(target=_run_process_executor,
+                                          args=(component, process_transports, Memory.get_process_locks()))
+        process.start()
+        _process_executors[component] = process
+
+
+def stop_process_executors():
+    """
+    Stop the worker processes started by start_process_executors, once they have handled the messages queued before
+    (they are terminated if they do not stop in time)
+    """
+    for component in _process_executors:
+        try:
+            _process_queues[component].put(_STOP_PROCESS_EXECUTOR, timeout=_PROCESS_EXECUTOR_STOP_TIMEOUT_SECONDS)
+        except queue.Full:
+            _logger.warning("The queue of the process executor of {component} is full", component=component)
+
+    for component, process in _process_executors.items():
+        process.join(_PROCESS_EXECUTOR_STOP_TIMEOUT_SECONDS)
+        if process.is_alive():
+            _logger.warning("Process executor of {component} did not stop in {seconds} s, terminating it",
+                            component=component, seconds=_PROCESS_EXECUTOR_STOP_TIMEOUT_SECONDS)
+            terminate_process(process)
+
+    _process_executors.clear()
+
+
+def terminate_process(process):
+    """
+    Terminate the process while the locks of the shared memory (see Memory.get_process_locks) are held here, so that
+    it does not die holding one of them
+    """
+    process_locks = list(Memory.get_process_locks().values())
+    for lock in process_locks:
+        lock.acquire()
+    try:
+        process.terminate()
+        process.join()
+    finally:
+        for lock in process_locks:
+            lock.release()
+
+
+def get_process_transports():
+    return dict(_process_queues)
+
+
+def run_with_process_transports(entry_func, process_transports, component=None, process_locks=None):
+    """
+    Run the entry function in a new process, with the queues of the process executors and the shared memory locks
+    (see Memory.get_process_locks) of the parent process (required if the process is spawned instead of forked),
+    after warming up the subscribers of the component
+    """
+    _process_queues.update(process_transports)
+    if process_locks is not None:
+        Memory.set_process_locks(process_locks)
+    if component is not None:
+        startup_utility.warm_up_process(component)
+    config_watcher.start()
+    entry_func()
+
+
+def stop_thread_executor(component):
+    thread_executor = _thread_executors.pop(component, None)
+    if thread_executor is not None:
+        thread_executor.stop()
+
+
+def get_thread_executor_stats():
+    return {component: thread_executor.get_stats() for component, thread_executor in _thread_executors.items()}
+
+
+def _run_process_executor(component, process_transports, process_locks):
+    _process_queues.update(process_transports)
+    Memory.set_process_locks(process_locks)
+
+    entry_func = _get_entry_func(component)
+    config_version = config_utility.get_config_version()
+    message_queue = process_transports[component]
+
+    _logger.info("Process executor of {component}, PID: {pid}", component=component, pid=os.getpid())
+    config_watcher.start()
+
+    while True:
+        message = message_queue.get()
+        if message is _STOP_PROCESS_EXECUTOR:
+            _logger.info("Process executor of {component} is stopped", component=component)
+            return
+
+        # the instance may have been replaced/removed after reloading the configuration (see config_watcher)
+        if config_version != config_utility.get_config_version():
+            config_version = config_utility.get_config_version()
+            if component not in config_utility.get_channel_entrypoints():
+                _logger.info("Process executor of {component} is stopped, as it is not configured anymore",
+                             component=component)
+                return
+            entry_func = _get_entry_func(component)
+
+        try:
+            entry_func(message)
+        except Exception:
+            _logger.exception("Error running {component}", component=component)
+
+
+def _get_entry_func(component):
+    instance = endpoint_utility.get_component_instance(component)
+    entry_func = getattr(instance, endpoint_utility.get_entry_func_of(component))
+    return trace_utility.trace_entry_func(component, entry_func)
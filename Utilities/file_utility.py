@@ -118,6 +118,16 @@ def is_file_older_than(file_name, seconds):
     return (time.time() - file_time) > seconds
 
 
+def get_modified_time(file_name):
+    """
+    :return: the last modification time of the file (seconds since the epoch), or None if it does not exist
+    """
+    try:
+        return os.path.getmtime(file_name)
+    except OSError:
+        return None
+
+
 def get_project_root():
     current_dir = os.path.dirname(os.path.abspath(__file__))
 
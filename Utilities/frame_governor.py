@@ -0,0 +1,117 @@
+"""
+Governs the rate of the frames sent by the camera widget to its subscribers.
+
+- FrameGovernor: adapts the interval between the sent frames (the other frames are skipped) to a latency target,
+    based on the time taken to send a frame, i.e., the processing time of the inline subscribers and the time waiting
+    for the (full) queues of the other subscribers.
+- limit_rate: drops the frames sent to a subscriber faster than its declared maximum rate
+    (`BaseComponent.MAX_FRAME_RATE`), see routing_utility
+"""
+
+import time
+from Utilities import logging_utility
+
+_EWMA_ALPHA = 0.2
+_INTERVAL_INCREASE_FACTOR = 1.5
+_INTERVAL_DECREASE_FACTOR = 0.9
+_MIN_ADAPTIVE_INTERVAL_SECONDS = 0.001
+_MAX_INTERVAL_SECONDS = 1.0
+_STATS_REPORT_INTERVAL_SECONDS = 5.0
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+class FrameGovernor:
+    """
+    The interval between the sent frames grows (x1.5, up to 1 second) while the moving average of the processing time
+    is above the latency target, and shrinks back (x0.9, down to the interval of the maximum rate) otherwise.
+    """
+
+    def __init__(self, name, latency_target_millis, max_rate=None, on_report=None):
+        self.name = name
+        self.on_report = on_report
+        self.latency_target_seconds = latency_target_millis / 1000
+        self.min_interval = 1 / max_rate if max_rate else 0
+        self.interval = self.min_interval
+
+        self.processing_seconds = 0
+        self.next_send_time = 0
+
+        self.sent_count = 0
+        self.skipped_count = 0
+        self.achieved_rate = 0
+        self.report_start_time = time.monotonic()
+        self.report_sent_count = 0
+
+        _logger.info("FrameGovernor::{name}, latency target: {target} ms, max rate: {max_rate}", name=name,
+                     target=latency_target_millis, max_rate=max_rate)
+
+    def should_send(self):
+        """
+        :return: whether the next frame should be sent, otherwise it is skipped
+        """
+        if time.monotonic() < self.next_send_time:
+            self.skipped_count += 1
+            return False
+        return True
+
+    def update(self, start_time, end_time):
+        """
+        Adapt the interval to the time taken to send a frame (time.monotonic() before/after sending it)
+        """
+        processing_seconds = end_time - start_time
+        self.processing_seconds = _EWMA_ALPHA * processing_seconds + (1 - _EWMA_ALPHA) * self.processing_seconds
+
+        if self.processing_seconds > self.latency_target_seconds:
+            self.interval = min(_MAX_INTERVAL_SECONDS,
+                                max(self.interval, _MIN_ADAPTIVE_INTERVAL_SECONDS) * _INTERVAL_INCREASE_FACTOR)
+        else:
+            self.interval = self.interval * _INTERVAL_DECREASE_FACTOR
+            if self.interval < max(self.min_interval, _MIN_ADAPTIVE_INTERVAL_SECONDS):
+                self.interval = self.min_interval
+
+        self.next_send_time = start_time + max(self.interval, self.min_interval)
+        self.sent_count += 1
+        self.__report_if_needed(end_time)
+
+    def get_stats(self):
+        return {
+            "achieved_rate": self.achieved_rate,
+            "interval_millis": self.interval * 1000,
+            "processing_millis": self.processing_seconds * 1000,
+            "sent": self.sent_count,
+            "skipped": self.skipped_count,
+        }
+
+    def __report_if_needed(self, now):
+        elapsed = now - self.report_start_time
+        if elapsed < _STATS_REPORT_INTERVAL_SECONDS:
+            return
+
+        self.achieved_rate = (self.sent_count - self.report_sent_count) / elapsed
+        self.report_start_time = now
+        self.report_sent_count = self.sent_count
+
+        _logger.debug("FrameGovernor::{name}, stats: {stats}", name=self.name, stats=self.get_stats())
+        if self.on_report is not None:
+            self.on_report(self.get_stats())
+
+
+def limit_rate(entry_func, max_rate):
+    """
+    :return: the entry function which drops the messages received faster than max_rate (per second)
+    """
+    min_interval = 1 / max_rate
+    next_time = 0.0
+
+    def rate_limited_entry_func(message):
+        nonlocal next_time
+
+        now = time.monotonic()
+        if now < next_time:
+            return None
+
+        next_time = now + min_interval
+        return entry_func(message)
+
+    return rate_limited_entry_func
@@ -0,0 +1,166 @@
+"""
+Variants (downscaled and colour converted) of the camera frames, built once per frame (see FrameVariants) for the
+subscribers of the camera widget, so that they do not resize/convert the full frame each.
+
+A subscriber declares the variants it needs (`BaseComponent.FRAME_VARIANTS`, see routing_utility), which are sent in
+`camera_frame_variants` ({variant name: frame}), and gets one with `get_frame_variant(raw_data, name)`.
+
+The variants are configured in `CAMERA_FRAME_VARIANTS_CONFIG` of the .env file, i.e.,
+"yolo:640:bgr,clip:224:rgb:shortest", as name:size:colour[:fit], where the longest side (or the shortest side with
+"shortest") of the variant is at most the size, and the colour is bgr (as the camera frames), rgb or gray.
+
+NOTE: A variant which is not smaller than the camera frame (in bgr) is the camera frame itself, so the variants must
+not be modified in place.
+"""
+
+import threading
+from collections import namedtuple
+from collections.abc import Mapping
+import cv2
+import base_keys
+from Utilities import environment_utility, image_utility, logging_utility
+
+COLOR_BGR = "bgr"
+COLOR_RGB = "rgb"
+COLOR_GRAY = "gray"
+FIT_LONGEST = "longest"
+FIT_SHORTEST = "shortest"
+
+_COLOR_CONVERSIONS = {
+    COLOR_BGR: None,
+    COLOR_RGB: cv2.COLOR_BGR2RGB,
+    COLOR_GRAY: cv2.COLOR_BGR2GRAY,
+}
+_DEFAULT_VARIANTS = "yolo:640:bgr,clip:224:rgb:shortest,llm:1024:bgr"
+
+FrameVariant = namedtuple("FrameVariant", ["name", "size", "color", "fit"])
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+def parse_variants(variants):
+    """
+    :param variants: i.e., "yolo:640:bgr,clip:224:rgb:shortest"
+    :return: {name: FrameVariant}
+    """
+    parsed_variants = {}
+    for variant in filter(None, (item.strip() for item in variants.split(","))):
+        try:
+            name, size, color, fit = (variant.split(":") + [FIT_LONGEST])[:4]
+            if color not in _COLOR_CONVERSIONS or fit not in (FIT_LONGEST, FIT_SHORTEST):
+                raise ValueError(variant)
+            parsed_variants[name] = FrameVariant(name, int(size), color, fit)
+        except ValueError:
+            _logger.error("Invalid camera frame variant: {variant}", variant=variant)
+
+    return parsed_variants
+
+
+VARIANTS = parse_variants(
+    environment_utility.get_env_variable_or_default(base_keys.CAMERA_FRAME_VARIANTS_CONFIG, _DEFAULT_VARIANTS))
+
+
+def build_variant(frame, variant):
+    """
+    :return: the variant of the (bgr) frame
+    """
+    resized_frame = image_utility.get_resized_frame(frame, variant.size, variant.fit == FIT_SHORTEST)
+    return _convert_color(resized_frame, variant.color)
+
+
+def get_frame_variant(raw_data, name):
+    """
+    :param raw_data: message of the camera widget
+    :return: the variant of the camera frame, built from the camera frame if it was not sent (i.e., not declared in
+        FRAME_VARIANTS)
+    """
+    variants = raw_data.get(base_keys.CAMERA_FRAME_VARIANTS)
+    if variants is not None and name in variants:
+        return variants[name]
+
+    return build_variant(raw_data[base_keys.CAMERA_FRAME], VARIANTS[name])
+
+
+class FramePyramid:
+    """
+    Variants needed by the subscribers of the camera widget
+    """
+
+    def __init__(self, variant_names):
+        self.variants = {}
+        for name in sorted(variant_names):
+            if name in VARIANTS:
+                self.variants[name] = VARIANTS[name]
+            else:
+                _logger.error("Unknown camera frame variant: {name} (see CAMERA_FRAME_VARIANTS_CONFIG)", name=name)
+
+    def build(self, frame):
+        """
+        :return: the variants of the frame, which are built when they are first accessed
+        """
+        return FrameVariants(self.variants, frame)
+
+
+class FrameVariants(Mapping):
+    """
+    {variant name: frame} of one camera frame, shared by all the subscribers of the frame (in a process). Each variant
+    is built once, when it is first accessed (i.e., not for the subscribers which skip the frame), by resizing the
+    smallest (bgr) frame already resized which is not smaller than it, and converting the colour afterwards.
+
+    It is pickled (i.e., sent to a `process` executor) with the variants already built.
+    """
+
+    def __init__(self, variants, frame):
+        self.variants = variants
+        self.frame = frame
+        height, width = frame.shape[:2]
+        self.resized_frames = {(width, height): frame}  # (bgr) frames by size
+        self.built_variants = {}
+        self.lock = threading.Lock()
+
+    def __getitem__(self, name):
+        variant_frame = self.built_variants.get(name)
+        if variant_frame is not None:
+            return variant_frame
+
+        variant = self.variants[name]
+        with self.lock:
+            if name not in self.built_variants:
+                self.built_variants[name] = _convert_color(self.__get_resized_frame(variant), variant.color)
+            return self.built_variants[name]
+
+    def __contains__(self, name):
+        return name in self.variants
+
+    def __iter__(self):
+        return iter(self.variants)
+
+    def __len__(self):
+        return len(self.variants)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def __get_resized_frame(self, variant):
+        height, width = self.frame.shape[:2]
+        size = image_utility.get_resized_size(width, height, variant.size, variant.fit == FIT_SHORTEST)
+
+        resized_frame = self.resized_frames.get(size)
+        if resized_frame is None:
+            source_frame = min((source for source_size, source in self.resized_frames.items()
+                                if source_size[0] >= size[0] and source_size[1] >= size[1]),
+                               key=lambda source: source.shape[0] * source.shape[1])
+            resized_frame = self.resized_frames[size] = cv2.resize(source_frame, size, interpolation=cv2.INTER_AREA)
+
+        return resized_frame
+
+
+def _convert_color(frame, color):
+    conversion = _COLOR_CONVERSIONS[color]
+    return frame if conversion is None else cv2.cvtColor(frame, conversion)
@@ -12,20 +12,15 @@ def get_similarity_images(image1, image2, threshold):
     if image1.size != image2.size or image1.mode != image2.mode:
         return False
 
-    pixel_count = image1.size[0] * image1.size[1]
-    pixel_diff_count = 0
+    pixels1 = np.asarray(image1, dtype=np.int32)[..., :3]
+    pixels2 = np.asarray(image2, dtype=np.int32)[..., :3]
 
-    pixels1 = image1.load()
-    pixels2 = image2.load()
+    # as long as pixel diff (euclidean distance, see get_pixel_diff) is less than threshold, it is considered the same
+    # pixel (compared squared, to avoid the square roots)
+    squared_distances = np.sum((pixels1 - pixels2) ** 2, axis=-1)
+    pixel_diff_count = np.count_nonzero(squared_distances > threshold ** 2)
 
-    # compare pixel by pixel for difference
-    for x in range(image1.size[0]):
-        for y in range(image1.size[1]):
-            # as long as pixel diff is less than threshold, it is considered the same pixel
-            if get_pixel_diff(pixels1[x, y], pixels2[x, y]) > threshold:
-                pixel_diff_count += 1
-
-    similarity = 1 - (pixel_diff_count / pixel_count)
+    similarity = 1 - (pixel_diff_count / squared_distances.size)
     return similarity
 
 def get_frame_from_bytes(image_bytes):
@@ -73,6 +68,153 @@ def get_png_image_bytes(opencv_frame):
     return encoded_image.tobytes()
 
 
+IMAGE_FORMAT_PNG = "png"
+IMAGE_FORMAT_JPEG = "jpeg"
+IMAGE_FORMAT_WEBP = "webp"
+
+# quality parameter of the lossy formats (0-100)
+_QUALITY_PARAMS = {
+    IMAGE_FORMAT_JPEG: cv2.IMWRITE_JPEG_QUALITY,
+    IMAGE_FORMAT_WEBP: cv2.IMWRITE_WEBP_QUALITY,
+}
+_FORMAT_SIGNATURES = {
+    IMAGE_FORMAT_PNG: lambda image_bytes: image_bytes.startswith(b"\x89PNG"),
+    IMAGE_FORMAT_JPEG: lambda image_bytes: image_bytes.startswith(b"\xff\xd8\xff"),
+    IMAGE_FORMAT_WEBP: lambda image_bytes: image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP",
+}
+
+
+def get_encoded_image_bytes(opencv_frame, image_format=IMAGE_FORMAT_PNG, quality=None):
+    """
+    :param image_format: png, jpeg or webp
+    :param quality: quality (0-100) of jpeg/webp, or None for the default of OpenCV (ignored for png)
+    """
+    params = []
+    if quality is not None and image_format in _QUALITY_PARAMS:
+        params = [_QUALITY_PARAMS[image_format], int(quality)]
+
+    success, encoded_image = cv2.imencode(f".{image_format}", opencv_frame, params)
+    if not success:
+        raise ValueError(f"Failed to encode the image as {image_format}")
+    return encoded_image.tobytes()
+
+
+def get_image_format(image_bytes):
+    """
+    :return: the format (png, jpeg or webp) of the encoded image, png if it is unknown
+    """
+    for image_format, is_format in _FORMAT_SIGNATURES.items():
+        if is_format(image_bytes):
+            return image_format
+
+    return IMAGE_FORMAT_PNG
+
+
+def get_image_mime_type(image_bytes):
+    """
+    :return: the mime type of the encoded image, i.e., for a data url (data:image/jpeg;base64,...)
+    """
+    return f"image/{get_image_format(image_bytes)}"
+
+
+def get_base64_image_mime_type(image_base64):
+    """
+    :return: the mime type of the base64 encoded image (see get_image_mime_type)
+    """
+    # 16 base64 characters are the first 12 bytes (enough for the signatures)
+    return get_image_mime_type(base64.b64decode(image_base64[:16]))
+
+
+def get_resized_size(width, height, size, fit_shortest=False):
+    """
+    :return: (width, height) scaled down (keeping the aspect ratio) so that the longest side (or the shortest side if
+        fit_shortest) is at most `size`
+    """
+    side = min(width, height) if fit_shortest else max(width, height)
+    if side <= size:
+        return width, height
+
+    scale = size / side
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def get_resized_frame(opencv_frame, size, fit_shortest=False):
+    """
+    Downscale the frame (see get_resized_size), or return the frame itself if it is not larger than the size
+    """
+    height, width = opencv_frame.shape[:2]
+    resized_size = get_resized_size(width, height, size, fit_shortest)
+    if resized_size == (width, height):
+        return opencv_frame
+
+    return cv2.resize(opencv_frame, resized_size, interpolation=cv2.INTER_AREA)
+
+
+def _get_gray_thumbnail(opencv_frame, width, height):
+    if opencv_frame.ndim == 3:
+        opencv_frame = cv2.cvtColor(opencv_frame, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(opencv_frame, (width, height), interpolation=cv2.INTER_AREA)
+
+
+def get_average_hash(opencv_frame, hash_size=8):
+    """
+    Perceptual hash (aHash) of the frame: whether each pixel of the (hash_size x hash_size) grayscale thumbnail is
+    brighter than the average
+
+    :return: the hash as an int of hash_size * hash_size bits (compare them with get_hash_distance)
+    """
+    thumbnail = _get_gray_thumbnail(opencv_frame, hash_size, hash_size)
+    return _get_hash_of_bits(thumbnail > thumbnail.mean())
+
+
+def get_difference_hash(opencv_frame, hash_size=8):
+    """
+    Perceptual hash (dHash) of the frame: whether each pixel of the ((hash_size + 1) x hash_size) grayscale thumbnail
+    is brighter than its right neighbour, which is robust to brightness/contrast changes
+
+    :return: the hash as an int of hash_size * hash_size bits (compare them with get_hash_distance)
+    """
+    thumbnail = _get_gray_thumbnail(opencv_frame, hash_size + 1, hash_size)
+    return _get_hash_of_bits(thumbnail[:, 1:] < thumbnail[:, :-1])
+
+
+def _get_hash_of_bits(bits):
+    return int.from_bytes(np.packbits(bits.flatten()).tobytes(), "big")
+
+
+def get_hash_distance(hash1, hash2):
+    """
+    :return: the number of different bits (hamming distance) of two perceptual hashes, i.e., 0 for near-identical frames
+    """
+    return (hash1 ^ hash2).bit_count()
+
+
+class SceneChangeDetector:
+    """
+    Detects the frames of a new scene, i.e., whose perceptual hash differs from the one of the last new scene frame by
+    more than `max_distance` bits, so that near-identical frames can be skipped
+    """
+
+    def __init__(self, max_distance=10, hash_func=get_difference_hash):
+        self.max_distance = max_distance
+        self.hash_func = hash_func
+        self.scene_hash = None
+
+    def is_new_scene(self, opencv_frame):
+        """
+        :return: whether the frame is the first one of a new scene (which becomes the current scene)
+        """
+        frame_hash = self.hash_func(opencv_frame)
+        if self.scene_hash is not None and get_hash_distance(frame_hash, self.scene_hash) <= self.max_distance:
+            return False
+
+        self.scene_hash = frame_hash
+        return True
+
+    def reset(self):
+        self.scene_hash = None
+
+
 def save_image(filename, opencv_frame):
     cv2.imwrite(filename, opencv_frame)
 
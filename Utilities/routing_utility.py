@@ -0,0 +1,248 @@
+"""
+Routing table used by `BaseComponent.send_to_component` to deliver messages to the subscribers of a component.
+
+The channel pipes of the configuration are compiled into a tuple of routes per publisher, where each route is
+(subscriber, entry_func, supported_datatypes):
+    - subscriber: the subscriber name in the configuration, i.e., processing:yolov8
+    - entry_func: the bound entry function of the subscriber instance
+    - supported_datatypes: the set of websocket datatype keys handled by the subscriber (only for websocket messages),
+        or None if every message is delivered to the subscriber
+
+The table is compiled once per process (component instances are created in the process that uses them). When the
+configuration is parsed again (see config_watcher), only the routes of the publishers whose subscribers changed are
+compiled again.
+
+If the subscriber is not run inline (see executor_utility), the entry_func sends the message to the executor of the
+subscriber. If the edge (publisher -> subscriber) has delivery settings in the configuration (see config_utility), the
+entry_func is an EdgeQueue, which delivers the messages to the subscriber from its own worker thread. If tracing is
+enabled (see trace_utility), the entry function of the subscriber records the latencies of the messages. The camera
+frames are sent to a subscriber at most at its MAX_FRAME_RATE (see frame_governor), with the variants declared in the
+FRAME_VARIANTS of the subscribers (see frame_pyramid).
+
+The routes of a publisher are also indexed by websocket datatype key (see get_datatype_routes), so that a websocket
+message is only decoded and delivered if a subscriber is interested in its datatype.
+"""
+
+import base_keys
+from DataFormat import datatypes_helper
+from Utilities import config_utility, endpoint_utility, executor_utility, frame_governor, logging_utility, \
+    trace_utility
+from Utilities.edge_queue import EdgeQueue
+
+ROUTE_SUBSCRIBER_INDEX = 0
+ROUTE_ENTRY_FUNC_INDEX = 1
+ROUTE_SUPPORTED_DATATYPES_INDEX = 2
+
+_routing_table = {}
+_routing_table_version = None
+# publisher -> the configuration of its routes when they were compiled
+_route_signatures = {}
+# publisher -> (routes, {datatype key: routes}, routes to every datatype)
+_datatype_routing_table = {}
+_edge_queues = {}
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+def get_routes(publisher):
+    '''
+
+    :param publisher: Format in configuration file, i.e., input:camera
+    :return: tuple of compiled routes (subscriber, entry_func, supported_datatypes) of the publisher
+    '''
+    if _routing_table_version != config_utility.get_config_version():
+        _remove_changed_routes()
+
+    routes = _routing_table.get(publisher)
+    if routes is None:
+        with config_utility.config_lock:
+            routes = compile_routes(publisher)
+            _route_signatures[publisher] = _get_route_signature(publisher)
+        _routing_table[publisher] = routes
+
+    return routes
+
+
+def get_datatype_routes(publisher, datatype):
+    '''
+
+    :param publisher: Format in configuration file, i.e., input:websocket
+    :param datatype: websocket datatype key of the message
+    :return: tuple of the routes of the publisher whose subscribers are interested in the datatype
+    '''
+    routes = get_routes(publisher)
+
+    datatype_routes = _datatype_routing_table.get(publisher)
+    if datatype_routes is None or datatype_routes[0] is not routes:
+        # (re)build the index if the routes were compiled again
+        datatype_routes = (routes, *_index_routes_by_datatype(routes))
+        _datatype_routing_table[publisher] = datatype_routes
+
+    return datatype_routes[1].get(datatype, datatype_routes[2])
+
+
+def _index_routes_by_datatype(routes):
+    all_datatype_routes = tuple(route for route in routes if route[ROUTE_SUPPORTED_DATATYPES_INDEX] is None)
+    datatypes = set().union(*(route[ROUTE_SUPPORTED_DATATYPES_INDEX] or () for route in routes))
+
+    index = {datatype: tuple(route for route in routes if route[ROUTE_SUPPORTED_DATATYPES_INDEX] is None or
+                             datatype in route[ROUTE_SUPPORTED_DATATYPES_INDEX])
+             for datatype in datatypes}
+
+    return index, all_datatype_routes
+
+
+def compile_routes(publisher):
+    '''
+
+    :param publisher: Format in configuration file, i.e., input:camera
+    :return: tuple of routes (subscriber, entry_func, supported_datatypes) of the publisher
+    '''
+    all_subscribers = config_utility.get_config()[config_utility.CONFIGURATION_CHANNEL_PIPES_KEY].get(publisher, [])
+
+    routes = []
+    for subscriber in all_subscribers:
+        if executor_utility.is_process_executor(subscriber):
+            # the subscriber instance only exists in its own process
+            component_class = endpoint_utility.get_component_class(subscriber)
+            supported_datatypes_of = component_class.SUPPORTED_DATATYPES
+            entry_func = executor_utility.get_executor_func(subscriber)
+        else:
+            instance = endpoint_utility.get_component_instance(subscriber)
+            component_class = type(instance)
+            supported_datatypes_of = instance.get_supported_datatypes()
+            entry_func = getattr(instance, endpoint_utility.get_entry_func_of(subscriber))
+            entry_func = trace_utility.trace_entry_func(subscriber, entry_func)
+            entry_func = executor_utility.get_executor_func(subscriber, entry_func) or entry_func
+
+        entry_func = _get_edge_queue(publisher, subscriber, entry_func) or entry_func
+
+        # Drop the frames which are not needed by the subscriber
+        max_frame_rate = getattr(component_class, "MAX_FRAME_RATE", None)
+        if publisher == base_keys.CAMERA_WIDGET and max_frame_rate:
+            entry_func = frame_governor.limit_rate(entry_func, max_frame_rate)
+
+        # Send websocket data only if the subscriber is interested in the datatype
+        supported_datatypes = None
+        if publisher == base_keys.WEBSOCKET_WIDGET:
+            supported_datatypes = _get_supported_datatype_keys(subscriber, supported_datatypes_of)
+
+        routes.append((subscriber, entry_func, supported_datatypes))
+
+    _logger.debug("Compiled routes of {publisher}: {subscribers}", publisher=publisher, subscribers=all_subscribers)
+
+    return tuple(routes)
+
+
+def get_max_frame_rate(publisher):
+    """
+    :return: the maximum frame rate (per second) needed by the subscribers of the publisher, or None if a subscriber
+        needs every frame
+    """
+    max_frame_rates = []
+    for subscriber in config_utility.get_config()[config_utility.CONFIGURATION_CHANNEL_PIPES_KEY].get(publisher, []):
+        max_frame_rate = getattr(endpoint_utility.get_component_class(subscriber), "MAX_FRAME_RATE", None)
+        if not max_frame_rate:
+            return None
+        max_frame_rates.append(max_frame_rate)
+
+    return max(max_frame_rates, default=None)
+
+
+def get_frame_variants(publisher):
+    """
+    :return: the names of the camera frame variants needed by the subscribers of the publisher (see frame_pyramid)
+    """
+    frame_variants = set()
+    for subscriber in config_utility.get_config()[config_utility.CONFIGURATION_CHANNEL_PIPES_KEY].get(publisher, []):
+        frame_variants.update(getattr(endpoint_utility.get_component_class(subscriber), "FRAME_VARIANTS", ()))
+
+    return frame_variants
+
+
+def reset_routing_table():
+    global _routing_table_version
+
+    _routing_table.clear()
+    _route_signatures.clear()
+    _datatype_routing_table.clear()
+    _routing_table_version = config_utility.get_config_version()
+
+
+def _remove_changed_routes():
+    global _routing_table_version
+
+    with config_utility.config_lock:
+        for publisher in list(_routing_table.keys()):
+            if _route_signatures.get(publisher) != _get_route_signature(publisher):
+                _logger.debug("Routes of {publisher} changed", publisher=publisher)
+                del _routing_table[publisher]
+                _route_signatures.pop(publisher, None)
+
+        # stop the edge queues of the removed publishers/subscribers
+        for name, edge_queue in list(_edge_queues.items()):
+            publisher, subscriber = name.split("->")
+            if config_utility.get_channel_edge(publisher, subscriber) is None:
+                edge_queue.stop()
+                del _edge_queues[name]
+
+        _routing_table_version = config_utility.get_config_version()
+
+
+def _get_route_signature(publisher):
+    # the routes must be compiled again if any of these changed
+    cfg = config_utility.get_config()
+    subscribers = cfg[config_utility.CONFIGURATION_CHANNEL_PIPES_KEY].get(publisher, [])
+
+    return (tuple(subscribers),
+            repr(cfg.get(config_utility.CONFIGURATION_CHANNEL_EDGES_KEY, {}).get(publisher)),
+            tuple((cfg[config_utility.CONFIGURATION_CHANNELS_ENTRYPOINTS_KEY].get(subscriber),
+                   cfg.get(config_utility.CONFIGURATION_CHANNELS_EXITPOINTS_KEY, {}).get(subscriber),
+                   config_utility.get_channel_executor(subscriber)) for subscriber in subscribers))
+
+
+def get_edge_queue_stats():
+    """
+    :return: the queue depth and drop counts of each edge queue in this process,
+        i.e., {"input:camera->processing:yolov8": {"depth": 1, "dropped": 10, ...}}
+    """
+    return {name: edge_queue.get_stats() for name, edge_queue in _edge_queues.items()}
+
+
+def _get_edge_queue(publisher, subscriber, entry_func):
+    name = f"{publisher}->{subscriber}"
+    edge = config_utility.get_channel_edge(publisher, subscriber)
+    edge_queue = _edge_queues.get(name)
+
+    if edge_queue is not None:
+        if edge is not None and edge_queue.entry_func == entry_func and \
+                edge_queue.queue_size == edge[config_utility.EDGE_CONFIGURATION_QUEUE_SIZE_KEY] and \
+                edge_queue.overflow == edge[config_utility.EDGE_CONFIGURATION_OVERFLOW_KEY]:
+            # reuse the running worker if the edge did not change
+            return edge_queue
+
+        edge_queue.stop()
+        del _edge_queues[name]
+
+    if edge is None:
+        return None
+
+    edge_queue = EdgeQueue(name, entry_func, edge[config_utility.EDGE_CONFIGURATION_QUEUE_SIZE_KEY],
+                           edge[config_utility.EDGE_CONFIGURATION_OVERFLOW_KEY]).start()
+    _edge_queues[name] = edge_queue
+
+    return edge_queue
+
+
+def _get_supported_datatype_keys(subscriber, supported_datatypes):
+    supported_datatype_keys = set()
+
+    for datatype in supported_datatypes:
+        if datatype not in datatypes_helper.DATATYPE_TO_KEY_MAP:
+            _logger.warning("Unknown datatype {datatype} supported by {subscriber}", datatype=datatype,
+                            subscriber=subscriber)
+            continue
+
+        supported_datatype_keys.add(datatypes_helper.get_key_by_name(datatype))
+
+    return frozenset(supported_datatype_keys)
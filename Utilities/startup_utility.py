@@ -0,0 +1,118 @@
+"""
+Warms up the components used by a process before it starts receiving data, so that the first frame/utterance does not
+pay for importing the component and loading its models (see `BaseComponent` subclasses' `__init__`).
+
+- Only the components referenced by the configuration (./Config/*.yaml) are imported.
+- The components used by the process of an input component are its (inline/thread) subscribers, transitively.
+    Components with the `process` executor are warmed up by their own process (see executor_utility).
+- The components are imported and instantiated in parallel worker threads (model loading mostly runs in native code,
+    which releases the GIL).
+- A timing report (one JSON line per component) is logged, and appended to `STARTUP_REPORT_FILE` if it is set.
+
+Disable with the environment variable `STARTUP_WARM_UP=false` (components are then created on their first message).
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from Utilities import config_utility, endpoint_utility, environment_utility, file_utility, logging_utility
+
+STARTUP_WARM_UP_ENV_KEY = "STARTUP_WARM_UP"
+STARTUP_REPORT_FILE_ENV_KEY = "STARTUP_REPORT_FILE"
+
+_MAX_WORKERS = 4
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+def is_enabled():
+    return environment_utility.get_env_variable_or_default(STARTUP_WARM_UP_ENV_KEY, "true").lower() == "true"
+
+
+def get_process_components(publisher):
+    '''
+
+    :param publisher: Format in configuration file, i.e., input:camera
+    :return: the components (in breadth-first order) which are instantiated in the process of the publisher
+    '''
+    pipes = config_utility.get_channel_pipes()
+    components = []
+    pending = list(pipes.get(publisher, []))
+
+    while pending:
+        component = pending.pop(0)
+        if component in components or component == publisher or \
+                config_utility.get_channel_executor(component) == config_utility.EXECUTOR_PROCESS:
+            continue
+
+        components.append(component)
+        pending.extend(pipes.get(component, []))
+
+    return components
+
+
+def warm_up_components(components, max_workers=_MAX_WORKERS):
+    """
+    Import and instantiate the components in parallel
+
+    :return: the timing report, i.e., [{"component": "processing:whisper", "import_seconds": 1.2,
+        "init_seconds": 5.3, "error": None}, ...]
+    """
+    if len(components) == 0:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(components)),
+                            thread_name_prefix="warm_up") as thread_pool:
+        return list(thread_pool.map(_warm_up_component, components))
+
+
+def warm_up_process(publisher):
+    """
+    Warm up the components used by the process of the publisher (if enabled), and write the timing report
+    """
+    if not is_enabled():
+        return []
+
+    start_time = time.perf_counter()
+    report = warm_up_components(get_process_components(publisher))
+    _logger.info("Warmed up {count} components for {publisher} in {seconds:.2f} s", count=len(report),
+                 publisher=publisher, seconds=time.perf_counter() - start_time)
+
+    write_report(publisher, report)
+
+    return report
+
+
+def write_report(publisher, report):
+    # not written by default, i.e., set it to a git-ignored file such as "logs/startup_report.jsonl"
+    report_file = environment_utility.get_env_variable_or_default(STARTUP_REPORT_FILE_ENV_KEY, None)
+
+    lines = ""
+    for component_report in report:
+        _logger.info("Startup of {component}: import {import_seconds:.2f} s, init {init_seconds:.2f} s",
+                     component=component_report["component"], import_seconds=component_report["import_seconds"],
+                     init_seconds=component_report["init_seconds"])
+        lines += json.dumps({"publisher": publisher, "pid": os.getpid(), **component_report}) + "\n"
+
+    if lines and report_file:
+        file_utility.append_data(report_file, lines)
+
+
+def _warm_up_component(component):
+    component_report = {"component": component, "import_seconds": 0.0, "init_seconds": 0.0, "error": None}
+
+    try:
+        start_time = time.perf_counter()
+        endpoint_utility.get_component_class(component)
+        component_report["import_seconds"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        endpoint_utility.get_component_instance(component)
+        component_report["init_seconds"] = time.perf_counter() - start_time
+    except Exception as error:
+        # the component is created again on its first message
+        _logger.exception("Error warming up {component}", component=component)
+        component_report["error"] = str(error)
+
+    return component_report
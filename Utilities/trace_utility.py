@@ -0,0 +1,181 @@
+"""
+Tracing of the messages between components, enabled with the environment variable `TRACE_ENABLED=true`.
+
+Each message sent by `BaseComponent.send_to_component` carries a trace (base_keys.TRACE_KEY):
+    (trace_id, ((component, monotonic_ns), ...)), i.e., the components which sent the message (hops) and when.
+A message built without base_data continues the trace of the message being handled by the component (if any).
+
+The entry functions of the subscribers are wrapped (see routing_utility and executor_utility) to keep rolling windows
+of the latest latencies:
+    - edge, i.e., "input:camera->processing:yolov8": from sending the message to the start of the entry function
+    - component, i.e., "processing:yolov8": the duration of the entry function
+    - end-to-end, i.e., "input:camera=>output:websocket": from the first hop to the end of the entry function of a
+        sink (a component without subscribers)
+
+The windows of each process are published to the shared memory, and the percentiles (p50/p95/p99) of all processes
+can be printed while the server is running: `python -m Utilities.trace_utility`. A process other than the server must
+attach to the shared memory with `Memory.attach_shared_memory()` before `get_published_latency_stats`, so that the
+segments of the server are not unlinked when it exits.
+"""
+
+import itertools
+import os
+import threading
+import time
+from collections import deque
+import numpy as np
+import base_keys
+from Memory import Memory
+from Utilities import config_utility, environment_utility
+
+TRACE_ENABLED_ENV_KEY = "TRACE_ENABLED"
+
+_WINDOW_SIZE = 1000
+_PUBLISH_INTERVAL_NS = 1000 * 1000 * 1000  # 1 second
+_SHARED_MEMORY_KEY_PREFIX = "trace:"
+_PERCENTILES = [50, 95, 99]
+
+_enabled = None
+_trace_ids = itertools.count(1)
+# latency key -> deque of the latest latencies (ns), per process
+_latency_windows = {}
+_last_publish_ns = 0
+# component -> (entry_func, traced_entry_func)
+_traced_entry_funcs = {}
+# the trace of the message being handled by the current thread
+_current = threading.local()
+
+
+def is_enabled():
+    global _enabled
+    if _enabled is None:
+        _enabled = environment_utility.get_env_variable_or_default(TRACE_ENABLED_ENV_KEY, "false").lower() == "true"
+    return _enabled
+
+
+def add_hop(message, component):
+    """
+    Stamp the message as sent by the component (now), starting a new trace if the message does not continue one
+    """
+    trace = message.get(base_keys.TRACE_KEY) or getattr(_current, "trace", None)
+    now = time.monotonic_ns()
+
+    if trace is None:
+        message[base_keys.TRACE_KEY] = ((os.getpid() << 32) | next(_trace_ids), ((component, now),))
+    else:
+        message[base_keys.TRACE_KEY] = (trace[0], trace[1] + ((component, now),))
+
+
+def trace_entry_func(component, entry_func):
+    '''
+
+    :param component: Format in configuration file, i.e., processing:yolov8
+    :param entry_func: the bound entry function of the component instance
+    :return: the entry function which records the latencies of the traced messages, or entry_func if not enabled
+    '''
+    if not is_enabled():
+        return entry_func
+
+    traced = _traced_entry_funcs.get(component)
+    if traced is not None and traced[0] == entry_func:
+        return traced[1]
+
+    is_sink = not config_utility.get_config()[config_utility.CONFIGURATION_CHANNEL_PIPES_KEY].get(component)
+
+    def traced_entry_func(message):
+        trace = message.get(base_keys.TRACE_KEY) if isinstance(message, dict) else None
+        if trace is None:
+            return entry_func(message)
+
+        start = time.monotonic_ns()
+        publisher, sent = trace[1][-1]
+        record_latency(f"{publisher}->{component}", start - sent)
+
+        previous_trace = getattr(_current, "trace", None)
+        _current.trace = trace
+        try:
+            return entry_func(message)
+        finally:
+            _current.trace = previous_trace
+
+            end = time.monotonic_ns()
+            record_latency(component, end - start)
+            if is_sink:
+                source, started = trace[1][0]
+                record_latency(f"{source}=>{component}", end - started)
+
+    _traced_entry_funcs[component] = (entry_func, traced_entry_func)
+
+    return traced_entry_func
+
+
+def record_latency(key, latency_ns):
+    global _last_publish_ns
+
+    window = _latency_windows.get(key)
+    if window is None:
+        window = _latency_windows.setdefault(key, deque(maxlen=_WINDOW_SIZE))
+    window.append(latency_ns)
+
+    now = time.monotonic_ns()
+    if now - _last_publish_ns > _PUBLISH_INTERVAL_NS:
+        _last_publish_ns = now
+        publish_latencies()
+
+
+def publish_latencies():
+    """
+    Save the latency windows of this process to the shared memory
+    """
+    latencies = {key: np.array(window, dtype=np.int64) for key, window in list(_latency_windows.items())}
+    Memory.update_shared_memory_item(f"{_SHARED_MEMORY_KEY_PREFIX}{os.getpid()}", latencies)
+
+
+def get_latency_stats(latencies=None):
+    """
+    :param latencies: {key: array of latencies (ns)}, or None for the latency windows of this process
+    :return: {key: {"count": int, "p50": ms, "p95": ms, "p99": ms}}
+    """
+    if latencies is None:
+        latencies = {key: np.array(window, dtype=np.int64) for key, window in list(_latency_windows.items())}
+
+    latency_stats = {}
+    for key, values in latencies.items():
+        if len(values) == 0:
+            continue
+
+        percentiles = np.percentile(values, _PERCENTILES) / 1e6
+        latency_stats[key] = {"count": len(values)}
+        latency_stats[key].update({f"p{p}": float(value) for p, value in zip(_PERCENTILES, percentiles)})
+
+    return latency_stats
+
+
+def get_published_latency_stats():
+    """
+    :return: the latency stats (see get_latency_stats) of all processes, from the shared memory
+    """
+    shared_memory = Memory.get_shared_memory()
+    latencies = {}
+
+    for memory_key in list(shared_memory.keys()):
+        if not memory_key.startswith(_SHARED_MEMORY_KEY_PREFIX):
+            continue
+
+        for key, values in (shared_memory.get(memory_key) or {}).items():
+            latencies.setdefault(key, []).append(values)
+
+    return get_latency_stats({key: np.concatenate(values) for key, values in latencies.items()})
+
+
+def format_latency_stats(latency_stats):
+    lines = [f"{'latency (ms)':<60} {'count':>7} {'p50':>9} {'p95':>9} {'p99':>9}"]
+    for key in sorted(latency_stats):
+        stats = latency_stats[key]
+        lines.append(f"{key:<60} {stats['count']:>7} {stats['p50']:>9.2f} {stats['p95']:>9.2f} {stats['p99']:>9.2f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    Memory.attach_shared_memory()
+    print(format_latency_stats(get_published_latency_stats()))
@@ -4,25 +4,52 @@
 
 
 from __future__ import absolute_import
-from threading import Thread
-from queue import Queue
+import time
+from collections import deque
+from threading import Condition, Thread
 import cv2
+import numpy as np
 from Utilities import logging_utility
 
 _logger = logging_utility.setup_logger(__name__)
 
 
+class VideoStreamStoppedException(Exception):
+    """
+    Exception raised when reading a stream which is stopped (i.e., ended or failed), and has no unread frame left
+    """
+
+
 class VideoStream:
     """
-    This class reads all the video frames in a separate thread and always has the keeps only the latest frame in its
-    queue to be grabbed by another thread
+    This class reads all the video frames in a separate thread and always keeps only the latest frame (in a single
+    slot) to be grabbed by another thread
+
+    The frames are decoded into a pool of preallocated buffers, so reading a frame does not allocate memory while
+    there are free buffers. A buffer is owned by the consumer once its frame is read, and only reused after the
+    consumer returns it with `release` (i.e., once the frame was copied or skipped), so a frame returned by `read` is
+    never overwritten. The buffer of a frame replaced before being read goes back to the pool.
+
+    Each frame has a sequence number (from 1) and a capture timestamp (time.time()). A frame replaced by a newer one
+    before being read is counted as dropped.
     """
 
-    def __init__(self, path, queueSize=3):
+    def __init__(self, path, buffer_count=4):
         _logger.info("=======================\r\nVideoStream::__init__()")
         self.stream = cv2.VideoCapture(path)
         self.stopped = False
-        self.Q = Queue(maxsize=queueSize)
+        self.condition = Condition()
+
+        # latest frame
+        self.frame = None
+        self.sequence = 0
+        self.timestamp = None
+
+        self.read_sequence = 0  # sequence number of the last frame read
+        self.dropped_count = 0
+
+        self.buffer_count = buffer_count
+        self.free_buffers = deque(self.__allocate_buffers())
 
     def start(self):
         # start a thread to read frames from the video stream
@@ -33,35 +60,107 @@ class VideoStream:
 
     def update(self):
         try:
-            while True:
-                if self.stopped:
+            while not self.stopped:
+                with self.condition:
+                    buffer = self.free_buffers.popleft() if self.free_buffers else None
+
+                # the frame is decoded in a new array if there is no free buffer (or it has another shape)
+                (grabbed, frame) = self.stream.read(image=buffer)
+                timestamp = time.time()
+
+                # if the `grabbed` boolean is `False`, then we have
+                # reached the end of the video file
+                if not grabbed:
+                    with self.condition:
+                        self.__free_buffer(buffer)
+                    self.stop()
                     return
 
-                if not self.Q.full():
-                    (grabbed, frame) = self.stream.read()
+                with self.condition:
+                    if self.sequence > self.read_sequence:
+                        self.dropped_count += 1
+                        # it was never read, so it is not used elsewhere
+                        self.__free_buffer(self.frame)
 
-                    # if the `grabbed` boolean is `False`, then we have
-                    # reached the end of the video file
-                    if not grabbed:
-                        self.stop()
-                        return
-
-                    self.Q.put(frame)
-
-                    # Clean the queue to keep only the latest frame
-                    while self.Q.qsize() > 1:
-                        self.Q.get()
+                    self.frame = frame
+                    self.sequence += 1
+                    self.timestamp = timestamp
+                    self.condition.notify_all()
         except Exception:
             _logger.exception("Failed to read stream")
+            self.stop()
+
+    def read(self, timeout=None):
+        '''
+        Wait for a frame which was not read yet
+
+        :param timeout: maximum time to wait (in seconds), or None to wait until a frame is captured
+        :return: the latest frame, or None if there is no new frame before the timeout
+        :raises VideoStreamStoppedException: if the stream is stopped (and all its frames were read)
+        '''
+        return self.read_frame(timeout)[0]
+
+    def read_frame(self, timeout=None):
+        '''
+        :return: (frame, sequence number, capture timestamp) of the latest frame which was not read yet,
+            or (None, None, None) as for `read`
+        :raises VideoStreamStoppedException: as for `read`
+        '''
+        with self.condition:
+            self.condition.wait_for(lambda: self.sequence > self.read_sequence or self.stopped, timeout)
+            if self.sequence == self.read_sequence:
+                if self.stopped:
+                    raise VideoStreamStoppedException()
+                return None, None, None
 
-    def read(self):
-        return self.Q.get()
+            self.read_sequence = self.sequence
+            return self.frame, self.sequence, self.timestamp
+
+    def release(self, frame):
+        '''
+        Return the buffer of a frame read from the stream to the pool, once the frame is not used anymore (i.e., it
+        was copied to the frame store, or skipped), so that the next frames are decoded into it
+        '''
+        with self.condition:
+            self.__free_buffer(frame)
 
     def more(self):
-        return self.Q.qsize() > 0
+        return self.sequence > self.read_sequence
+
+    def get_stats(self):
+        with self.condition:
+            return {
+                "sequence": self.sequence,
+                "timestamp": self.timestamp,
+                "dropped": self.dropped_count,
+                "free_buffers": len(self.free_buffers),
+                "stopped": self.stopped,
+            }
 
     def stop(self):
-        self.stopped = True
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    def __allocate_buffers(self):
+        width = int(self.stream.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(self.stream.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+        # the frame size is unknown until the first frame (the pool is filled by the released frames)
+        if width <= 0 or height <= 0:
+            return []
+
+        return [np.empty((height, width, 3), dtype=np.uint8) for _ in range(self.buffer_count)]
+
+    def __free_buffer(self, buffer):
+        if buffer is None or len(self.free_buffers) >= self.buffer_count:
+            return
+
+        # a buffer released twice would be decoded into by two frames
+        if any(free_buffer is buffer for free_buffer in self.free_buffers):
+            return
+
+        self.free_buffers.append(buffer)
 
     def __exit__(self, exception_type, exception_value, traceback):
         self.stream.release()
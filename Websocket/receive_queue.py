@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import deque
+from DataFormat import datatypes_helper
+from Utilities import logging_utility
+
+_STATS_LOG_INTERVAL_SECONDS = 10
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+class TokenBucket:
+    """
+    Allows `rate` messages per second on average, and bursts of up to `burst` messages
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst if burst else max(rate, 1)
+        self.tokens = self.burst
+        self.last_time = time.monotonic()
+
+    def try_acquire(self, now=None):
+        now = now if now is not None else time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_time) * self.rate)
+        self.last_time = now
+
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
+
+
+class ReceiveLimiter:
+    """
+    Limits the rate of the messages received from one websocket connection, per connection and per datatype (token
+    buckets), so that a client streaming too fast does not fill the receive queue. The throttled messages are dropped.
+
+    NOTE: All the methods must be called from the event loop of the socket server.
+    """
+
+    def __init__(self, websocket_client_type, rate=0, burst=0, datatype_rates=None):
+        '''
+        :param rate: maximum messages per second of the connection (0: unlimited)
+        :param burst: maximum messages received at once (0: one second of the rate)
+        :param datatype_rates: maximum messages per second of each datatype key, e.g., {2001: 60}
+        '''
+        self.websocket_client_type = websocket_client_type
+        self.bucket = TokenBucket(rate, burst) if rate > 0 else None
+        self.datatype_buckets = {datatype: TokenBucket(datatype_rate)
+                                 for datatype, datatype_rate in (datatype_rates or {}).items() if datatype_rate > 0}
+
+        self.received_count = 0
+        self.throttled_count = 0
+        self.last_stats_log_time = time.monotonic()
+        self.last_logged_throttled_count = 0
+
+    def allow(self, raw_data):
+        '''
+        :return: whether the received data can be put in the receive queue (otherwise it is throttled)
+        '''
+        self.received_count += 1
+        now = time.monotonic()
+
+        if self.datatype_buckets:
+            datatype_bucket = self.datatype_buckets.get(datatypes_helper.get_websocket_datatype(raw_data))
+            if datatype_bucket is not None and not datatype_bucket.try_acquire(now):
+                self.__throttle(now)
+                return False
+
+        if self.bucket is not None and not self.bucket.try_acquire(now):
+            self.__throttle(now)
+            return False
+
+        return True
+
+    def get_stats(self):
+        return {
+            "received": self.received_count,
+            "throttled": self.throttled_count,
+        }
+
+    def __throttle(self, now):
+        self.throttled_count += 1
+
+        if now - self.last_stats_log_time < _STATS_LOG_INTERVAL_SECONDS:
+            return
+
+        self.last_stats_log_time = now
+        _logger.warning("Throttled {count} websocket messages of {client_type} client",
+                        count=self.throttled_count - self.last_logged_throttled_count,
+                        client_type=self.websocket_client_type)
+        self.last_logged_throttled_count = self.throttled_count
+
+
+class ReceiveQueue:
+    """
+    Bounded queue of the messages received from the websocket connections, which is filled by the event loop of the
+    socket server and read by the websocket widget (thread-safe).
+
+    Each source (connection) has its own FIFO, and the messages are read from the sources in turn (round-robin), so a
+    client sending many messages does not delay the messages of the other clients. If the queue is full, the oldest
+    message of the source with the most pending messages is dropped.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.pending = {}  # source -> deque of its messages
+        self.ready_sources = deque()  # sources with pending messages, in reading order
+        self.size = 0
+        self.dropped_counts = {}  # source -> number of dropped messages
+        self.condition = threading.Condition()
+
+    def put(self, source, data):
+        with self.condition:
+            if self.size >= self.max_size:
+                self.__drop_from_longest()
+
+            source_pending = self.pending.get(source)
+            if source_pending is None:
+                source_pending = self.pending[source] = deque()
+                self.ready_sources.append(source)
+
+            source_pending.append(data)
+            self.size += 1
+            self.condition.notify()
+
+    def get(self, timeout=None):
+        '''
+        :param timeout: maximum time to wait (in seconds), or None to wait until a message is put
+        :return: the next message, or None if no message was put before the timeout
+        '''
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.size > 0, timeout):
+                return None
+
+            source = self.ready_sources.popleft()
+            source_pending = self.pending[source]
+            data = source_pending.popleft()
+            self.size -= 1
+
+            if source_pending:
+                self.ready_sources.append(source)
+            else:
+                del self.pending[source]
+
+            return data
+
+    def qsize(self):
+        return self.size
+
+    def get_stats(self, source):
+        with self.condition:
+            return {
+                "receive_depth": len(self.pending.get(source, ())),
+                "receive_dropped": self.dropped_counts.get(source, 0),
+            }
+
+    def remove_stats(self, source):
+        '''
+        Forget the dropped count of the source (e.g., disconnected), its pending messages are still read
+        '''
+        with self.condition:
+            self.dropped_counts.pop(source, None)
+
+    def __drop_from_longest(self):
+        source = max(self.pending, key=lambda pending_source: len(self.pending[pending_source]))
+        source_pending = self.pending[source]
+        source_pending.popleft()
+        self.size -= 1
+        self.dropped_counts[source] = self.dropped_counts.get(source, 0) + 1
+
+        if not source_pending:
+            del self.pending[source]
+            self.ready_sources.remove(source)
@@ -0,0 +1,167 @@
+import asyncio
+import time
+from collections import deque
+from Utilities import logging_utility
+
+SEND_OVERFLOW_DROP_OLDEST = "drop-oldest"
+SEND_OVERFLOW_COALESCE = "coalesce"
+SEND_OVERFLOW_DISCONNECT = "disconnect"
+SEND_OVERFLOWS = [SEND_OVERFLOW_DROP_OLDEST, SEND_OVERFLOW_COALESCE, SEND_OVERFLOW_DISCONNECT]
+
+_LAGGING_CLOSE_CODE = 1013  # try again later
+_STATS_LOG_INTERVAL_SECONDS = 10
+
+_logger = logging_utility.setup_logger(__name__)
+
+
+class SendQueue:
+    """
+    Sends the messages to one websocket connection through a bounded queue, which is consumed by its own writer task
+    (in the event loop of the socket server). Thus, a slow client does not delay the messages sent to the other clients.
+
+    Overflow policies (when the queue is full):
+    - drop-oldest: the oldest pending message is dropped
+    - coalesce: the pending message with the same datatype is dropped (otherwise the oldest pending message)
+    - disconnect: as drop-oldest, but the client is disconnected if its oldest pending message is older than the
+        maximum lag
+
+    A message put with `coalesce` replaces the pending message of the same datatype (keeping its position in the
+    queue), so only the latest value of a high-frequency datatype is pending per client (see DataTypes.json).
+
+    NOTE: All the methods must be called from the event loop of the socket server.
+    """
+
+    def __init__(self, websocket, websocket_client_type, queue_size, overflow=SEND_OVERFLOW_DROP_OLDEST,
+                 max_lag_seconds=None, on_close=None):
+        self.websocket = websocket
+        self.websocket_client_type = websocket_client_type
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.max_lag_seconds = max_lag_seconds
+        self.on_close = on_close
+
+        self.queue = deque()  # [datatype, data, put time]
+        self.coalesced = {}  # datatype -> pending entry of the queue
+        self.ready = asyncio.Event()
+        self.writer = None
+        self.closed = False
+
+        self.sent_count = 0
+        self.dropped_count = 0
+        self.coalesced_count = 0
+        self.max_depth = 0
+        self.last_stats_log_time = time.monotonic()
+        self.last_logged_dropped_count = 0
+
+    def start(self):
+        self.writer = asyncio.get_running_loop().create_task(self.write())
+        return self
+
+    def put(self, data, datatype=None, coalesce=False):
+        if self.closed:
+            return
+
+        if coalesce and datatype in self.coalesced:
+            self.coalesced[datatype][1] = data
+            self.coalesced_count += 1
+            return
+
+        now = time.monotonic()
+        if self.overflow == SEND_OVERFLOW_DISCONNECT and self.get_lag_seconds(now) > self.max_lag_seconds:
+            _logger.warning("Disconnecting lagging websocket client: {stats}", stats=self.get_stats())
+            self.close(disconnect=True)
+            return
+
+        if len(self.queue) >= self.queue_size:
+            self.dropped_count += 1
+            self.__drop_pending(datatype)
+
+        entry = [datatype, data, now]
+        self.queue.append(entry)
+        if coalesce:
+            self.coalesced[datatype] = entry
+        self.max_depth = max(self.max_depth, len(self.queue))
+        self.ready.set()
+
+    async def write(self):
+        try:
+            while not self.closed:
+                if not self.queue:
+                    self.ready.clear()
+                    await self.ready.wait()
+                    continue
+
+                _, data, _ = self.__pop_pending()
+                await self.websocket.send(data)
+                self.sent_count += 1
+                _logger.debug("{current_time}, sent, websocket_client_type: {client_type}",
+                              current_time=int(time.time() * 1000), client_type=self.websocket_client_type)
+                self.__log_stats_if_dropped()
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            _logger.exception("Error sending data to websocket")
+            self.close()
+
+    def get_lag_seconds(self, now=None):
+        '''
+        :return: the time since the oldest pending message was put in the queue
+        '''
+        if not self.queue:
+            return 0
+        return (now or time.monotonic()) - self.queue[0][2]
+
+    def get_stats(self):
+        return {
+            "websocket_client_type": self.websocket_client_type,
+            "remote_address": getattr(self.websocket, "remote_address", None),
+            "depth": len(self.queue),
+            "max_depth": self.max_depth,
+            "queue_size": self.queue_size,
+            "overflow": self.overflow,
+            "lag_seconds": self.get_lag_seconds(),
+            "sent": self.sent_count,
+            "dropped": self.dropped_count,
+            "coalesced": self.coalesced_count,
+        }
+
+    def close(self, disconnect=False):
+        if self.closed:
+            return
+
+        self.closed = True
+        self.queue.clear()
+        self.coalesced.clear()
+        self.ready.set()
+
+        if disconnect:
+            asyncio.get_running_loop().create_task(self.websocket.close(_LAGGING_CLOSE_CODE, "lagging"))
+        if self.on_close is not None:
+            self.on_close(self)
+
+    def __pop_pending(self):
+        entry = self.queue.popleft()
+        if self.coalesced.get(entry[0]) is entry:
+            del self.coalesced[entry[0]]
+        return entry
+
+    def __drop_pending(self, datatype):
+        if self.overflow == SEND_OVERFLOW_COALESCE and datatype is not None:
+            for index, entry in enumerate(self.queue):
+                if entry[0] == datatype:
+                    del self.queue[index]
+                    if self.coalesced.get(datatype) is entry:
+                        del self.coalesced[datatype]
+                    return
+
+        self.__pop_pending()
+
+    def __log_stats_if_dropped(self):
+        now = time.monotonic()
+        if now - self.last_stats_log_time < _STATS_LOG_INTERVAL_SECONDS:
+            return
+
+        self.last_stats_log_time = now
+        if self.dropped_count != self.last_logged_dropped_count:
+            self.last_logged_dropped_count = self.dropped_count
+            _logger.warning("Websocket send queue stats: {stats}", stats=self.get_stats())
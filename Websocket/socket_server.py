@@ -1,39 +1,70 @@
 ﻿import asyncio
 import threading
 import time
-from asyncio import Queue
 from urllib.parse import urlparse, parse_qs
 import websockets
+from DataFormat import datatypes_helper
 from Utilities import environment_utility, logging_utility
+from Websocket.receive_queue import ReceiveLimiter, ReceiveQueue
+from Websocket.send_queue import SendQueue, SEND_OVERFLOW_DROP_OLDEST
 from base_keys import WEBSOCKET_CLIENT_TYPE
 
 _SERVER_IP = environment_utility.get_env_variable_or_default("SERVER_IP", "")
 _SERVER_PORT = environment_utility.get_env_int("SERVER_PORT")
 
-_CONNECTIONS = set()
-_rx_queue = Queue()
-loop = None
+# outbound queue of each connection (see send_queue.py)
+_SEND_QUEUE_SIZE = int(environment_utility.get_env_variable_or_default("WEBSOCKET_SEND_QUEUE_SIZE", "64"))
+_SEND_OVERFLOW = environment_utility.get_env_variable_or_default("WEBSOCKET_SEND_OVERFLOW", SEND_OVERFLOW_DROP_OLDEST)
+_SEND_MAX_LAG_SECONDS = float(environment_utility.get_env_variable_or_default("WEBSOCKET_SEND_MAX_LAG_SECONDS", "5"))
+
+# inbound messages of all the connections (see receive_queue.py), rates in messages per second (0: unlimited)
+_RECEIVE_QUEUE_SIZE = int(environment_utility.get_env_variable_or_default("WEBSOCKET_RECEIVE_QUEUE_SIZE", "1024"))
+_RECEIVE_RATE = float(environment_utility.get_env_variable_or_default("WEBSOCKET_RECEIVE_RATE", "0"))
+_RECEIVE_BURST = float(environment_utility.get_env_variable_or_default("WEBSOCKET_RECEIVE_BURST", "0"))
+# per datatype of a connection, e.g., "GAZE_POINTING_DATA:120,FINGER_POINTING_DATA:60"
+_RECEIVE_DATATYPE_RATES = environment_utility.get_env_variable_or_default("WEBSOCKET_RECEIVE_DATATYPE_RATES", "")
 
 _logger = logging_utility.setup_logger(__name__)
 
 
+def _parse_datatype_rates(datatype_rates):
+    '''
+    :return: the rate of each datatype key, e.g., "GAZE_POINTING_DATA:120" -> {2001: 120.0}
+    '''
+    rates = {}
+    for datatype_rate in filter(None, (item.strip() for item in datatype_rates.split(","))):
+        datatype_name, _, rate = datatype_rate.partition(":")
+        try:
+            rates[datatypes_helper.get_key_by_name(datatype_name.strip())] = float(rate)
+        except (KeyError, ValueError):
+            _logger.error("Invalid websocket receive rate of datatype: {datatype_rate}", datatype_rate=datatype_rate)
+
+    return rates
+
+
+_CONNECTIONS = set()
+_CLIENT_TYPE_CONNECTIONS = {}  # websocket_client_type (None if not given) -> {connection: send queue}
+_RECEIVE_LIMITERS = {}  # connection -> receive limiter
+_DATATYPE_RATES = _parse_datatype_rates(_RECEIVE_DATATYPE_RATES)
+_rx_queue = ReceiveQueue(_RECEIVE_QUEUE_SIZE)  # thread-safe, filled by the event loop and read by the websocket widget
+loop = None
+
+
 # references: https://websockets.readthedocs.io/en/stable/reference/server.html , https://pypi.org/project/websockets/
 async def receive_data_from_websocket(websocket):
-    global _rx_queue, _CONNECTIONS
+    websocket_client_type = _get_client_type(websocket)
+    _add_connection(websocket, websocket_client_type)
+    _logger.debug("New websocket connection:: type: {type}, total: {num_connections}", type=websocket_client_type,
+                  num_connections=len(_CONNECTIONS))
 
-    _CONNECTIONS.add(websocket)
-    _logger.debug("New websocket connection:: total: {num_connections}", num_connections=len(_CONNECTIONS))
+    receive_limiter = _RECEIVE_LIMITERS[websocket]
 
     try:
-        headers = websocket.request_headers
-        websocket_client_type = headers.get(WEBSOCKET_CLIENT_TYPE)
-
-        if websocket_client_type is None:
-            query_params = parse_qs(urlparse(websocket.path).query)
-            websocket_client_type = query_params.get("websocket_client_type", [None])[0]
-
         async for rx_data in websocket:
-            _rx_queue.put_nowait(rx_data)
+            if not receive_limiter.allow(rx_data):
+                continue
+
+            _rx_queue.put(websocket, rx_data)
             current_time = int(time.time() * 1000)
             _logger.debug("{curr_time}, received, websocket_client_type: {type}", curr_time=current_time,
                           type=websocket_client_type)
@@ -41,10 +72,90 @@ async def receive_data_from_websocket(websocket):
     except Exception:
         _logger.exception("Error receiving data from websocket")
     finally:
-        _CONNECTIONS.remove(websocket)
+        _remove_connection(websocket, websocket_client_type)
         _logger.warn("Websocket disconnection total: {num_connections}", num_connections=len(_CONNECTIONS))
 
 
+def _get_client_type(websocket):
+    websocket_client_type = websocket.request_headers.get(WEBSOCKET_CLIENT_TYPE)
+
+    if websocket_client_type is None:
+        query_params = parse_qs(urlparse(websocket.path).query)
+        websocket_client_type = query_params.get("websocket_client_type", [None])[0]
+
+    return websocket_client_type
+
+
+def _add_connection(websocket, websocket_client_type):
+    send_queue = SendQueue(websocket, websocket_client_type, _SEND_QUEUE_SIZE, _SEND_OVERFLOW, _SEND_MAX_LAG_SECONDS,
+                           on_close=lambda _: _remove_connection(websocket, websocket_client_type))
+
+    _CONNECTIONS.add(websocket)
+    _CLIENT_TYPE_CONNECTIONS.setdefault(websocket_client_type, {})[websocket] = send_queue.start()
+    _RECEIVE_LIMITERS[websocket] = ReceiveLimiter(websocket_client_type, _RECEIVE_RATE, _RECEIVE_BURST,
+                                                  _DATATYPE_RATES)
+
+
+def _remove_connection(websocket, websocket_client_type):
+    _CONNECTIONS.discard(websocket)
+    _RECEIVE_LIMITERS.pop(websocket, None)
+    _rx_queue.remove_stats(websocket)
+
+    client_type_connections = _CLIENT_TYPE_CONNECTIONS.get(websocket_client_type, {})
+    send_queue = client_type_connections.pop(websocket, None)
+    if not client_type_connections:
+        _CLIENT_TYPE_CONNECTIONS.pop(websocket_client_type, None)
+
+    if send_queue is not None:
+        send_queue.close()
+        send_queue.writer.cancel()
+
+
+def get_connections(websocket_client_type=None):
+    '''
+    :param websocket_client_type: e.g., base_keys.UNITY_CLIENT, or None for all the connections
+    :return: a copy of the connections (of the client type)
+    '''
+    if websocket_client_type is None:
+        return set(_CONNECTIONS)
+
+    return set(_CLIENT_TYPE_CONNECTIONS.get(websocket_client_type, ()))
+
+
+def get_connection_counts():
+    '''
+    :return: the number of connections per client type, e.g., {"unity": 1, "dashboard": 2}
+    '''
+    return {client_type: len(connections) for client_type, connections in list(_CLIENT_TYPE_CONNECTIONS.items())}
+
+
+def get_client_stats():
+    '''
+    :return: the stats of the outbound queue and of the received messages of each connection, i.e.,
+        [{"websocket_client_type": "unity", "depth": 2, "dropped": 10, "lag_seconds": 0.1, ..., "received": 100,
+        "throttled": 5, "receive_depth": 1, "receive_dropped": 0}, ...]
+    '''
+    client_stats = []
+    for connections in list(_CLIENT_TYPE_CONNECTIONS.values()):
+        for websocket, send_queue in list(connections.items()):
+            stats = send_queue.get_stats()
+            receive_limiter = _RECEIVE_LIMITERS.get(websocket)
+            if receive_limiter is not None:
+                stats.update(receive_limiter.get_stats())
+            stats.update(_rx_queue.get_stats(websocket))
+            client_stats.append(stats)
+
+    return client_stats
+
+
+def _get_send_queues(websocket_client_type=None):
+    if websocket_client_type is not None:
+        return list(_CLIENT_TYPE_CONNECTIONS.get(websocket_client_type, {}).values())
+
+    return [send_queue for connections in list(_CLIENT_TYPE_CONNECTIONS.values())
+            for send_queue in list(connections.values())]
+
+
 # Broadcast message to all websocket clients.
 def broadcastmsg(msg):
     websockets.broadcast(_CONNECTIONS, msg)
@@ -73,54 +184,49 @@ def stop_server():
     pass
 
 
-async def send_data_to_websockets(data, websocket_client_type=None):
-    global _CONNECTIONS
+async def send_data_to_websockets(data, websocket_client_type=None, datatype=None, coalesce=False):
+    put_data(data, websocket_client_type, datatype, coalesce)
 
-    exclude_list = set()
-    for _websocket in _CONNECTIONS:
-        try:
-            headers = _websocket.request_headers
-            curr_client_type = headers.get(WEBSOCKET_CLIENT_TYPE)
 
-            if curr_client_type is None:
-                query_params = parse_qs(urlparse(_websocket.path).query)
-                curr_client_type = query_params.get("websocket_client_type", [None])[0]
+def put_data(data, websocket_client_type=None, datatype=None, coalesce=False):
+    '''
+    Put the data in the outbound queue of each connection (of the client type), to be sent by its writer task
+    NOTE: Must be called from the event loop of the socket server (see send_data)
 
-            if (websocket_client_type is not None) and (curr_client_type != websocket_client_type):
-                continue
+    :param datatype: datatype key of the data, used to coalesce the pending messages (see send_queue.py)
+    :param coalesce: whether the data replaces the pending message of the same datatype (if any)
+    '''
+    # only the connections of the client type are used (the client type is found when connecting)
+    for send_queue in _get_send_queues(websocket_client_type):
+        send_queue.put(data, datatype, coalesce)
 
-            await _websocket.send(data)
-            current_time = int(time.time() * 1000)
-            _logger.debug("{current_time}, sent, websocket_client_type: {curr_client_type}", current_time=current_time,
-                          curr_client_type=curr_client_type)
-        except Exception:
-            _logger.exception("Error sending data to websocket")
-            exclude_list.add(_websocket)
     if isinstance(data, str):
         _logger.debug("Sent data: {data}", data=data)
     else:
         _logger.debug("Sent data: {len} bytes", len=len(data))
-        _CONNECTIONS -= exclude_list
 
 
-def send_data(data, websocket_client_type=None):
-    global loop
+def send_data(data, websocket_client_type=None, datatype=None, coalesce=False):
     if loop and loop.is_running():
-        _logger.debug("loop is running")
-        asyncio.run_coroutine_threadsafe(send_data_to_websockets(data, websocket_client_type), loop)
+        loop.call_soon_threadsafe(put_data, data, websocket_client_type, datatype, coalesce)
     else:
-        asyncio.run(send_data_to_websockets(data, websocket_client_type))
-        _logger.warning("loop is none or loop is not running")
+        _logger.warning("loop is none or loop is not running, data is not sent")
+
 
+def receive_data(timeout=None):
+    '''
+    Wait for the next data received from the websocket clients
 
-def receive_data():
-    global _rx_queue
-    if _rx_queue.empty():
+    :param timeout: maximum time to wait (in seconds), or None to wait until data is received
+    :return: the received data, or None if no data was received before the timeout
+    '''
+    data = _rx_queue.get(timeout=timeout)
+    if data is None:
         return None
 
     _logger.debug("rx_size: {queue_size}", queue_size=_rx_queue.qsize())
 
-    return _rx_queue.get_nowait()
+    return data
 
 
 server_thread = None
@@ -1,9 +1,19 @@
+import time
 import cv2
 
 import base_keys
 from base_component import BaseComponent
-from Utilities.video_stream import VideoStream
-from Utilities import environment_utility, time_utility, file_utility, logging_utility
+from Utilities.frame_governor import FrameGovernor
+from Utilities.frame_pyramid import FramePyramid
+from Utilities.video_stream import VideoStream, VideoStreamStoppedException
+from Utilities import environment_utility, time_utility, file_utility, logging_utility, routing_utility
+
+_DEFAULT_LATENCY_TARGET_MILLIS = 100
+_STREAM_READ_TIMEOUT_SECONDS = 5
+_STREAM_RECONNECT_DELAY_SECONDS = 1
+# playback speed of a video file: 1 (native FPS), a multiple of it, or 0 (as fast as the subscribers accept frames)
+_DEFAULT_VIDEO_FILE_SPEED = 1
+_DEFAULT_VIDEO_FILE_FPS = 30  # if the video file does not have it
 
 _logger = logging_utility.setup_logger(__name__)
 
@@ -16,6 +26,15 @@ class CameraWidget(BaseComponent):
     camera_frame_width: Width of each frame of the camera_frame
     camera_frame_height: Height of each frame of the camera_frame
     camera_fps: Frames per Seconds (FPS) of each frame of the camera_frame
+    camera_frame_sequence: Sequence number of the camera_frame in the shared frame store (written once by the widget)
+    camera_frame_timestamp: Position (in milliseconds) of the frame in the video file, None for live sources
+    camera_frame_variants: Variants of the camera_frame declared by the subscribers (see frame_pyramid)
+
+    A video file (e.g., a recorded session) is played at CAMERA_VIDEO_FILE_SPEED times its FPS, or as fast as the
+    subscribers accept the frames (0, every frame is sent), and the widget stops at the end of the file.
+
+    Frames are skipped (see FrameGovernor) if the subscribers cannot keep up with the latency target, or do not need
+    them (MAX_FRAME_RATE of all subscribers). The achieved frame rate is saved in the shared memory.
     """
 
     def __init__(self, name) -> None:
@@ -25,12 +44,21 @@ class CameraWidget(BaseComponent):
 
         self.useStream = False
         self.useWebcam = False
+        self.useVideoFile = False
         self.captureInProgress = False
         self.capture = None
         self.stream = None
         self.retry = False
 
         self.setup_error = False
+        self.latency_target_millis = int(environment_utility.get_env_variable_or_default(
+            base_keys.CAMERA_LATENCY_TARGET_MILLIS, _DEFAULT_LATENCY_TARGET_MILLIS))
+        self.frame_governor = None
+        self.frame_pyramid = None
+
+        self.video_file_speed = float(environment_utility.get_env_variable_or_default(
+            base_keys.CAMERA_VIDEO_FILE_SPEED, _DEFAULT_VIDEO_FILE_SPEED))
+        self.playback_start_time = None  # time.monotonic() of the position 0 of the video file (at its speed)
 
         _logger.info("CameraWidget::__init__()")
         _logger.info("OpenCV Version : {version}", version=cv2.__version__)
@@ -52,27 +80,92 @@ class CameraWidget(BaseComponent):
         _logger.info("Listening on CameraWidget")
         super().set_component_status(base_keys.COMPONENT_IS_RUNNING_STATUS)
 
+        self.frame_governor = FrameGovernor(self.name, self.latency_target_millis,
+                                            routing_utility.get_max_frame_rate(self.name), self.__save_governor_stats)
+        self.frame_pyramid = FramePyramid(routing_utility.get_frame_variants(self.name))
+
         while True:
             try:
                 if self.useStream:
-                    frame = self.stream.read()
+                    frame = self.stream.read(timeout=_STREAM_READ_TIMEOUT_SECONDS)
+                    if frame is None:
+                        _logger.warning("No new frame from the stream: {stats}", stats=self.stream.get_stats())
+                        continue
                 else:
-                    frame = self.capture.read()[1]
+                    grabbed, frame = self.capture.read()
+                    if self.useVideoFile and not grabbed:
+                        _logger.info("End of video file: {path}", path=self.video_path)
+                        self.stop()
+                        return
+            except VideoStreamStoppedException:
+                _logger.warning("Stream stopped: {stats}, reconnecting", stats=self.stream.get_stats())
+                self.__reconnect_stream()
+                continue
             except Exception:
                 _logger.exception("Error Reading Frame with message")
 
+            frame_timestamp = None
+            if self.useVideoFile:
+                frame_timestamp = self.capture.get(cv2.CAP_PROP_POS_MSEC)
+                self.__wait_for_playback_time(frame_timestamp)
+
+            # the frame is still read (above), so that the next frame is the latest one
+            if not self.__is_unthrottled_video_file() and not self.frame_governor.should_send():
+                if self.useStream:
+                    # not sent to the subscribers, so its buffer can be reused by the stream
+                    self.stream.release(frame)
+                continue
+
             camera_fps, frame_width, frame_height = self.__get_capture_details()
 
+            start_time = time.monotonic()
+            # written once for all the subscribers, which read it by its sequence number (see BaseComponent)
+            frame_sequence = super().set_camera_frame_data(frame, frame_width, frame_height, camera_fps)
+            if self.useStream:
+                # the buffer of the stream is decoded into again once released, so the subscribers (and the frame
+                # variants, which may be the frame itself) get their own copy of the frame
+                stream_frame, frame = frame, frame.copy()
+                self.stream.release(stream_frame)
             super().send_to_component(camera_frame=frame,
                                       camera_frame_width=frame_width,
                                       camera_frame_height=frame_height,
-                                      camera_fps=camera_fps)
+                                      camera_fps=camera_fps,
+                                      camera_frame_sequence=frame_sequence,
+                                      camera_frame_timestamp=frame_timestamp,
+                                      camera_frame_variants=self.frame_pyramid.build(frame))
+            self.frame_governor.update(start_time, time.monotonic())
             """
             Note that you cannot directly save camera frames in the database since it is a NumPy Array, 
             which is not supported in SQLAlchemy.  An alternative would be to serialise it into Json which is accepted.
             Refer to this: https://stackoverflow.com/questions/61370118/storing-arrays-in-database-using-sqlalchemy
             """
 
+    def __reconnect_stream(self):
+        # wait before reconnecting, so that an unreachable stream is not retried in a busy loop
+        time_utility.sleep_seconds(_STREAM_RECONNECT_DELAY_SECONDS)
+        self.__set_video_source(self.video_path)
+
+    def __is_unthrottled_video_file(self):
+        return self.useVideoFile and self.video_file_speed <= 0
+
+    def __wait_for_playback_time(self, frame_timestamp):
+        '''
+        Wait until the frame is due at the playback speed, i.e., its position divided by the speed since the start
+        '''
+        if self.__is_unthrottled_video_file():
+            return
+
+        playback_seconds = frame_timestamp / 1000 / self.video_file_speed
+        if self.playback_start_time is None:
+            self.playback_start_time = time.monotonic() - playback_seconds
+
+        delay_seconds = self.playback_start_time + playback_seconds - time.monotonic()
+        if delay_seconds > 0:
+            time_utility.sleep_seconds(delay_seconds)
+
+    def __save_governor_stats(self, stats):
+        super().set_memory_data(base_keys.MEMORY_CAMERA_GOVERNOR_STATS_KEY, stats)
+
     def __set_video_source(self, new_video_path):
         _logger.info("Video Path: {path}", path=new_video_path)
 
@@ -90,6 +183,7 @@ class CameraWidget(BaseComponent):
             self.videoPath = new_video_path
             self.useWebcam = self.__IsCaptureDev(new_video_path)
             self.useStream = self.__IsRtsp(new_video_path)
+            self.useVideoFile = self.__IsVideoFile(new_video_path)
 
             if self.useWebcam:
                 _logger.info("   - Using webcam")
@@ -101,8 +195,14 @@ class CameraWidget(BaseComponent):
                 self.stream = VideoStream(new_video_path).start()
                 time_utility.sleep_seconds(1)  # wait until loading at least one frame
                 self.captureInProgress = True
+            elif self.useVideoFile:
+                _logger.info("   - Using video file (speed: {speed})", speed=self.video_file_speed or "unthrottled")
+                self.capture = cv2.VideoCapture(new_video_path)
+                self.playback_start_time = None
+                if self.capture.isOpened():
+                    self.captureInProgress = True
             else:
-                _logger.info("   - Using video file")
+                _logger.info("   - Unknown video source")
 
             if not self.captureInProgress:
                 _logger.error("\nWARNING : Failed to Open Video Source\n")
@@ -121,11 +221,12 @@ class CameraWidget(BaseComponent):
             pass  # Handle case where video_path.lower() fails
 
         # Check if video_path is an integer, typically representing a camera index
-        if isinstance(video_path, int):
-            return True
+        return isinstance(video_path, int)
 
-        # Check if video_path is a valid file path
-        return file_utility.is_file_exists(video_path)
+    def __IsVideoFile(self, video_path):
+        # Check if video_path is a valid file path (but not a capture device, e.g., /dev/video0)
+        return isinstance(video_path, str) and not self.__IsCaptureDev(video_path) and \
+            file_utility.is_file_exists(video_path)
 
     def __IsRtsp(self, video_path):
         try:
@@ -149,11 +250,14 @@ class CameraWidget(BaseComponent):
             camera_fps = int(self.stream.stream.get(cv2.CAP_PROP_FPS))
             frame_width = int(self.stream.stream.get(cv2.CAP_PROP_FRAME_WIDTH))
             frame_height = int(self.stream.stream.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        elif self.useWebcam:
+        elif self.useWebcam or self.useVideoFile:
             camera_fps = int(self.capture.get(cv2.CAP_PROP_FPS))
             frame_width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
             frame_height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
 
+        if camera_fps == 0 and self.useVideoFile:
+            camera_fps = _DEFAULT_VIDEO_FILE_FPS
+
         if camera_fps == 0:
             raise Exception("Error reading frame : Could not get FPS")
 
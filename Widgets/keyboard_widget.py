@@ -3,6 +3,8 @@ import base_keys
 from base_component import BaseComponent
 from Utilities import logging_utility
 
+_STATUS_CHECK_INTERVAL_SECONDS = 1  # i.e., stopped by a configuration reload
+
 _logger = logging_utility.setup_logger(__name__)
 
 
@@ -24,7 +26,10 @@ class KeyboardWidget(BaseComponent):
         # The listener is setup with on_press and on_release callbacks
         self.listener = Listener(on_press=self.on_press, on_release=self.on_release)
         self.listener.start()
-        self.listener.join()
+        while self.listener.is_alive() and \
+                super().get_component_status() == base_keys.COMPONENT_IS_RUNNING_STATUS:
+            self.listener.join(_STATUS_CHECK_INTERVAL_SECONDS)
+        self.listener.stop()
 
     def on_press(self, key):
         """Handles key press events and sends them to the next component."""
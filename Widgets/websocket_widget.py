@@ -1,12 +1,11 @@
-from google.protobuf import json_format as protobuf_json_format
-
 import base_keys
 from base_component import BaseComponent
 from DataFormat import datatypes_helper
+from DataFormat.message_dict import MessageDict
 from Websocket import socket_server
-from Utilities import time_utility, logging_utility
+from Utilities import logging_utility, routing_utility
 
-_NO_DATA_SLEEP_SECONDS = 0.05
+_RECEIVE_TIMEOUT_SECONDS = 1  # to check the status of the widget (i.e., stopped by a configuration reload)
 
 _logger = logging_utility.setup_logger(__name__)
 
@@ -16,8 +15,12 @@ class WebsocketWidget(BaseComponent):
     Sends a message in the following format (only to components which have been indicated in DataFormat/datatypes.json):
     {
         "websocket_message": "<protobuf message sent through websocket server, in dictionary format>",
-        "websocket_datatype": "<protobuf datatype key of the websocket_message>"
+        "websocket_datatype": "<protobuf datatype key of the websocket_message>",
+        "websocket_data": "<protobuf message sent through websocket server>"
     }
+
+    NOTE: The dictionary (`MessageDict`) is only converted from the protobuf message when it is accessed, so use
+    `websocket_data` (i.e., `datatypes_helper.get_websocket_protobuf`) if the protobuf message is required.
     """
 
     def start(self):
@@ -25,22 +28,27 @@ class WebsocketWidget(BaseComponent):
         _logger.info("Listening on Websocket Widget")
         super().set_component_status(base_keys.COMPONENT_IS_RUNNING_STATUS)
 
-        while True:
-            data = socket_server.receive_data()
+        while super().get_component_status() == base_keys.COMPONENT_IS_RUNNING_STATUS:
+            # blocks until data is received (no polling), or the timeout to check the status
+            data = socket_server.receive_data(timeout=_RECEIVE_TIMEOUT_SECONDS)
             if not data:
-                time_utility.sleep_seconds(_NO_DATA_SLEEP_SECONDS)
                 continue
 
-            data_type_key, data = datatypes_helper.decode_websocket_data(data)
+            data_type_key, data = datatypes_helper.decode_websocket_header(data)
 
             # If error while decoding, decoder.decode returns (None, None)
             if not data_type_key:
                 continue
 
-            # To check for which service requires the specific message type, we convert the protobuf message to dict
-            jsondata = protobuf_json_format.MessageToDict(data, preserving_proto_field_name=True)
+            # Drop the message before parsing it if no subscriber is interested in its datatype
+            if not routing_utility.get_datatype_routes(self.name, data_type_key):
+                _logger.debug("No subscriber for datatype {datatype}", datatype=data_type_key)
+                continue
 
-            self.send_to_component(websocket_message=jsondata, websocket_datatype=data_type_key, websocket_data=data)
+            # The message is parsed once, and shared by all the subscribers
+            data_type_key, data = datatypes_helper.decode_websocket_payload(data_type_key, data)
+            if not data_type_key:
+                continue
 
-            # HACK: Allow other threads to run
-            time_utility.sleep_seconds(_NO_DATA_SLEEP_SECONDS)
\ No newline at end of file
+            self.send_to_component(websocket_message=MessageDict(data), websocket_datatype=data_type_key,
+                                   websocket_data=data)
@@ -1,13 +1,15 @@
 import os
 import base_keys
+from DataFormat.message_dict import MessageDict
 from Database import database, tables
-from DataFormat import datatypes_helper
-from Utilities import time_utility, endpoint_utility, config_utility, logging_utility
-from Memory.Memory import update_shared_memory_item, get_shared_memory_item
+from Utilities import time_utility, routing_utility, logging_utility, trace_utility
+from Memory.Memory import update_shared_memory_item, get_shared_memory_item, update_camera_frame, get_camera_frame, \
+    get_component_status_table
 
-CONFIG_CHANNEL_PIPES = "channel-pipes"
+# NOTE: the index of each status is its value in the shared component status table
 VALID_COMPONENT_STATUS = [base_keys.COMPONENT_NOT_STARTED_STATUS, base_keys.COMPONENT_IS_RUNNING_STATUS,
                           base_keys.COMPONENT_IS_STOPPED_STATUS]
+_COMPONENT_STATUS_VALUES = {status: value for value, status in enumerate(VALID_COMPONENT_STATUS)}
 
 _logger = logging_utility.setup_logger(__name__)
 
@@ -30,6 +32,18 @@ class BaseComponent:
     """
     SUPPORTED_DATATYPES = {}
 
+    """
+    Maximum rate (per second) of the camera frames needed by the component, or None for every frame.
+    (to be overridden by subclasses)
+    """
+    MAX_FRAME_RATE = None
+
+    """
+    Names of the variants (downscaled/colour converted) of the camera frames needed by the component, i.e., {"clip"}
+    (see frame_pyramid). (to be overridden by subclasses)
+    """
+    FRAME_VARIANTS = set()
+
     def __init__(self, name) -> None:
         self.name = name
 
@@ -38,7 +52,8 @@ class BaseComponent:
         # The Database is only for interfacing with the .db file / hosted db
         database.init()
 
-        self.component_status_name = f"{self.name}_STATUS"
+        self.__status_table = None
+        self.__component_status_id = None
         self.set_component_status(base_keys.COMPONENT_NOT_STARTED_STATUS)  # Default Status
 
     def send_to_component(self, **kwargs):
@@ -51,11 +66,20 @@ class BaseComponent:
         else:
             message = self.__build_message(kwargs)
 
-        all_subscribers = config_utility.get_config()[CONFIG_CHANNEL_PIPES][self.name]
-        for subscriber in all_subscribers:
-            entry_func = self.__get_subscriber_func(subscriber, message)
+        if trace_utility.is_enabled():
+            trace_utility.add_hop(message, self.name)
+
+        # websocket messages are only sent to the subscribers interested in the datatype (see routing_utility)
+        datatype = message.get(base_keys.WEBSOCKET_DATATYPE)
+        message_dict = message.get(base_keys.WEBSOCKET_MESSAGE)
+        if isinstance(message_dict, MessageDict):
+            # each subscriber gets its own view of the message (see MessageDict)
+            message_dict = message_dict.new_view()
 
-            if entry_func:
+        for _, entry_func, _ in routing_utility.get_datatype_routes(self.name, datatype):
+            if isinstance(message_dict, MessageDict):
+                entry_func({**message, base_keys.WEBSOCKET_MESSAGE: message_dict.new_view()})
+            else:
                 entry_func(message)
 
     def is_supported_datatype(self, datatype) -> bool:
@@ -83,21 +107,79 @@ class BaseComponent:
     def get_memory_data(self, key_name):
         return get_shared_memory_item(key_name)
 
-    def get_component_status(self):
-        return self.get_memory_data(base_keys.MEMORY_COMPONENT_STATUS_KEY)[self.component_status_name]
+    def set_camera_frame_data(self, frame, frame_width, frame_height, camera_fps):
+        """
+        Save the camera frame to the shared frame store (instead of `set_memory_data`, which pickles the frame).
+        The camera widget writes each frame once, and sends its sequence number (camera_frame_sequence).
+        :return: the sequence number of the frame
+        """
+        return update_camera_frame(frame, frame_width, frame_height, camera_fps)
 
-    def set_component_status(self, new_status):
-        all_component_status_keys = self.get_memory_data(base_keys.MEMORY_COMPONENT_STATUS_KEY)
-        if all_component_status_keys is None:
-            all_component_status_keys = {}  # Initialise with an empty dictionary
+    def set_camera_frame_sequence(self, sequence):
+        """
+        Save the sequence number of the last camera frame received by the component (camera_frame_sequence) in the
+        shared memory, so that `get_camera_frame_data` reads that frame in any process of the component
+        """
+        update_shared_memory_item(self.__get_camera_frame_sequence_key(), sequence)
 
-        if new_status in VALID_COMPONENT_STATUS:
-            all_component_status_keys[self.component_status_name] = new_status
+    def get_camera_frame_data(self, copy=True):
+        """
+        :param copy: False to get a view of the shared frame (only valid until it is overwritten by newer frames)
+        :return: (frame, frame_details) of the last camera frame received by the component (see
+            set_camera_frame_sequence), or of the latest camera frame if it was overwritten by newer frames (or no
+            frame was received), or (None, None) if not available
+        """
+        sequence = get_shared_memory_item(self.__get_camera_frame_sequence_key())
+        if sequence is not None:
+            frame, frame_details = get_camera_frame(sequence, copy=copy)
+            if frame is not None:
+                return frame, frame_details
 
-            self.set_memory_data(base_keys.MEMORY_COMPONENT_STATUS_KEY, all_component_status_keys)
+        return get_camera_frame(copy=copy)
+
+    def get_component_status(self):
+        status_table, component_status_id = self.__get_component_status_slot()
+        return VALID_COMPONENT_STATUS[status_table.get_status(component_status_id)]
+
+    def set_component_status(self, new_status):
+        if new_status in _COMPONENT_STATUS_VALUES:
+            status_table, component_status_id = self.__get_component_status_slot()
+            status_table.set_status(component_status_id, _COMPONENT_STATUS_VALUES[new_status])
         else:
             _logger.error("Invalid Component Status 'set_component_status()': {new_status}", new_status=new_status)
 
+    @staticmethod
+    def set_status_of_component(component_name, new_status):
+        """
+        Set the status of a component from another process, i.e., COMPONENT_IS_STOPPED_STATUS to stop the loop of an
+        input component (which checks its status)
+        """
+        if new_status in _COMPONENT_STATUS_VALUES:
+            status_table = get_component_status_table()
+            status_table.set_status(status_table.register(component_name), _COMPONENT_STATUS_VALUES[new_status])
+        else:
+            _logger.error("Invalid Component Status 'set_status_of_component()': {new_status}", new_status=new_status)
+
+    @staticmethod
+    def get_all_component_status():
+        """
+        :return: the map with { "service:learning": "COMPONENT_IS_RUNNING_STATUS", ... } of all components
+        """
+        all_component_status = get_component_status_table().get_all_status()
+        return {name: VALID_COMPONENT_STATUS[status] for name, status in all_component_status.items()}
+
+    def __get_camera_frame_sequence_key(self):
+        return f"{base_keys.CAMERA_FRAME_SEQUENCE}:{self.name}"
+
+    def __get_component_status_slot(self):
+        # the id is registered again if the status table was recreated (i.e., after closing the memory)
+        status_table = get_component_status_table()
+        if status_table is not self.__status_table:
+            self.__component_status_id = status_table.register(self.name)
+            self.__status_table = status_table
+
+        return status_table, self.__component_status_id
+
     def __build_message(self, args):
         message = {}
 
@@ -110,7 +192,8 @@ class BaseComponent:
         return message
 
     def __build_from_base_message(self, args):
-        new_message = args[base_keys.BASE_DATA_KEY]
+        # copy, since the base message may still be in use by the other subscribers (e.g., edge queues)
+        new_message = dict(args[base_keys.BASE_DATA_KEY])
         new_message[base_keys.ORIGIN_KEY] = self.name
 
         if base_keys.TIMESTAMP_KEY not in new_message:
@@ -121,18 +204,3 @@ class BaseComponent:
                 new_message[key] = val
 
         return new_message
-
-    def __get_subscriber_func(self, subscriber, message):
-        instance = endpoint_utility.get_component_instance(subscriber)
-
-        # Send websocket data only if the subscriber is interested in the datatype
-        if self.name == base_keys.WEBSOCKET_WIDGET:
-            datatype = datatypes_helper.get_name_by_key(message[base_keys.WEBSOCKET_DATATYPE])
-            if not instance.is_supported_datatype(datatype):
-                # Subscriber not interested in messages of this datatype
-                return None
-
-        entry_func = endpoint_utility.get_entry_func_of(subscriber)
-        entry_func = getattr(instance, entry_func)
-
-        return entry_func
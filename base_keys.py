@@ -36,7 +36,6 @@ WEBSOCKET_OUTPUT = "output:websocket"
 ##############################################################################################################
 
 # NOTE: Component Status
-MEMORY_COMPONENT_STATUS_KEY = "component_status"
 COMPONENT_IS_RUNNING_STATUS = "COMPONENT_IS_RUNNING_STATUS"
 COMPONENT_IS_STOPPED_STATUS = "COMPONENT_IS_STOPPED_STATUS"
 COMPONENT_NOT_STARTED_STATUS = "COMPONENT_NOT_STARTED_STATUS"
@@ -49,6 +48,7 @@ COMPONENT_NOT_STARTED_STATUS = "COMPONENT_NOT_STARTED_STATUS"
 BASE_DATA_KEY = "base_data"
 ORIGIN_KEY = "origin"
 TIMESTAMP_KEY = "timestamp"
+TRACE_KEY = "trace"  # only if tracing is enabled, see trace_utility
 
 # NOTE: Audio
 AUDIO_DATA = "audio_data"
@@ -74,6 +74,10 @@ CAMERA_FRAME = "camera_frame"
 CAMERA_FRAME_WIDTH = "camera_frame_width"
 CAMERA_FRAME_HEIGHT = "camera_frame_height"
 CAMERA_FPS = "camera_fps"
+CAMERA_FRAME_TIMESTAMP = "camera_frame_timestamp"
+CAMERA_FRAME_SEQUENCE = "camera_frame_sequence"
+CAMERA_FRAME_VARIANTS = "camera_frame_variants"
+MEMORY_CAMERA_GOVERNOR_STATS_KEY = "camera_governor_stats"
 
 # NOTE: Keyboard
 KEYBOARD_KEY_NAME = "key_name"
@@ -98,6 +102,11 @@ STATIC_MAPS_OPTION = "STATIC_MAPS_OPTION"
 FPV_OPTION = "FPV_OPTION"
 
 CAMERA_VIDEO_SOURCE = "CAMERA_VIDEO_SOURCE"
+CAMERA_LATENCY_TARGET_MILLIS = "CAMERA_LATENCY_TARGET_MILLIS"
+CAMERA_VIDEO_FILE_SPEED = "CAMERA_VIDEO_FILE_SPEED"
+CAMERA_FRAME_VARIANTS_CONFIG = "CAMERA_FRAME_VARIANTS_CONFIG"
+IMAGE_UPLOAD_FORMAT = "IMAGE_UPLOAD_FORMAT"
+IMAGE_UPLOAD_QUALITY = "IMAGE_UPLOAD_QUALITY"
 
 # NOTE: Map Keys (Option Values for Running Service)
 PLACES_OPTION_OSM = 0
@@ -1,8 +1,15 @@
 import multiprocessing
 from dotenv import load_dotenv
 import base_keys
+from base_component import BaseComponent
 from Memory import Memory
-from Utilities import config_utility, endpoint_utility, environment_utility, time_utility, logging_utility, file_utility
+from Utilities import config_utility, endpoint_utility, environment_utility, time_utility, logging_utility, \
+    file_utility, executor_utility, config_watcher, startup_utility
+
+# input component -> process running it
+_input_processes = {}
+# time to wait for an input process to stop its loop (by its status), before terminating it
+_INPUT_PROCESS_STOP_TIMEOUT_SECONDS = 5
 
 
 # from APIs.hololens import hololens_portal
@@ -42,23 +49,29 @@ def start_processing():
     config_utility.get_config()
     # NOTE: Set up and start memory
     Memory.init()
+    # NOTE: Assign the ids of the components in the status table (in the order of the configuration)
+    Memory.register_components(config_utility.get_config()[config_utility.CONFIGURATION_CHANNELS_KEY])
+    # NOTE: Start the components hosted in their own processes (before the widgets, which send data to them)
+    executor_utility.start_process_executors()
+    process_transports = executor_utility.get_process_transports()
     # NOTE: Start widgets
     entrypoints = config_utility.get_channel_entrypoints()
     camera_required = None
 
     for component in entrypoints.keys():
         if component.split(":")[0] == "input":
-            instance = endpoint_utility.get_component_instance(component)
-            entry_func = endpoint_utility.get_entry_func_of(component)
-            entry_func = getattr(instance, entry_func)
-
             if component == base_keys.CAMERA_WIDGET:
-                camera_required = entry_func
+                instance = endpoint_utility.get_component_instance(component)
+                camera_required = getattr(instance, endpoint_utility.get_entry_func_of(component))
             else:
-                multiprocessing.Process(target=entry_func).start()
+                _start_input_process(component, process_transports)
+
+    # NOTE: Reload the configuration when it changes (if enabled), and start/stop the input components accordingly
+    config_watcher.start(lambda config_changes: _on_config_reload(config_changes, process_transports))
 
     # camera needs to run in the main thread (due to OpenCV pickle limitations), so it will be started after all others have started.
     if camera_required is not None:
+        startup_utility.warm_up_process(base_keys.CAMERA_WIDGET)
         camera_required()
 
     # NOTE: This section only runs if the Camera Widget is not enabled since the Camera Widget has its own while loop
@@ -68,10 +81,61 @@ def start_processing():
     except KeyboardInterrupt:
         logging_utility.setup_logger().error("Keyboard Interrupt")
 
+    # NOTE: Stop the components hosted in their own processes (they are not daemon processes)
+    executor_utility.stop_process_executors()
     # NOTE: close the shared memory
     Memory.close()
 
 
+def _start_input_process(component, process_transports):
+    instance = endpoint_utility.get_component_instance(component)
+    entry_func = getattr(instance, endpoint_utility.get_entry_func_of(component))
+
+    process = multiprocessing.Process(target=executor_utility.run_with_process_transports,
+                                      args=(entry_func, process_transports, component, Memory.get_process_locks()))
+    process.start()
+    _input_processes[component] = process
+
+    # the instance is only used by its own process
+    endpoint_utility.component_instances.pop(component, None)
+
+
+def _on_config_reload(config_changes, process_transports):
+    stopped_components = (config_changes[config_utility.CONFIG_CHANGES_REMOVED_KEY] +
+                          config_changes[config_utility.CONFIG_CHANGES_CHANGED_KEY])
+    started_components = (config_changes[config_utility.CONFIG_CHANGES_CHANGED_KEY] +
+                          config_changes[config_utility.CONFIG_CHANGES_ADDED_KEY])
+
+    for component in stopped_components:
+        process = _input_processes.pop(component, None)
+        if process is not None:
+            _stop_input_process(component, process)
+
+    for component in started_components:
+        if component.split(":")[0] != "input":
+            continue
+
+        if component == base_keys.CAMERA_WIDGET:
+            logging_utility.setup_logger().warning("Restart the server to start/change {component}",
+                                                   component=component)
+            continue
+
+        _start_input_process(component, process_transports)
+
+
+def _stop_input_process(component, process):
+    # the loop of the input component stops once its status is stopped, so that the process is not killed while it
+    # writes to the shared memory
+    BaseComponent.set_status_of_component(component, base_keys.COMPONENT_IS_STOPPED_STATUS)
+    process.join(_INPUT_PROCESS_STOP_TIMEOUT_SECONDS)
+    if not process.is_alive():
+        return
+
+    logging_utility.setup_logger().warning("{component} did not stop in {seconds} s, terminating it",
+                                           component=component, seconds=_INPUT_PROCESS_STOP_TIMEOUT_SECONDS)
+    executor_utility.terminate_process(process)
+
+
 if __name__ == "__main__":
     setup_environment()
     start_processing()